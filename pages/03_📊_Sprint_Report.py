@@ -27,9 +27,138 @@ from src.config.config import (
     SIDEBAR_STATE,
     DEFAULT_TIMEZONE,
     DEFAULT_PROJECT,
+    CACHE_TTL,
 )
 from src.services.jira_client import JiraClient
 from src.services.mongodb_client import MongoDBClient
+from src.services.sprint_aggregates import (
+    SEGMENT_FINAL,
+    SEGMENT_LOGGED,
+    SEGMENT_TODO,
+)
+
+# Các trường biểu đồ chênh lệch thời gian cần (danh sách từng issue), chỉ các
+# trường này được lấy từ MongoDB. Các biểu đồ khác dùng số liệu tổng hợp của sprint
+TIME_DIFF_FIELDS = [
+    "key",
+    "summary",
+    "assignee",
+    "status",
+    "time_estimate",
+    "time_spent",
+]
+
+# Điều kiện tương đương giá trị đúng/sai của Python (trường không tồn tại là sai)
+TRUTHY = {"$nin": [False, None, 0, ""]}
+FALSY = {"$in": [False, None, 0, ""]}
+
+
+def build_dashboard_filter(show_dashboard_final, include_todo, include_logged=True):
+    """Tạo điều kiện lọc MongoDB cho các issues được đưa vào báo cáo
+
+    Args:
+        show_dashboard_final (bool): Chỉ lấy issues có Show In Dashboard Final
+        include_todo (bool): Bổ sung issues To Do có Show In Dashboard
+        include_logged (bool): Bổ sung issues có Show In Dashboard và đã log time
+
+    Returns:
+        dict: Điều kiện lọc theo cú pháp query của MongoDB ({} nếu lấy tất cả)
+    """
+    if not show_dashboard_final:
+        return {}
+
+    branches = [{"show_in_dashboard_final": TRUTHY}]
+    if include_todo:
+        branches.append(
+            {
+                "status": "To Do",
+                "show_in_dashboard": TRUTHY,
+                "show_in_dashboard_final": FALSY,
+            }
+        )
+    if include_logged:
+        branches.append(
+            {
+                "status": {"$ne": "To Do"},
+                "show_in_dashboard": TRUTHY,
+                "show_in_dashboard_final": FALSY,
+                "time_spent": {"$gt": 0},
+            }
+        )
+    return {"$or": branches}
+
+
+def report_segments(show_dashboard_final, include_todo, include_logged=True):
+    """Các nhóm issues trong số liệu tổng hợp tương ứng với build_dashboard_filter
+
+    Returns:
+        list: Các nhóm (SEGMENT_*), None nếu lấy tất cả
+    """
+    if not show_dashboard_final:
+        return None
+    segments = [SEGMENT_FINAL]
+    if include_todo:
+        segments.append(SEGMENT_TODO)
+    if include_logged:
+        segments.append(SEGMENT_LOGGED)
+    return segments
+
+
+def report_dev_groups(dev_group):
+    """Các dev_group ứng với lựa chọn nhóm developer"""
+    if dev_group == "DEV FULL + DEV FE":
+        return ["DEV FULL", "DEV FE"]
+    return [dev_group]
+
+
+def build_group_filter(dashboard_filter, dev_group, assignee):
+    """Thêm điều kiện nhóm developer và assignee vào điều kiện lọc báo cáo
+
+    Args:
+        dashboard_filter (dict): Điều kiện từ build_dashboard_filter
+        dev_group (str): Nhóm developer đã chọn
+        assignee (str): Assignee đã chọn ("Tất cả" để không lọc)
+
+    Returns:
+        dict: Điều kiện lọc theo cú pháp query của MongoDB
+    """
+    conditions = [dashboard_filter] if dashboard_filter else []
+    conditions.append({"dev_group": {"$in": report_dev_groups(dev_group)}})
+    if assignee != "Tất cả":
+        conditions.append({"assignee": assignee})
+    return {"$and": conditions}
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_issues(_mongo_client, sprint_id, data_version, filters=None, fields=None):
+    """Lấy issues đã lọc của sprint, kết quả được cache theo phiên bản dữ liệu
+
+    Args:
+        _mongo_client (MongoDBClient): Client MongoDB (không dùng làm khóa cache)
+        sprint_id (int): ID của sprint
+        data_version: Thời điểm cập nhật dữ liệu sprint, đổi sau mỗi lần đồng bộ
+        filters (dict, optional): Điều kiện lọc theo cú pháp query của MongoDB
+        fields (list, optional): Chỉ lấy các trường này, mặc định tất cả
+
+    Returns:
+        list: Danh sách issues
+    """
+    return _mongo_client.query_issues(sprint_id, filters, fields)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def load_sprint_aggregates(_mongo_client, sprint_id, data_version):
+    """Lấy số liệu tổng hợp của sprint, kết quả được cache theo phiên bản dữ liệu
+
+    Args:
+        _mongo_client (MongoDBClient): Client MongoDB (không dùng làm khóa cache)
+        sprint_id (int): ID của sprint
+        data_version: Thời điểm cập nhật dữ liệu sprint, đổi sau mỗi lần đồng bộ
+
+    Returns:
+        SprintAggregates: Số liệu tổng hợp
+    """
+    return _mongo_client.get_sprint_aggregates(sprint_id)
 
 
 # Hàm để lấy trạng thái từ issue một cách an toàn
@@ -87,11 +216,14 @@ class SprintReportService:
             st.error(f"Lỗi khi lấy danh sách sprint từ API: {str(e)}")
             return []
 
-    def get_sprint_issues_from_mongo(self, sprint_id):
-        """Lấy danh sách issues của sprint từ MongoDB
+    def query_issues(self, sprint_id, data_version, filters=None, fields=None):
+        """Lấy issues của sprint từ MongoDB, lọc và chọn trường phía MongoDB
 
         Args:
             sprint_id (int): ID của sprint
+            data_version: Thời điểm cập nhật dữ liệu sprint (khóa cache)
+            filters (dict, optional): Điều kiện lọc theo cú pháp query của MongoDB
+            fields (list, optional): Chỉ lấy các trường này, mặc định tất cả
 
         Returns:
             list: Danh sách issues của sprint từ MongoDB
@@ -100,8 +232,23 @@ class SprintReportService:
             st.error("Không thể kết nối đến MongoDB!")
             return None
 
-        issues = self.mongo_client.get_issues(sprint_id)
-        return issues
+        return load_issues(self.mongo_client, sprint_id, data_version, filters, fields)
+
+    def get_sprint_aggregates(self, sprint_id, data_version):
+        """Lấy số liệu tổng hợp của sprint (tính khi đồng bộ) từ MongoDB
+
+        Args:
+            sprint_id (int): ID của sprint
+            data_version: Thời điểm cập nhật dữ liệu sprint (khóa cache)
+
+        Returns:
+            SprintAggregates: Số liệu tổng hợp, None nếu không lấy được
+        """
+        if not self.mongo_client.is_connected():
+            st.error("Không thể kết nối đến MongoDB!")
+            return None
+
+        return load_sprint_aggregates(self.mongo_client, sprint_id, data_version)
 
     def get_sprint_info_from_mongo(self, sprint_id):
         """Lấy thông tin của sprint từ MongoDB
@@ -205,12 +352,12 @@ def calculate_sprint_progress(start_date_str, end_date_str):
 
 
 def calculate_burndown_data(
-    filtered_issues, start_date, end_date, metric="issues", done_type="completed"
+    summary, start_date, end_date, metric="issues", done_type="completed"
 ):
     """Tính toán dữ liệu cho Burn Down Chart
 
     Args:
-        filtered_issues (list): Danh sách issues đã được lọc
+        summary (dict): Số liệu tổng hợp của các issues đã lọc (SprintAggregates.select)
         start_date (datetime): Ngày bắt đầu sprint
         end_date (datetime): Ngày kết thúc sprint
         metric (str): Loại metric ('issues' hoặc 'time')
@@ -236,10 +383,21 @@ def calculate_burndown_data(
         current_date += timedelta(days=1)
 
     # Tính tổng số issue hoặc thời gian dự kiến
-    if metric == "issues":
-        total = len(filtered_issues)
-    else:  # metric == 'time'
-        total = sum(issue.get("time_estimate", 0) for issue in filtered_issues)
+    value_field = "issues" if metric == "issues" else "time_estimate"
+    total = summary[value_field]
+
+    # Số issue/thời gian dự kiến theo thời điểm hoàn thành
+    done_entries = []
+    for done_value, counter in summary[done_type].items():
+        if done_value in [None, "", "N/A"]:  # Xử lý các giá trị không hợp lệ
+            done_at = None
+        elif isinstance(done_value, str):
+            done_at = datetime.strptime(done_value, "%d/%m/%Y %H:%M").replace(
+                tzinfo=vietnam_tz
+            )
+        else:
+            continue
+        done_entries.append((done_at, counter.get(value_field, 0)))
 
     # Tạo đường lý tưởng (ideal burndown)
     ideal_data = []
@@ -248,53 +406,25 @@ def calculate_burndown_data(
         ideal_remaining = total * (1 - i / (days_total - 1))
         ideal_data.append(ideal_remaining)
 
-    # Tạo đường thực tế (actual burndown)
+    # Tạo đường thực tế (actual burndown): số issue hoặc tổng thời gian dự kiến
+    # của các issue chưa hoàn thành tại ngày này
     actual_data = []
     for date in dates:
-        if metric == "issues":
-            # Đếm số issue chưa hoàn thành tại ngày này
-            remaining = len(
-                [
-                    issue
-                    for issue in filtered_issues
-                    if issue.get(done_type)
-                    in [None, "", "N/A"]  # Xử lý các giá trị không hợp lệ
-                    or (
-                        isinstance(issue.get(done_type), str)
-                        and issue.get(done_type) != "N/A"
-                        and datetime.strptime(
-                            issue.get(done_type), "%d/%m/%Y %H:%M"
-                        ).replace(tzinfo=vietnam_tz)
-                        > date
-                    )
-                ]
-            )
-        else:  # metric == 'time'
-            # Tính tổng thời gian của các issue chưa hoàn thành
-            remaining = sum(
-                issue.get("time_estimate", 0)
-                for issue in filtered_issues
-                if issue.get(done_type)
-                in [None, "", "N/A"]  # Xử lý các giá trị không hợp lệ
-                or (
-                    isinstance(issue.get(done_type), str)
-                    and issue.get(done_type) != "N/A"
-                    and datetime.strptime(
-                        issue.get(done_type), "%d/%m/%Y %H:%M"
-                    ).replace(tzinfo=vietnam_tz)
-                    > date
-                )
-            )
+        remaining = sum(
+            value
+            for done_at, value in done_entries
+            if done_at is None or done_at > date
+        )
         actual_data.append(remaining)
 
     return dates, ideal_data, actual_data
 
 
-def display_burndown_chart(filtered_issues, start_date, end_date):
+def display_burndown_chart(summary, start_date, end_date):
     """Hiển thị Burn Down Chart
 
     Args:
-        filtered_issues (list): Danh sách issues đã được lọc
+        summary (dict): Số liệu tổng hợp của các issues đã lọc
         start_date (str): Ngày bắt đầu sprint
         end_date (str): Ngày kết thúc sprint
     """
@@ -323,7 +453,7 @@ def display_burndown_chart(filtered_issues, start_date, end_date):
 
     # Tính toán dữ liệu cho biểu đồ
     dates, ideal_data, actual_data = calculate_burndown_data(
-        filtered_issues, start_date, end_date, metric, done_type
+        summary, start_date, end_date, metric, done_type
     )
 
     # Tạo biểu đồ
@@ -365,11 +495,11 @@ def display_burndown_chart(filtered_issues, start_date, end_date):
     st.plotly_chart(fig, use_container_width=True)
 
 
-def display_status_chart(filtered_issues):
+def display_status_chart(summary):
     """Hiển thị biểu đồ phân bố status
 
     Args:
-        filtered_issues (list): Danh sách issues đã được lọc
+        summary (dict): Số liệu tổng hợp của các issues đã lọc
     """
     st.subheader("Phân bố trạng thái")
 
@@ -404,24 +534,28 @@ def display_status_chart(filtered_issues):
         "Done",
     ]
 
+    # Trường số liệu theo metric được chọn: số issue, thời gian dự kiến hoặc
+    # thời gian đã làm trong sprint
+    value_field = {
+        "issues": "issues",
+        "time": "time_estimate",
+        "sprint_time": "sprint_time_spent",
+    }[metric]
+
+    def status_values(status_counters):
+        values = {}
+        for status, counter in status_counters.items():
+            status = "Không có status" if status is None else status
+            values[status] = values.get(status, 0) + counter.get(value_field, 0)
+        return values
+
     # Chuẩn bị dữ liệu
     if show_by_assignee:
         # Nhóm theo assignee và status
         data = {}
-        for issue in filtered_issues:
-            assignee = issue.get("assignee", "Không có assignee")
-            status = issue.get("status", "Không có status")
-            if assignee not in data:
-                data[assignee] = {}
-            if status not in data[assignee]:
-                data[assignee][status] = 0
-            # Tính theo metric được chọn
-            if metric == "issues":
-                data[assignee][status] += 1
-            elif metric == "time":  # thời gian dự kiến
-                data[assignee][status] += issue.get("time_estimate", 0)
-            else:  # sprint_time - thời gian đã làm trong sprint
-                data[assignee][status] += issue.get("sprint_time_spent", 0)
+        for assignee, assignee_data in summary["assignees"].items():
+            assignee = "Không có assignee" if assignee is None else assignee
+            data[assignee] = status_values(assignee_data["status"])
 
         # Lấy danh sách tất cả status có thể có và sắp xếp theo thứ tự định nghĩa
         all_statuses = set(
@@ -469,18 +603,7 @@ def display_status_chart(filtered_issues):
 
     else:
         # Nhóm theo status
-        status_counts = {}
-        for issue in filtered_issues:
-            status = issue.get("status", "Không có status")
-            if status not in status_counts:
-                status_counts[status] = 0
-            # Tính theo metric được chọn
-            if metric == "issues":
-                status_counts[status] += 1
-            elif metric == "time":  # thời gian dự kiến
-                status_counts[status] += issue.get("time_estimate", 0)
-            else:  # sprint_time - thời gian đã làm trong sprint
-                status_counts[status] += issue.get("sprint_time_spent", 0)
+        status_counts = status_values(summary["status"])
 
         # Lọc và sắp xếp status theo thứ tự đã định nghĩa
         sorted_statuses = [s for s in status_order if s in status_counts]
@@ -531,11 +654,11 @@ def display_status_chart(filtered_issues):
     st.plotly_chart(fig, use_container_width=True)
 
 
-def display_distribution_charts(filtered_issues):
+def display_distribution_charts(summary):
     """Hiển thị biểu đồ phân bố theo loại issue và customer
 
     Args:
-        filtered_issues (list): Danh sách issues đã được lọc
+        summary (dict): Số liệu tổng hợp của các issues đã lọc
     """
     # Tạo layout 2 cột cho 2 biểu đồ
     dist_col1, dist_col2 = st.columns(2)
@@ -546,9 +669,9 @@ def display_distribution_charts(filtered_issues):
         )
         # Tính toán số lượng theo loại issue
         issue_types = {}
-        for issue in filtered_issues:
-            issue_type = issue.get("issue_type", "Không xác định")
-            issue_types[issue_type] = issue_types.get(issue_type, 0) + 1
+        for issue_type, counter in summary["issue_type"].items():
+            issue_type = "Không xác định" if issue_type is None else issue_type
+            issue_types[issue_type] = issue_types.get(issue_type, 0) + counter["issues"]
 
         # Tạo biểu đồ
         fig_type = go.Figure(
@@ -588,10 +711,9 @@ def display_distribution_charts(filtered_issues):
         )
         # Tính toán số lượng theo customer
         customers = {}
-        for issue in filtered_issues:
-            customer = issue.get("customer", "Không xác định")
-            if customer != "N/A" and customer != "Không xác định":
-                customers[customer] = customers.get(customer, 0) + 1
+        for customer, counter in summary["customer"].items():
+            if customer not in [None, "N/A", "Không xác định"]:
+                customers[customer] = customers.get(customer, 0) + counter["issues"]
 
         # Lấy top 5 customer có số lượng issue nhiều nhất
         top_customers = dict(
@@ -630,15 +752,13 @@ def display_distribution_charts(filtered_issues):
         st.plotly_chart(fig_customer, use_container_width=True)
 
 
-def display_time_diff_charts(
-    filtered_issues, show_dashboard_final=True, include_todo=False
-):
+def display_time_diff_charts(issues_to_analyze, show_dashboard_final=True):
     """Hiển thị biểu đồ phân bố chênh lệch thời gian
 
     Args:
-        filtered_issues (list): Danh sách issues đã được lọc
+        issues_to_analyze (list): Issues đã lọc theo Show In Dashboard Final và
+            issues To Do (không gồm các issues chỉ được bổ sung vì đã log time)
         show_dashboard_final (bool): Chỉ hiển thị issues có Show In Dashboard Final
-        include_todo (bool): Bổ sung issues To Do có Show In Dashboard
     """
     st.subheader("Phân bố chênh lệch thời gian")
 
@@ -649,28 +769,9 @@ def display_time_diff_charts(
         help="Bao gồm các issue có trạng thái Dev Done, Test Done, Deployed trong phân tích chênh lệch thời gian",
     )
 
-    # Lọc issues theo điều kiện show_in_dashboard_final và include_todo
-    issues_to_analyze = filtered_issues.copy()
-    if show_dashboard_final:
-        issues_to_analyze = [
-            issue
-            for issue in issues_to_analyze
-            if issue.get("show_in_dashboard_final", False)
-        ]
-        # Nếu include_todo được bật, bổ sung thêm các issue To Do có show_in_dashboard
-        if include_todo:
-            todo_issues = [
-                issue
-                for issue in filtered_issues
-                if issue.get("status") == "To Do"
-                and issue.get("show_in_dashboard", False)
-                and not issue.get("show_in_dashboard_final", False)
-            ]
-            issues_to_analyze.extend(todo_issues)
-
-        if not issues_to_analyze:
-            st.warning("Không có issue nào thỏa mãn điều kiện hiển thị!")
-            return
+    if show_dashboard_final and not issues_to_analyze:
+        st.warning("Không có issue nào thỏa mãn điều kiện hiển thị!")
+        return
 
     # Lọc issues theo trạng thái hoàn thành
     done_statuses = ["done"]
@@ -846,11 +947,11 @@ def display_time_diff_charts(
             st.metric("Trung vị", f"{time_diffs.median():.1f}h")
 
 
-def display_performance_chart(filtered_issues):
+def display_performance_chart(summary):
     """Hiển thị biểu đồ đánh giá hiệu suất của các assignee
 
     Args:
-        filtered_issues (list): Danh sách issues đã được lọc
+        summary (dict): Số liệu tổng hợp của các issues đã lọc
     """
     st.subheader(
         "Đánh giá hiệu suất Assignee",
@@ -877,42 +978,28 @@ def display_performance_chart(filtered_issues):
 
     # Chỉ xem xét assignee có issue
     assignees = {}
-    for issue in filtered_issues:
-        assignee = issue.get("assignee", "Không có")
-        if assignee not in assignees:
-            assignees[assignee] = {
-                "total_issues": 0,
-                "done_issues": 0,
-                "total_estimate": 0,
-                "total_spent": 0,
-                "ahead_of_schedule": 0,  # Số issue hoàn thành trước hạn
-                "on_schedule": 0,  # Số issue hoàn thành đúng hạn
-                "behind_schedule": 0,  # Số issue hoàn thành trễ hạn
-                "avg_time_per_issue": 0,  # Thời gian trung bình cho mỗi issue
-                "efficiency_score": 0,  # Điểm hiệu suất (tính sau)
-            }
-
-        # Cập nhật số liệu
-        assignees[assignee]["total_issues"] += 1
-
-        # Kiểm tra nếu issue đã hoàn thành (dựa trên danh sách trạng thái được chấp nhận)
-        issue_status = issue.get("status", "").lower()
-        if issue_status in done_statuses:
-            assignees[assignee]["done_issues"] += 1
-
-            # Tính trạng thái deadline
-            time_estimate = issue.get("time_estimate", 0)
-            time_spent = issue.get("time_spent", 0)
-            if time_estimate > time_spent:
-                assignees[assignee]["ahead_of_schedule"] += 1
-            elif time_estimate < time_spent:
-                assignees[assignee]["behind_schedule"] += 1
-            else:
-                assignees[assignee]["on_schedule"] += 1
-
-        # Cập nhật thời gian
-        assignees[assignee]["total_estimate"] += issue.get("time_estimate", 0)
-        assignees[assignee]["total_spent"] += issue.get("time_spent", 0)
+    for assignee, assignee_data in summary["assignees"].items():
+        assignee = "Không có" if assignee is None else assignee
+        assignees[assignee] = {
+            "total_issues": assignee_data["issues"],
+            "done_issues": 0,
+            "total_estimate": assignee_data.get("time_estimate", 0),
+            "total_spent": assignee_data.get("time_spent", 0),
+            "ahead_of_schedule": 0,  # Số issue hoàn thành trước hạn
+            "on_schedule": 0,  # Số issue hoàn thành đúng hạn
+            "behind_schedule": 0,  # Số issue hoàn thành trễ hạn
+            "avg_time_per_issue": 0,  # Thời gian trung bình cho mỗi issue
+            "efficiency_score": 0,  # Điểm hiệu suất (tính sau)
+        }
+
+        # Số issue đã hoàn thành (dựa trên danh sách trạng thái được chấp nhận)
+        # và trạng thái deadline của chúng
+        for status, counter in assignee_data["status"].items():
+            if (status or "").lower() in done_statuses:
+                assignees[assignee]["done_issues"] += counter["issues"]
+                assignees[assignee]["ahead_of_schedule"] += counter.get("ahead", 0)
+                assignees[assignee]["behind_schedule"] += counter.get("behind", 0)
+                assignees[assignee]["on_schedule"] += counter.get("on", 0)
 
     # Loại bỏ assignee "Không có" nếu có
     if "Không có" in assignees:
@@ -1221,11 +1308,11 @@ def display_performance_chart(filtered_issues):
         )
 
 
-def display_time_analysis_by_user(filtered_issues):
+def display_time_analysis_by_user(summary):
     """Hiển thị biểu đồ phân tích thời gian theo user
 
     Args:
-        filtered_issues (list): Danh sách issues đã được lọc
+        summary (dict): Số liệu tổng hợp của các issues cần phân tích
     """
     st.subheader(
         "Phân tích thời gian theo User",
@@ -1235,45 +1322,16 @@ def display_time_analysis_by_user(filtered_issues):
     # Tạo dictionary để lưu thời gian theo user
     user_time = {}
 
-    # Lọc các issue có sprint_time_spent
-    issues_with_sprint_time = [
-        issue for issue in filtered_issues if issue.get("sprint_time_spent", 0) > 0
-    ]
-
-    for issue in issues_with_sprint_time:
-        assignee = issue.get("assignee", "Không có")
-        if assignee not in user_time:
-            user_time[assignee] = {
-                "non_dev": 0,  # Thời gian cho issue non-dev
-                "popup": 0,  # Thời gian cho issue popup
-                "development": 0,  # Thời gian cho issue development
-                "issues": {  # Lưu danh sách issues cho mỗi loại
-                    "non_dev": [],
-                    "popup": [],
-                    "development": [],
-                },
-            }
-
-        sprint_time_spent = issue.get("sprint_time_spent", 0)
-        show_in_dashboard_value = issue.get("show_in_dashboard", "")
-        show_in_dashboard = show_in_dashboard_value is True or (
-            isinstance(show_in_dashboard_value, str)
-            and show_in_dashboard_value.upper() == "YES"
-        )
-        popup_value = issue.get("popup", "")
-        is_popup = popup_value is True or (
-            isinstance(popup_value, str) and popup_value.upper() == "YES"
-        )
-
-        if not show_in_dashboard:
-            user_time[assignee]["non_dev"] += sprint_time_spent
-            user_time[assignee]["issues"]["non_dev"].append(issue)
-        elif is_popup:
-            user_time[assignee]["popup"] += sprint_time_spent
-            user_time[assignee]["issues"]["popup"].append(issue)
-        else:
-            user_time[assignee]["development"] += sprint_time_spent
-            user_time[assignee]["issues"]["development"].append(issue)
+    # Thời gian của các issue có sprint_time_spent, theo loại issue: non-dev (không
+    # có Show In Dashboard), popup và development
+    for assignee, assignee_data in summary["assignees"].items():
+        categories = assignee_data["time_category"]
+        if assignee is None or not categories:
+            continue
+        user_time[assignee] = {
+            category: categories.get(category, {}).get("sprint_time_spent", 0)
+            for category in ["non_dev", "popup", "development"]
+        }
 
     # Loại bỏ user "Không có" nếu có
     if "Không có" in user_time:
@@ -1482,28 +1540,32 @@ def main():
     selected_sprint = sprint_options[selected_sprint_idx]
     sprint_id = selected_sprint["id"]
 
-    # Lấy dữ liệu issues từ MongoDB ngay khi chọn sprint
+    # Lấy thông tin sprint từ MongoDB ngay khi chọn sprint
     # Kiểm tra xem sprint_id hiện tại có khác với sprint_id đã lưu không
     should_reload_data = (
         "current_sprint_id" not in st.session_state
         or st.session_state.current_sprint_id != sprint_id
-        or "issues" not in st.session_state
+        or "sprint_mongo_info" not in st.session_state
     )
 
     if should_reload_data:
         with st.spinner("Đang tải dữ liệu từ MongoDB..."):
-            issues = sprint_service.get_sprint_issues_from_mongo(sprint_id)
-            st.session_state.issues = issues
-            st.session_state.current_sprint_id = sprint_id
-
-            # Cũng tải thông tin sprint từ MongoDB
             sprint_mongo_info = sprint_service.get_sprint_info_from_mongo(sprint_id)
             st.session_state.sprint_mongo_info = sprint_mongo_info
+            st.session_state.current_sprint_id = sprint_id
     else:
-        issues = st.session_state.issues
         sprint_mongo_info = st.session_state.sprint_mongo_info
 
-    if not issues:
+    # Các biểu đồ dùng số liệu tổng hợp tính sẵn khi đồng bộ, danh sách issues chỉ
+    # được truy vấn khi cần (chỉ các trường và issues cần hiển thị).
+    # Thời điểm cập nhật sprint là khóa cache: đồng bộ lại sẽ lấy dữ liệu mới
+    data_version = (sprint_mongo_info or {}).get("updated_at")
+    aggregates = sprint_service.get_sprint_aggregates(sprint_id, data_version)
+
+    def query_issues(filters=None, fields=None):
+        return sprint_service.query_issues(sprint_id, data_version, filters, fields)
+
+    if not aggregates or not aggregates.total_issues:
         st.warning(f"Không tìm thấy dữ liệu cho sprint này trong MongoDB!")
         st.info(
             "Vui lòng đồng bộ dữ liệu sprint này trong trang **Đồng bộ dữ liệu** trước khi xem báo cáo."
@@ -1551,40 +1613,16 @@ def main():
                 key="include_todo_tab1",
             )
 
-        # Lọc issues theo show_in_dashboard_final và include_todo
-        if show_dashboard_final:
-            issues_final = [
-                issue for issue in issues if issue.get("show_in_dashboard_final", False)
-            ]
-            # Nếu include_todo được bật, bổ sung thêm các issue To Do có show_in_dashboard
-            if include_todo:
-                todo_issues = [
-                    issue
-                    for issue in issues
-                    if issue.get("status") == "To Do"
-                    and issue.get("show_in_dashboard", False)
-                    and not issue.get("show_in_dashboard_final", False)
-                ]
-                issues_final.extend(todo_issues)
-
-            # Thêm các issue có log time và SHOW IN DASHBOARD = YES
-            additional_issues = [
-                issue
-                for issue in issues
-                if issue.get("show_in_dashboard", False)
-                and issue.get("time_spent", 0) > 0  # Có log time
-                and not issue.get(
-                    "show_in_dashboard_final", False
-                )  # Chưa có trong danh sách
-                and issue.get("status") != "To Do"  # Không phải issue To Do
-            ]
-            issues_final.extend(additional_issues)
+        # Lọc issues theo show_in_dashboard_final và include_todo, bổ sung các
+        # issue có log time và SHOW IN DASHBOARD = YES (lọc phía MongoDB)
+        issues_final_filter = build_dashboard_filter(show_dashboard_final, include_todo)
+        segments = report_segments(show_dashboard_final, include_todo)
+        issues_final = aggregates.select(segments)
+        total_final_issues = issues_final["issues"]
 
-            if not issues_final:
-                st.warning("Không có issue nào thỏa mãn điều kiện hiển thị!")
-                st.stop()
-        else:
-            issues_final = issues
+        if show_dashboard_final and not total_final_issues:
+            st.warning("Không có issue nào thỏa mãn điều kiện hiển thị!")
+            st.stop()
 
         # Hiển thị thông tin cơ bản của sprint trong bố cục cột
         st.subheader(
@@ -1649,15 +1687,9 @@ def main():
             )
 
         with filter_col2:
-            # Lấy danh sách assignee từ issues_final
+            # Lấy danh sách assignee của các issues trong báo cáo
             assignees = sorted(
-                list(
-                    set(
-                        issue.get("assignee", "")
-                        for issue in issues_final
-                        if issue.get("assignee")
-                    )
-                )
+                assignee for assignee in issues_final["assignees"] if assignee
             )
             assignees.insert(0, "Tất cả")  # Thêm option "Tất cả" vào đầu danh sách
             selected_assignee = st.selectbox(
@@ -1665,47 +1697,38 @@ def main():
             )
 
         # Lọc issues theo dev_group và assignee đã chọn
-        filtered_issues = [
-            issue
-            for issue in issues_final
-            if (
-                selected_dev_group == "DEV FULL + DEV FE"
-                and issue.get("dev_group") in ["DEV FULL", "DEV FE"]
-            )
-            or issue.get("dev_group") == selected_dev_group
-            and (
-                selected_assignee == "Tất cả"
-                or issue.get("assignee") == selected_assignee
-            )
-        ]
+        filtered_filter = build_group_filter(
+            issues_final_filter, selected_dev_group, selected_assignee
+        )
+        summary = aggregates.select(
+            segments,
+            report_dev_groups(selected_dev_group),
+            None if selected_assignee == "Tất cả" else selected_assignee,
+        )
 
         # Hiển thị thống kê
         st.subheader("Thống kê")
 
         stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
 
+        # Số issue theo trạng thái (không phân biệt hoa thường)
+        status_issues = {}
+        for status, counter in summary["status"].items():
+            status = (status or "").lower()
+            status_issues[status] = status_issues.get(status, 0) + counter["issues"]
+        total_issues = summary["issues"]
+
         with stat_col1:
-            total_issues = len(filtered_issues)
-            done_issues = len(
-                [
-                    issue
-                    for issue in filtered_issues
-                    if issue.get("status", "").lower() in ["done"]
-                ]
-            )
+            done_issues = status_issues.get("done", 0)
             st.metric(
                 "Tổng số issue Done",
                 f"{done_issues}/{total_issues} ({(done_issues/total_issues)*100:.1f}%)",
             )
 
         with stat_col2:
-            dev_done_issues = len(
-                [
-                    issue
-                    for issue in filtered_issues
-                    if issue.get("status", "").lower()
-                    in ["dev done", "test done", "deployed", "done"]
-                ]
+            dev_done_issues = sum(
+                status_issues.get(status, 0)
+                for status in ["dev done", "test done", "deployed", "done"]
             )
             st.metric(
                 "Số issue dev done",
@@ -1713,44 +1736,44 @@ def main():
             )
 
         with stat_col3:
-            popup_issues = len(
-                [issue for issue in filtered_issues if issue.get("popup") is True]
-            )
+            popup_issues = summary["popup"]
             st.metric(
                 "Số issue Popup",
                 f"{popup_issues}/{total_issues} ({(popup_issues/total_issues)*100:.1f}%)",
             )
 
         with stat_col4:
-            dashboard_final_issues = len(
-                [
-                    issue
-                    for issue in filtered_issues
-                    if issue.get("show_in_dashboard_final") is True
-                ]
-            )
+            dashboard_final_issues = summary["dashboard_final"]
             st.metric("Số issue Dashboard Final", dashboard_final_issues)
 
         # Hiển thị danh sách issues
-        if filtered_issues:
+        if total_issues:
             # Hiển thị Burn Down Chart
             display_burndown_chart(
-                filtered_issues,
+                summary,
                 selected_sprint["data"].get("startDate", ""),
                 selected_sprint["data"].get("endDate", ""),
             )
             # Hiển thị Status Chart
-            display_status_chart(filtered_issues)
+            display_status_chart(summary)
 
             # Hiển thị phân bố theo loại issue và customer
-            display_distribution_charts(filtered_issues)
+            display_distribution_charts(summary)
 
             # Hiển thị biểu đồ đánh giá hiệu suất của assignee
-            display_performance_chart(filtered_issues)
+            display_performance_chart(summary)
 
-            # Hiển thị phân bố chênh lệch thời gian
+            # Hiển thị phân bố chênh lệch thời gian (không gồm các issues chỉ được
+            # bổ sung vì đã log time)
+            time_diff_filter = build_group_filter(
+                build_dashboard_filter(
+                    show_dashboard_final, include_todo, include_logged=False
+                ),
+                selected_dev_group,
+                selected_assignee,
+            )
             display_time_diff_charts(
-                filtered_issues, show_dashboard_final, include_todo
+                query_issues(time_diff_filter, TIME_DIFF_FIELDS), show_dashboard_final
             )
 
             # Hiển thị danh sách các issues đã lọc
@@ -1759,7 +1782,7 @@ def main():
             # Tạo expander để không chiếm quá nhiều không gian trên trang
             with st.expander("Nhấn để xem danh sách chi tiết", expanded=False):
                 # Chuyển danh sách issues sang DataFrame
-                df_issues = pd.DataFrame(filtered_issues)
+                df_issues = pd.DataFrame(query_issues(filtered_filter))
 
                 # Hiển thị DataFrame
                 st.dataframe(
@@ -1771,7 +1794,7 @@ def main():
 
                 # Thông tin về số lượng issues đang hiển thị
                 st.caption(
-                    f"Hiển thị {len(filtered_issues)} issues từ tổng số {len(issues_final)} trong filter hiện tại."
+                    f"Hiển thị {total_issues} issues từ tổng số {total_final_issues} trong filter hiện tại."
                 )
 
         else:
@@ -1779,7 +1802,7 @@ def main():
 
     with tab2:
         # Hiển thị phân tích thời gian theo user
-        display_time_analysis_by_user(issues)
+        display_time_analysis_by_user(aggregates.select())
 
 
 def format_date(date_str):
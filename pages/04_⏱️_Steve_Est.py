@@ -73,23 +73,9 @@ class SteveEstimateService:
         if sprint_id:
             jql += f" AND sprint = {sprint_id}"
 
-        # Các fields cần lấy, bao gồm customfield_10159 (steve estimate)
-        fields = [
-            "key",
-            "summary",
-            "issuetype",
-            "timeoriginalestimate",
-            "timeestimate",
-            "timespent",
-            "customfield_10159",
-            "subtasks",
-            "status",
-            "assignee",
-        ]
-
         # Tìm kiếm issues
         try:
-            issues = self.jira.search_issues(jql, fields)
+            issues = self.jira.search_issues(jql, profiles=["steve_est"])
             if issues:
                 st.toast(
                     f"Đã tìm thấy {len(issues)} issues có Steve Estimate!", icon="✅"
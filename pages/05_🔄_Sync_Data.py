@@ -23,11 +23,13 @@ from src.config.config import (
     APP_LAYOUT,
     SIDEBAR_STATE,
     DEFAULT_PROJECT,
+    NUM_WORKERS,
 )
 from src.services.data_sync.sync_service import DataSyncService
+from src.services.data_sync.scheduler import get_sync_status, enqueue_sprint_sync
 from src.services.mongodb_client import is_running_in_streamlit
 from src.services.utils.issue_utils import safe_get_status
-from src.ui.components.sprint_selector import select_sprint
+from src.ui.components.sprint_selector import select_sprint, prepare_sprint_options
 import json
 
 
@@ -110,6 +112,9 @@ def display_sync_tab(sync_service):
             if not local_sprints:
                 local_sprints = sync_service.sync_all_sprints(DEFAULT_PROJECT)
 
+    selected_sprint = None
+    incremental = True
+
     # Hiển thị các sprints để lựa chọn
     if local_sprints:
         st.subheader("Chọn Sprint để đồng bộ Issues")
@@ -118,6 +123,12 @@ def display_sync_tab(sync_service):
         selected_sprint = select_sprint(local_sprints)
         sprint_id = selected_sprint["id"]
 
+        incremental = st.checkbox(
+            "Chỉ đồng bộ các issues thay đổi từ lần đồng bộ trước",
+            value=True,
+            help="Bỏ chọn để tải lại toàn bộ issues của sprint",
+        )
+
         # Nút đồng bộ issues full width
         if st.button(
             f"Đồng bộ Issues của Sprint {selected_sprint.get('name', '')}",
@@ -125,21 +136,173 @@ def display_sync_tab(sync_service):
         ):
             with st.status("Đang đồng bộ...", expanded=True) as status:
                 # Đồng bộ issues của sprint
-                issues = sync_service.sync_sprint_issues(sprint_id)
-                if issues:
+                issue_count = sync_service.sync_sprint_issues(
+                    sprint_id, incremental=incremental
+                )
+                if issue_count is not None:
                     status.update(
-                        label=f"Đã đồng bộ {len(issues)} issues",
+                        label=f"Đã đồng bộ {issue_count} issues",
                         state="complete",
                         expanded=False,
                     )
                     st.toast(
-                        f"Đã đồng bộ {len(issues)} issues của sprint {selected_sprint.get('name', '')}",
+                        f"Đã đồng bộ {issue_count} issues của sprint {selected_sprint.get('name', '')}",
                         icon="✅",
                     )
+                else:
+                    status.update(
+                        label="Đồng bộ thất bại", state="error", expanded=True
+                    )
     else:
         st.warning("Chưa có dữ liệu sprints nào. Vui lòng đồng bộ sprints trước.")
 
 
+    if local_sprints:
+        st.divider()
+        display_multi_sprint_sync(sync_service, local_sprints, incremental)
+
+    st.divider()
+    display_scheduler_status(sync_service, selected_sprint, incremental)
+
+
+def display_multi_sprint_sync(sync_service, sprints, incremental=True):
+    """Hiển thị chức năng đồng bộ issues của nhiều sprint song song
+
+    Args:
+        sync_service (DataSyncService): Dịch vụ đồng bộ dữ liệu
+        sprints (list): Danh sách sprints của dự án
+        incremental (bool): Chỉ lấy issues thay đổi từ lần đồng bộ trước
+    """
+    st.subheader("Đồng bộ Issues của nhiều Sprint")
+
+    sprint_options = prepare_sprint_options(sprints)
+    sync_all = st.checkbox(f"Tất cả {len(sprint_options)} sprints của dự án")
+    if sync_all:
+        selected = sprint_options
+    else:
+        selected = st.multiselect(
+            "Chọn các Sprint",
+            options=sprint_options,
+            format_func=lambda option: option["display"],
+            key="multi_sprint_selector",
+        )
+
+    max_workers = st.slider(
+        "Số sprint đồng bộ cùng lúc",
+        min_value=1,
+        max_value=max(NUM_WORKERS, 10),
+        value=NUM_WORKERS,
+        help="Mọi sprint dùng chung giới hạn tốc độ và số request đồng thời tới Jira",
+    )
+
+    if st.button(
+        f"Đồng bộ Issues của {len(selected)} Sprints",
+        use_container_width=True,
+        disabled=not selected,
+    ):
+        names = {option["id"]: option["data"].get("name", "") for option in selected}
+        with st.status("Đang đồng bộ...", expanded=True) as status:
+            results = sync_service.sync_sprints_issues(
+                list(names), incremental=incremental, max_workers=max_workers
+            )
+            failed = [sprint_id for sprint_id, count in results.items() if count is None]
+            synced = sum(count for count in results.values() if count is not None)
+            status.update(
+                label=(
+                    f"Đã đồng bộ {len(results) - len(failed)}/{len(names)} sprints, "
+                    f"{synced} issues, {len(failed)} sprints thất bại"
+                ),
+                state="error" if failed else "complete",
+                expanded=False,
+            )
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "Sprint": names[sprint_id],
+                        "ID": sprint_id,
+                        "Số issues": count,
+                        "Trạng thái": "Thất bại" if count is None else "Thành công",
+                    }
+                    for sprint_id, count in results.items()
+                ]
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
+def display_scheduler_status(sync_service, selected_sprint=None, incremental=True):
+    """Hiển thị trạng thái đồng bộ chạy nền (scheduler) và hàng đợi job
+
+    Args:
+        sync_service (DataSyncService): Dịch vụ đồng bộ dữ liệu
+        selected_sprint (dict, optional): Sprint đang chọn để đưa vào hàng đợi
+        incremental (bool): Chỉ lấy issues thay đổi từ lần đồng bộ trước
+    """
+    st.subheader("Đồng bộ chạy nền")
+
+    status = get_sync_status(sync_service.mongo_client)
+    if status is None:
+        st.warning("Không thể kết nối đến MongoDB để đọc hàng đợi đồng bộ.")
+        return
+
+    scheduler = status["scheduler"]
+    if status["alive"]:
+        st.success(
+            f"Scheduler đang chạy ({scheduler.get('worker')}), "
+            f"{len(scheduler.get('running_jobs', []))}/{scheduler.get('max_workers')} "
+            "sprint đang đồng bộ"
+        )
+    elif scheduler:
+        st.warning(
+            "Scheduler không hoạt động, lần cuối lúc "
+            f"{scheduler['heartbeat_at'].strftime('%d/%m/%Y %H:%M:%S')} (UTC). "
+            "Khởi động bằng: python run.py scheduler"
+        )
+    else:
+        st.info("Scheduler chưa từng chạy. Khởi động bằng: python run.py scheduler")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if selected_sprint and st.button(
+            f"Đưa Sprint {selected_sprint['data'].get('name', '')} vào hàng đợi",
+            use_container_width=True,
+        ):
+            if enqueue_sprint_sync(
+                sync_service.mongo_client, selected_sprint["id"], incremental
+            ):
+                st.toast("Đã đưa sprint vào hàng đợi đồng bộ", icon="✅")
+            else:
+                st.toast("Sprint đang chờ hoặc đang được đồng bộ", icon="⚠️")
+            status = get_sync_status(sync_service.mongo_client)
+    with col2:
+        if st.button("Làm mới trạng thái", use_container_width=True):
+            st.rerun()
+
+    if not status["jobs"]:
+        st.info("Chưa có job đồng bộ nào.")
+        return
+
+    rows = []
+    for job in status["jobs"]:
+        last_result = job.get("last_result") or {}
+        rows.append(
+            {
+                "Sprint": job.get("sprint_name") or job.get("sprint_id"),
+                "Trạng thái sprint": job.get("sprint_state"),
+                "Job": job.get("status"),
+                "Chu kỳ (phút)": job.get("interval_minutes"),
+                "Lần tới (UTC)": job.get("next_run_at"),
+                "Kết thúc lần trước (UTC)": job.get("finished_at"),
+                "Số issues": last_result.get("issues"),
+                "Thời gian (s)": last_result.get("duration_seconds"),
+                "Lỗi": last_result.get("error"),
+            }
+        )
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+
 def display_debug_tab(sync_service):
     """Hiển thị tab debug issue
 
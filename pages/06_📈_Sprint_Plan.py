@@ -71,28 +71,18 @@ class SprintStatService:
 
         Args:
             sprint_id (int): ID của sprint
-            fields (list, optional): Danh sách các trường cần lấy
+            fields (list, optional): Các trường cần lấy thêm ngoài field profile "sprint_plan"
 
         Returns:
-            list: Danh sách các issue trong sprint
+            list: Danh sách các issue trong sprint, None nếu không lấy được đầy đủ
         """
-        if fields is None:
-            fields = [
-                "summary",
-                "issuetype",
-                "priority",
-                "assignee",
-                "status",
-                "customfield_10016",  # Story Points
-                "timeoriginalestimate",
-                "timeestimate",
-                "timespent",
-                "created",
-                "subtasks",  # Thêm trường subtasks để kiểm tra có subtasks không
-            ]
-
         # Lấy tất cả issues của sprint
-        return self.jira.get_sprint_issues(sprint_id, fields=fields, project_key=st.session_state.selected_project)
+        return self.jira.get_sprint_issues(
+            sprint_id,
+            fields=fields,
+            project_key=st.session_state.selected_project,
+            profiles=["sprint_plan"],
+        )
 
     def calculate_sprint_stats(self, sprint_issues):
         """Tính toán thống kê cho sprint
@@ -380,6 +370,9 @@ def display_sprint_stats():
         """Lấy và lọc dữ liệu issues từ Jira"""
         # Lấy issues từ sprint
         sprint_issues = stat_service.get_sprint_issues(sprint_id)
+        if sprint_issues is None:
+            st.error("Không lấy được đầy đủ issues của sprint từ Jira!")
+            return None, 0, 0
 
         if not sprint_issues:
             return None, 0, 0
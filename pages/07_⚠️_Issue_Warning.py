@@ -92,22 +92,8 @@ def get_active_sprint(project_key):
 
 def get_sprint_issues(sprint_id, project_key):
     """Lấy danh sách issues của sprint với các trường cần thiết"""
-    fields = [
-        "summary",
-        "issuetype",
-        "priority",
-        "assignee",
-        "status",
-        "duedate",
-        "created",
-        "updated",
-        "subtasks",
-        "timeestimate",
-        "timeoriginalestimate",
-        "worklog",
-    ]
     return jira_client.get_sprint_issues(
-        sprint_id, fields=fields, project_key=project_key
+        sprint_id, project_key=project_key, profiles=["issue_warning"]
     )
 
 
@@ -450,6 +436,9 @@ def main():
 
     # Lấy danh sách issues
     issues = get_sprint_issues(selected_sprint["id"], DEFAULT_PROJECT)
+    if issues is None:
+        st.error("Không lấy được đầy đủ issues của sprint từ Jira!")
+        return
     if not issues:
         st.warning("Không có issue nào trong sprint!")
         return
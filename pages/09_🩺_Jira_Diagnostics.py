@@ -0,0 +1,275 @@
+import streamlit as st
+
+# Set page configuration first
+st.set_page_config(
+    page_title="Chẩn đoán Jira API | Jira Analytics",
+    page_icon="🩺",
+    layout="wide",
+    initial_sidebar_state="auto",
+)
+
+import os
+import sys
+import pandas as pd
+from datetime import datetime
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+# Import from src modules
+from src.services.jira.metrics import get_metrics_registry
+from src.services.mongodb_client import MongoDBClient
+
+# Các cột hiển thị trong bảng số liệu endpoint
+ENDPOINT_COLUMNS = {
+    "method": "Method",
+    "endpoint": "Endpoint",
+    "count": "Số request",
+    "cache_hits": "Cache hit",
+    "retries": "Retry",
+    "errors": "Lỗi",
+    "bytes_received": "Bytes",
+    "total_seconds": "Tổng (s)",
+    "avg_seconds": "TB (s)",
+    "p50_seconds": "p50 (s)",
+    "p90_seconds": "p90 (s)",
+    "p99_seconds": "p99 (s)",
+    "max_seconds": "Max (s)",
+}
+
+
+# Các cột hiển thị trong bảng số liệu các bước của pipeline đồng bộ
+STAGE_COLUMNS = {
+    "stage": "Bước",
+    "items": "Số phần tử",
+    "busy_seconds": "Xử lý (s)",
+    "input_wait_seconds": "Chờ bước trước (s)",
+    "output_wait_seconds": "Chờ bước sau (s)",
+    "items_per_second": "Phần tử/giây",
+}
+
+# Các cột hiển thị trong bảng kích thước trang search
+PAGE_SIZE_COLUMNS = {
+    "profile": "Tập trường",
+    "page_size": "Kích thước trang",
+    "server_cap": "Giới hạn của Jira",
+    "bytes_per_issue": "Byte/issue",
+    "ms_per_issue": "ms/issue",
+}
+
+
+# Các cột hiển thị trong bảng các lô ghi MongoDB
+WRITE_BATCH_COLUMNS = {
+    "collection": "Collection",
+    "batches": "Số lô",
+    "operations": "Số thao tác",
+    "bytes_sent": "Bytes",
+    "total_seconds": "Tổng (s)",
+    "avg_seconds": "TB/lô (s)",
+    "max_seconds": "Max/lô (s)",
+    "retries": "Thử lại",
+    "failed_batches": "Lô lỗi",
+}
+
+
+def write_batches_to_dataframe(write_batches):
+    """Chuyển danh sách số liệu các lô ghi MongoDB thành DataFrame để hiển thị
+
+    Args:
+        write_batches (list): Danh sách từ MetricsRegistry.write_batch_snapshot()
+
+    Returns:
+        pd.DataFrame: Bảng số liệu
+    """
+    df = pd.DataFrame(write_batches, columns=list(WRITE_BATCH_COLUMNS))
+    return df.rename(columns=WRITE_BATCH_COLUMNS)
+
+
+def page_sizes_to_dataframe(page_sizes):
+    """Chuyển danh sách kích thước trang search thành DataFrame để hiển thị
+
+    Args:
+        page_sizes (list): Danh sách từ MetricsRegistry.page_size_snapshot()
+
+    Returns:
+        pd.DataFrame: Bảng số liệu
+    """
+    df = pd.DataFrame(page_sizes, columns=list(PAGE_SIZE_COLUMNS))
+    return df.rename(columns=PAGE_SIZE_COLUMNS)
+
+
+def stages_to_dataframe(stages):
+    """Chuyển danh sách số liệu các bước pipeline thành DataFrame để hiển thị
+
+    Args:
+        stages (list): Danh sách số liệu từ MetricsRegistry.stage_snapshot()
+
+    Returns:
+        pd.DataFrame: Bảng số liệu
+    """
+    df = pd.DataFrame(stages, columns=list(STAGE_COLUMNS))
+    return df.rename(columns=STAGE_COLUMNS)
+
+
+def endpoints_to_dataframe(endpoints):
+    """Chuyển danh sách số liệu endpoint thành DataFrame để hiển thị
+
+    Args:
+        endpoints (list): Danh sách số liệu từ MetricsRegistry.snapshot()
+
+    Returns:
+        pd.DataFrame: Bảng số liệu
+    """
+    rows = []
+    for endpoint in endpoints:
+        row = dict(endpoint)
+        row["errors"] = ", ".join(
+            f"{code}: {count}" for code, count in endpoint.get("errors", {}).items()
+        )
+        rows.append(row)
+    df = pd.DataFrame(rows, columns=list(ENDPOINT_COLUMNS))
+    return df.rename(columns=ENDPOINT_COLUMNS)
+
+
+def display_process_metrics():
+    """Hiển thị số liệu Jira API của process hiện tại"""
+    registry = get_metrics_registry()
+    endpoints = registry.snapshot()
+
+    st.subheader("Số liệu Jira API của process hiện tại")
+    st.caption(
+        "Từ "
+        + datetime.fromtimestamp(registry.started_at).strftime("%d/%m/%Y %H:%M:%S")
+    )
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Request", sum(e["count"] for e in endpoints))
+    col2.metric("Retry", sum(e["retries"] for e in endpoints))
+    col3.metric("Lỗi", sum(sum(e["errors"].values()) for e in endpoints))
+    col4.metric(
+        "Dữ liệu nhận",
+        f"{sum(e['bytes_received'] for e in endpoints) / (1024 * 1024):.2f} MB",
+    )
+
+    if not endpoints:
+        st.info("Chưa có request nào tới Jira API trong process này.")
+    else:
+        st.dataframe(
+            endpoints_to_dataframe(endpoints),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    stages = registry.stage_snapshot()
+    if stages:
+        st.markdown("**Pipeline đồng bộ** (bước có thời gian xử lý lớn nhất là nút thắt)")
+        st.dataframe(
+            stages_to_dataframe(stages), use_container_width=True, hide_index=True
+        )
+
+    page_sizes = registry.page_size_snapshot()
+    if page_sizes:
+        st.markdown("**Kích thước trang search** (tự điều chỉnh theo tập trường)")
+        st.dataframe(
+            page_sizes_to_dataframe(page_sizes),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    write_batches = registry.write_batch_snapshot()
+    if write_batches:
+        st.markdown("**Ghi MongoDB theo lô** (bulk_write)")
+        st.dataframe(
+            write_batches_to_dataframe(write_batches),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button(
+            "Tải JSON",
+            registry.to_json(),
+            file_name="jira_metrics.json",
+            mime="application/json",
+            use_container_width=True,
+        )
+    with col2:
+        st.download_button(
+            "Tải Prometheus text",
+            registry.to_prometheus(),
+            file_name="jira_metrics.prom",
+            mime="text/plain",
+            use_container_width=True,
+        )
+    with col3:
+        if st.button("Xóa số liệu", use_container_width=True):
+            registry.reset()
+            st.rerun()
+
+
+def display_sync_metrics():
+    """Hiển thị số liệu Jira API được lưu cùng mỗi lần đồng bộ sprint"""
+    st.subheader("Số liệu các lần đồng bộ sprint")
+
+    mongo_client = MongoDBClient()
+    if not mongo_client.is_connected():
+        st.warning("Không thể kết nối đến MongoDB.")
+        return
+
+    sprints = [s for s in mongo_client.get_all_sprints() if s.get("sync_metrics")]
+    if not sprints:
+        st.info("Chưa có lần đồng bộ nào có số liệu Jira API.")
+        return
+
+    rows = []
+    for sprint in sprints:
+        metrics = sprint["sync_metrics"]
+        rows.append(
+            {
+                "Sprint": sprint.get("sprint_name"),
+                "Đồng bộ lúc": sprint.get("updated_at"),
+                "Số issues": sprint.get("total_issues"),
+                "Thời gian (s)": metrics.get("duration_seconds"),
+                "Request": metrics.get("requests"),
+                "Retry": metrics.get("retries"),
+                "Lỗi": metrics.get("errors"),
+                "Bytes": metrics.get("bytes_received"),
+            }
+        )
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+    selected = st.selectbox(
+        "Chi tiết endpoint chậm nhất của sprint",
+        sprints,
+        format_func=lambda s: s.get("sprint_name", s.get("_id")),
+    )
+    if selected:
+        st.dataframe(
+            endpoints_to_dataframe(selected["sync_metrics"].get("slowest_endpoints", [])),
+            use_container_width=True,
+            hide_index=True,
+        )
+        stages = selected["sync_metrics"].get("pipeline_stages")
+        if stages:
+            st.dataframe(
+                stages_to_dataframe(stages), use_container_width=True, hide_index=True
+            )
+        write_batches = selected["sync_metrics"].get("write_batches")
+        if write_batches:
+            st.dataframe(
+                write_batches_to_dataframe(write_batches),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+
+def main():
+    st.title("Chẩn đoán Jira API")
+    display_process_metrics()
+    st.divider()
+    display_sync_metrics()
+
+
+if __name__ == "__main__":
+    main()
@@ -27,5 +27,16 @@ def run_streamlit():
         sys.exit(1)
 
 
+def run_scheduler():
+    """Run the background sync scheduler"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(script_dir)
+    cmd = [sys.executable, "-m", "src.script.sync_scheduler", *sys.argv[2:]]
+    sys.exit(subprocess.run(cmd).returncode)
+
+
 if __name__ == "__main__":
-    run_streamlit()
+    if len(sys.argv) > 1 and sys.argv[1] == "scheduler":
+        run_scheduler()
+    else:
+        run_streamlit()
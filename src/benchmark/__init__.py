@@ -0,0 +1,7 @@
+# Benchmark đồng bộ với Jira giả lập.
+# Không import suite ở đây: suite đọc cấu hình Jira khi import, nên chỉ được nạp
+# sau khi mock server đã chạy và JIRA_URL đã trỏ tới server.
+from src.benchmark.fixtures import JiraFixtures, generate_sprint_fixtures
+from src.benchmark.mock_jira import MockJiraServer
+
+__all__ = ["JiraFixtures", "generate_sprint_fixtures", "MockJiraServer"]
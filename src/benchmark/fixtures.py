@@ -0,0 +1,284 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+# Luồng trạng thái của issue trong sprint tổng hợp
+STATUS_FLOW = ["To Do", "In Progress", "Dev Done", "Test Done", "Done"]
+
+ASSIGNEES = [
+    "Vũ Thanh Trung Anh",
+    "Thuong Le",
+    "Trường Nguyễn Bá",
+    "Hán Văn Nam",
+    "Tran Toan Thang",
+    "Nguyễn Nhật Minh",
+]
+
+FIELD_DEFINITIONS = [
+    {"id": "summary", "name": "Summary", "custom": False},
+    {"id": "status", "name": "Status", "custom": False},
+    {"id": "assignee", "name": "Assignee", "custom": False},
+    {"id": "worklog", "name": "Log Work", "custom": False},
+    {"id": "customfield_10159", "name": "Steve Estimate", "custom": True},
+    {"id": "customfield_10160", "name": "Show in Dashboard", "custom": True},
+    {"id": "customfield_10130", "name": "Popup", "custom": True},
+    {"id": "customfield_10092", "name": "Customer", "custom": True},
+    {"id": "customfield_10132", "name": "Feature", "custom": True},
+    {"id": "customfield_10031", "name": "Tester", "custom": True},
+]
+
+
+def format_jira_datetime(value):
+    """Định dạng datetime theo kiểu Jira (2024-05-01T10:00:00.000+0000)"""
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000%z")
+
+
+class JiraFixtures:
+    """Dữ liệu Jira mà mock server trả về: boards, sprints, issues, worklogs, changelogs
+
+    Issue lưu đầy đủ như Jira (fields gồm cả worklog, changelog đầy đủ); mock
+    server tự lọc trường, cắt changelog và phân trang theo request.
+    """
+
+    def __init__(self, project_key, boards, sprints, issues, sprint_issues, fields=None):
+        """Khởi tạo fixtures
+
+        Args:
+            project_key (str): Mã dự án
+            boards (list): Boards (agile/1.0/board)
+            sprints (list): Sprints (agile/1.0/sprint/{id}), có trường originBoardId
+            issues (list): Issues đầy đủ ({"id", "key", "fields", "changelog"})
+            sprint_issues (dict): Sprint ID -> danh sách issue key theo thứ tự
+            fields (list, optional): Danh sách trường (api/3/field)
+        """
+        self.project_key = project_key
+        self.boards = boards
+        self.sprints = sprints
+        self.issues = issues
+        self.sprint_issues = {int(k): list(v) for k, v in sprint_issues.items()}
+        self.fields = fields if fields is not None else list(FIELD_DEFINITIONS)
+        self.index()
+
+    def index(self):
+        """Tạo các chỉ mục tra cứu theo key, ID và sprint"""
+        self.issues_by_key = {issue["key"]: issue for issue in self.issues}
+        self.boards_by_id = {board["id"]: board for board in self.boards}
+        self.sprints_by_id = {sprint["id"]: sprint for sprint in self.sprints}
+        self.issue_sprints = {}
+        for sprint_id, keys in self.sprint_issues.items():
+            for key in keys:
+                self.issue_sprints.setdefault(key, set()).add(sprint_id)
+
+    def to_dict(self):
+        return {
+            "project_key": self.project_key,
+            "boards": self.boards,
+            "sprints": self.sprints,
+            "issues": self.issues,
+            "sprint_issues": {str(k): v for k, v in self.sprint_issues.items()},
+            "fields": self.fields,
+        }
+
+    def save(self, path):
+        """Ghi fixtures ra file JSON để chạy lại sau"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """Đọc fixtures đã ghi (tổng hợp hoặc ghi lại từ Jira thật)
+
+        Args:
+            path (str): Đường dẫn file JSON
+
+        Returns:
+            JiraFixtures: Fixtures
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            data["project_key"],
+            data["boards"],
+            data["sprints"],
+            data["issues"],
+            data["sprint_issues"],
+            data.get("fields"),
+        )
+
+
+def _make_changelog(rng, issue_id, start, end, history_count):
+    """Tạo changelog với history_count lần chuyển trạng thái trong khoảng [start, end]"""
+    histories = []
+    span = (end - start).total_seconds()
+    status_index = 0
+    for i in range(history_count):
+        moment = start + timedelta(seconds=span * (i + 1) / (history_count + 1))
+        # Đi hết luồng trạng thái rồi thỉnh thoảng mở lại để tạo reopen
+        if status_index == len(STATUS_FLOW) - 1:
+            next_index = 1
+        else:
+            next_index = status_index + 1
+        histories.append(
+            {
+                "id": f"{issue_id}{i:04d}",
+                "created": format_jira_datetime(moment),
+                "items": [
+                    {
+                        "field": "status",
+                        "fromString": STATUS_FLOW[status_index],
+                        "toString": STATUS_FLOW[next_index],
+                    }
+                ],
+            }
+        )
+        status_index = next_index
+    return {"histories": histories}, STATUS_FLOW[status_index]
+
+
+def _make_worklogs(rng, start, end, count):
+    """Tạo worklogs rải đều trong khoảng [start, end]"""
+    worklogs = []
+    span = (end - start).total_seconds()
+    for i in range(count):
+        author = rng.choice(ASSIGNEES)
+        worklogs.append(
+            {
+                "id": str(rng.randint(10**6, 10**7)),
+                "author": {"displayName": author, "avatarUrls": {"24x24": ""}},
+                "started": format_jira_datetime(
+                    start + timedelta(seconds=rng.uniform(0, span))
+                ),
+                "timeSpentSeconds": rng.choice([1800, 3600, 7200, 14400]),
+                "comment": f"Worklog {i + 1}",
+            }
+        )
+    return worklogs
+
+
+def generate_sprint_fixtures(
+    sizes,
+    project_key="CLD",
+    first_sprint_id=990001,
+    board_id=9901,
+    carry_over=0.0,
+    long_changelog_ratio=0.05,
+    seed=42,
+):
+    """Tạo dữ liệu tổng hợp cho các sprint có số issues cho trước
+
+    Các sprint nối tiếp nhau (mỗi sprint 14 ngày, sprint cuối kết thúc hôm qua)
+    để worklogs của mỗi sprint không chồng lên nhau. Cứ 10 issues có 2 subtask
+    (cho trang Steve Est), một phần issues có changelog dài hơn giới hạn 100
+    histories của search để phải lấy lại qua endpoint changelog.
+
+    Args:
+        sizes (list): Số issues của từng sprint (ví dụ: [100, 1000, 10000])
+        project_key (str): Mã dự án (trang Steve Est chỉ tìm trong dự án CLD)
+        first_sprint_id (int): ID của sprint đầu tiên
+        board_id (int): ID của board chứa các sprint
+        carry_over (float): Tỉ lệ issues của sprint trước được chuyển sang sprint sau
+        long_changelog_ratio (float): Tỉ lệ issues có changelog dài hơn 100 histories
+        seed (int): Seed để dữ liệu giống nhau giữa các lần chạy
+
+    Returns:
+        JiraFixtures: Fixtures
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    sprint_end = now - timedelta(days=1)
+    sprint_starts = []
+    for _ in sizes:
+        sprint_starts.insert(0, sprint_end - timedelta(days=14))
+        sprint_end -= timedelta(days=14)
+
+    board = {
+        "id": board_id,
+        "name": f"{project_key} benchmark board",
+        "type": "scrum",
+        "location": {"projectKey": project_key},
+    }
+    sprints, issues, sprint_issues = [], [], {}
+    previous_keys = []
+    next_number = 1
+
+    for index, size in enumerate(sizes):
+        sprint_id = first_sprint_id + index
+        start = sprint_starts[index]
+        end = start + timedelta(days=14)
+        sprints.append(
+            {
+                "id": sprint_id,
+                "name": f"Benchmark Sprint {index + 1} ({size} issues)",
+                "state": "closed" if index < len(sizes) - 1 else "active",
+                "startDate": format_jira_datetime(start),
+                "endDate": format_jira_datetime(end),
+                "originBoardId": board_id,
+            }
+        )
+
+        keys = previous_keys[: min(int(size * carry_over), len(previous_keys))]
+        parent = None
+        while len(keys) < size:
+            number = next_number
+            next_number += 1
+            key = f"{project_key}-{number}"
+            issue_id = str(100000 + number)
+            history_count = (
+                rng.randint(101, 150)
+                if rng.random() < long_changelog_ratio
+                else rng.randint(2, 8)
+            )
+            changelog, status = _make_changelog(
+                rng, issue_id, start, end, history_count
+            )
+            worklogs = _make_worklogs(rng, start, end, rng.randint(0, 6))
+            time_spent = sum(w["timeSpentSeconds"] for w in worklogs)
+            estimate = rng.choice([3600, 7200, 14400, 28800])
+
+            fields = {
+                "summary": f"Benchmark issue {number}",
+                "status": {"name": status},
+                "issuetype": {"name": "Task", "subtask": False},
+                "priority": {"name": rng.choice(["Low", "Medium", "High"])},
+                "assignee": {"displayName": rng.choice(ASSIGNEES)},
+                "created": format_jira_datetime(start - timedelta(days=1)),
+                "updated": format_jira_datetime(end - timedelta(hours=1)),
+                "duedate": end.strftime("%Y-%m-%d"),
+                "resolutiondate": format_jira_datetime(end) if status == "Done" else None,
+                "timeoriginalestimate": estimate,
+                "timeestimate": max(estimate - time_spent, 0),
+                "timespent": time_spent,
+                "customfield_10159": rng.choice([None, 1, 2, 4, 8]),
+                "customfield_10160": {"value": "YES"},
+                "customfield_10130": {"value": "NO"},
+                "customfield_10092": {"value": "Benchmark"},
+                "customfield_10132": {"value": "Sync"},
+                "customfield_10031": {"displayName": "Benchmark Tester"},
+                "subtasks": [],
+                "worklog": {
+                    "startAt": 0,
+                    "maxResults": len(worklogs),
+                    "total": len(worklogs),
+                    "worklogs": worklogs,
+                },
+            }
+
+            # Issue đầu mỗi nhóm 10 là issue cha của 2 issues tiếp theo
+            position = number % 10
+            if position == 0:
+                parent = fields
+                parent_key, parent_id = key, issue_id
+            elif position in (1, 2) and parent is not None:
+                fields["issuetype"] = {"name": "Sub-task", "subtask": True}
+                fields["parent"] = {"key": parent_key, "id": parent_id}
+                parent["subtasks"].append({"key": key, "id": issue_id})
+
+            issues.append(
+                {"id": issue_id, "key": key, "fields": fields, "changelog": changelog}
+            )
+            keys.append(key)
+
+        sprint_issues[sprint_id] = keys
+        previous_keys = keys
+
+    return JiraFixtures(project_key, [board], sprints, issues, sprint_issues)
@@ -0,0 +1,436 @@
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Số histories tối đa Jira trả về kèm search với expand=changelog
+SEARCH_CHANGELOG_LIMIT = 100
+
+_SPRINT_RE = re.compile(r"\bsprint\s*=\s*(\d+)", re.IGNORECASE)
+_PROJECT_RE = re.compile(r"\bproject\s*=\s*\"?([A-Za-z0-9_]+)\"?", re.IGNORECASE)
+_KEY_IN_RE = re.compile(r"\bkey\s+in\s*\(([^)]*)\)", re.IGNORECASE)
+_STATUS_RE = re.compile(r"\bstatus\s*=\s*\"([^\"]+)\"", re.IGNORECASE)
+_UPDATED_RE = re.compile(r"\bupdated\s*>=\s*\"-(\d+)m\"", re.IGNORECASE)
+_WORKLOG_DATE_RE = re.compile(
+    r"\bworklogDate\s*(>=|<=)\s*\"(\d{4}-\d{2}-\d{2})\"", re.IGNORECASE
+)
+_STEVE_RE = re.compile(r"\"steve estimate\[number\]\"\s+IS\s+NOT\s+EMPTY", re.IGNORECASE)
+
+
+class RateLimiter:
+    """Token bucket phía server: request vượt giới hạn nhận 429 kèm Retry-After"""
+
+    def __init__(self, rate, burst):
+        """Khởi tạo bucket
+
+        Args:
+            rate (float): Số request mỗi giây, 0 để tắt giới hạn
+            burst (int): Số request tối đa liên tiếp
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Lấy một token
+
+        Returns:
+            float: 0 nếu được phục vụ, ngược lại số giây client nên chờ
+        """
+        if not self.rate:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+class MockJiraServer:
+    """Server Jira giả lập phát lại fixtures cho REST API v3 và Agile 1.0
+
+    Module này không import src.config để có thể chạy server và đặt JIRA_URL
+    trước khi các Jira client đọc cấu hình.
+
+    Hỗ trợ các endpoint ứng dụng sử dụng (search, issue/{key}, issue/{key}/worklog,
+    issue/{key}/changelog, field, project, board, board/{id}/sprint, sprint/{id}) và
+    các mệnh đề JQL ứng dụng tạo ra. Có thể thêm độ trễ và giới hạn tốc độ để
+    mô phỏng Jira Cloud.
+
+    Usage:
+        with MockJiraServer(fixtures, latency_ms=80) as server:
+            os.environ["JIRA_URL"] = server.url
+    """
+
+    def __init__(
+        self,
+        fixtures,
+        host="127.0.0.1",
+        port=0,
+        latency_ms=0,
+        jitter_ms=0,
+        rate_limit=0,
+        rate_limit_burst=20,
+        max_results=100,
+        seed=None,
+    ):
+        """Khởi tạo server (chưa chạy)
+
+        Args:
+            fixtures (JiraFixtures): Dữ liệu được phát lại
+            host (str): Địa chỉ lắng nghe
+            port (int): Cổng, 0 để hệ điều hành chọn cổng trống
+            latency_ms (float): Độ trễ cố định của mỗi request (ms)
+            jitter_ms (float): Độ trễ ngẫu nhiên thêm tối đa (ms)
+            rate_limit (float): Số request mỗi giây được phục vụ, 0 để không giới hạn
+            rate_limit_burst (int): Số request liên tiếp tối đa trước khi trả 429
+            max_results (int): maxResults tối đa của một trang search (Jira Cloud: 100)
+            seed (int, optional): Seed cho độ trễ ngẫu nhiên
+        """
+        self.fixtures = fixtures
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.max_results = max_results
+        self.limiter = RateLimiter(rate_limit, rate_limit_burst)
+        self.random = random.Random(seed)
+        self.stats_lock = threading.Lock()
+        self.request_counts = {}
+        self.rate_limited = 0
+        self.search_cache = {}
+
+        handler = type("Handler", (_MockJiraHandler,), {"server_state": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        """URL gốc để dùng làm JIRA_URL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Chạy server trong thread nền"""
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, name="mock-jira", daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Dừng server"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def reset_stats(self):
+        """Xóa số liệu request của server"""
+        with self.stats_lock:
+            self.request_counts = {}
+            self.rate_limited = 0
+
+    def stats(self):
+        """Số request server đã nhận theo endpoint và số lần trả 429
+
+        Returns:
+            dict: {"requests", "rate_limited", "endpoints"}
+        """
+        with self.stats_lock:
+            return {
+                "requests": sum(self.request_counts.values()),
+                "rate_limited": self.rate_limited,
+                "endpoints": dict(self.request_counts),
+            }
+
+    def _count(self, endpoint, limited=False):
+        with self.stats_lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+            if limited:
+                self.rate_limited += 1
+
+    def _delay(self):
+        delay = self.latency
+        if self.jitter:
+            with self.stats_lock:
+                delay += self.random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+    def handle(self, path, query):
+        """Xử lý một GET request
+
+        Args:
+            path (str): Đường dẫn request
+            query (dict): Tham số (mỗi tham số một giá trị)
+
+        Returns:
+            tuple: (status code, body dạng dict/list, headers)
+        """
+        route, endpoint = self._route(path)
+        wait = self.limiter.acquire()
+        self._count(endpoint, limited=wait > 0)
+        if wait > 0:
+            headers = {
+                "Retry-After": str(max(1, round(wait))),
+                "X-RateLimit-Remaining": "0",
+            }
+            return 429, {"errorMessages": ["Rate limit exceeded"]}, headers
+
+        self._delay()
+        if route is None:
+            return 404, {"errorMessages": [f"Không hỗ trợ {path}"]}, {}
+        handler, args = route
+        result = handler(query, *args)
+        if result is None:
+            return 404, {"errorMessages": ["Không tìm thấy"]}, {}
+        return 200, result, {}
+
+    def _route(self, path):
+        """Tìm hàm xử lý theo đường dẫn
+
+        Returns:
+            tuple: ((hàm xử lý, tham số) hoặc None, tên endpoint để thống kê)
+        """
+        routes = [
+            (r"/rest/api/3/search", self._search, "search"),
+            (r"/rest/api/3/issue/([^/]+)/worklog", self._worklog, "issue/{key}/worklog"),
+            (
+                r"/rest/api/3/issue/([^/]+)/changelog",
+                self._changelog,
+                "issue/{key}/changelog",
+            ),
+            (r"/rest/api/3/issue/([^/]+)", self._issue, "issue/{key}"),
+            (r"/rest/api/3/field", self._fields, "field"),
+            (r"/rest/api/3/project", self._projects, "project"),
+            (
+                r"/rest/api/3/project/([^/]+)/statuses",
+                self._project_statuses,
+                "project/{key}/statuses",
+            ),
+            (r"/rest/agile/1.0/board", self._boards, "board"),
+            (r"/rest/agile/1.0/board/(\d+)", self._board, "board/{id}"),
+            (r"/rest/agile/1.0/board/(\d+)/sprint", self._board_sprints, "board/{id}/sprint"),
+            (r"/rest/agile/1.0/sprint/(\d+)", self._sprint, "sprint/{id}"),
+        ]
+        path = path.rstrip("/")
+        for pattern, handler, endpoint in routes:
+            match = re.fullmatch(pattern, path)
+            if match:
+                return (handler, match.groups()), endpoint
+        return None, path
+
+    # ---- Agile 1.0 ----
+
+    def _boards(self, query):
+        boards = self.fixtures.boards
+        project = query.get("projectKeyOrId")
+        if project:
+            boards = [b for b in boards if b["location"].get("projectKey") == project]
+        return {"maxResults": len(boards), "startAt": 0, "isLast": True, "values": boards}
+
+    def _board(self, query, board_id):
+        return self.fixtures.boards_by_id.get(int(board_id))
+
+    def _board_sprints(self, query, board_id):
+        sprints = [
+            s for s in self.fixtures.sprints if s.get("originBoardId") == int(board_id)
+        ]
+        states = query.get("state")
+        if states:
+            sprints = [s for s in sprints if s.get("state") in states.split(",")]
+        return self._page(sprints, query, "values", default_size=50)
+
+    def _sprint(self, query, sprint_id):
+        return self.fixtures.sprints_by_id.get(int(sprint_id))
+
+    # ---- REST v3 ----
+
+    def _fields(self, query):
+        return self.fixtures.fields
+
+    def _projects(self, query):
+        key = self.fixtures.project_key
+        return [{"id": "10000", "key": key, "name": key}]
+
+    def _project_statuses(self, query, project_key):
+        statuses = sorted(
+            {issue["fields"]["status"]["name"] for issue in self.fixtures.issues}
+        )
+        return [
+            {"name": "Task", "statuses": [{"name": name} for name in statuses]}
+        ]
+
+    def _issue(self, query, key):
+        issue = self.fixtures.issues_by_key.get(key)
+        if issue is None:
+            return None
+        return self._render(issue, query.get("fields"), query.get("expand"))
+
+    def _worklog(self, query, key):
+        issue = self.fixtures.issues_by_key.get(key)
+        if issue is None:
+            return None
+        worklogs = issue["fields"].get("worklog", {}).get("worklogs", [])
+        return {
+            "startAt": 0,
+            "maxResults": len(worklogs),
+            "total": len(worklogs),
+            "worklogs": worklogs,
+        }
+
+    def _changelog(self, query, key):
+        issue = self.fixtures.issues_by_key.get(key)
+        if issue is None:
+            return None
+        histories = (issue.get("changelog") or {}).get("histories", [])
+        return self._page(histories, query, "values", default_size=100)
+
+    def _search(self, query):
+        jql = query.get("jql", "")
+        # Các trang của cùng một JQL dùng lại kết quả lọc (trừ JQL theo thời gian tương đối)
+        with self.stats_lock:
+            matches = self.search_cache.get(jql)
+        if matches is None:
+            matches = [
+                issue for issue in self.fixtures.issues if self._matches(issue, jql)
+            ]
+            if not _UPDATED_RE.search(jql):
+                with self.stats_lock:
+                    self.search_cache[jql] = matches
+        page = self._page(matches, query, "issues", default_size=50)
+        page["issues"] = [
+            self._render(issue, query.get("fields"), query.get("expand"), search=True)
+            for issue in page["issues"]
+        ]
+        return page
+
+    def _page(self, items, query, name, default_size):
+        """Phân trang theo startAt/maxResults như Jira"""
+        start_at = int(query.get("startAt", 0))
+        size = int(query.get("maxResults", default_size))
+        size = max(0, min(size, self.max_results))
+        values = items[start_at : start_at + size]
+        return {
+            "startAt": start_at,
+            "maxResults": size,
+            "total": len(items),
+            "isLast": start_at + len(values) >= len(items),
+            name: values,
+        }
+
+    def _render(self, issue, fields=None, expand=None, search=False):
+        """Tạo bản sao issue chỉ gồm các trường được yêu cầu"""
+        all_fields = issue["fields"]
+        requested = [f for f in (fields or "").split(",") if f]
+        if not requested or "*all" in requested or "*navigable" in requested:
+            selected = dict(all_fields)
+        else:
+            selected = {f: all_fields[f] for f in requested if f in all_fields}
+
+        rendered = {"id": issue["id"], "key": issue["key"], "fields": selected}
+        if expand and "changelog" in expand.split(","):
+            histories = (issue.get("changelog") or {}).get("histories", [])
+            shown = histories[:SEARCH_CHANGELOG_LIMIT] if search else histories
+            rendered["changelog"] = {
+                "startAt": 0,
+                "maxResults": len(shown),
+                "total": len(histories),
+                "histories": shown,
+            }
+        return rendered
+
+    def _matches(self, issue, jql):
+        """Kiểm tra issue có thỏa các mệnh đề JQL ứng dụng sử dụng hay không
+
+        Các mệnh đề không nhận ra được bỏ qua.
+        """
+        fields = issue["fields"]
+        key = issue["key"]
+
+        match = _SPRINT_RE.search(jql)
+        if match and int(match.group(1)) not in self.fixtures.issue_sprints.get(
+            key, ()
+        ):
+            return False
+
+        match = _PROJECT_RE.search(jql)
+        if match and key.split("-")[0] != match.group(1):
+            return False
+
+        match = _KEY_IN_RE.search(jql)
+        if match:
+            keys = {k.strip().strip('"') for k in match.group(1).split(",")}
+            if key not in keys:
+                return False
+
+        statuses = _STATUS_RE.findall(jql)
+        if statuses and fields.get("status", {}).get("name") not in statuses:
+            return False
+
+        match = _UPDATED_RE.search(jql)
+        if match:
+            since = datetime.now(timezone.utc) - timedelta(minutes=int(match.group(1)))
+            try:
+                updated = datetime.strptime(fields.get("updated"), "%Y-%m-%dT%H:%M:%S.%f%z")
+            except (TypeError, ValueError):
+                updated = None
+            if updated is None or updated < since:
+                return False
+
+        if _STEVE_RE.search(jql) and fields.get("customfield_10159") is None:
+            return False
+
+        bounds = _WORKLOG_DATE_RE.findall(jql)
+        if bounds:
+            dates = [
+                w.get("started", "")[:10]
+                for w in fields.get("worklog", {}).get("worklogs", [])
+            ]
+            for op, value in bounds:
+                if op == ">=":
+                    dates = [d for d in dates if d >= value]
+                else:
+                    dates = [d for d in dates if d <= value]
+            if not dates:
+                return False
+
+        return True
+
+
+class _MockJiraHandler(BaseHTTPRequestHandler):
+    """HTTP handler chuyển request cho MockJiraServer"""
+
+    server_state = None
+    protocol_version = "HTTP/1.1"  # Giữ kết nối (keep-alive) như Jira Cloud
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        status, body, headers = self.server_state.handle(parsed.path, query)
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        """Không ghi log mỗi request"""
@@ -0,0 +1,182 @@
+import contextlib
+import glob
+import importlib.util
+import io
+import os
+import time
+import tracemalloc
+from src.services.jira_client import JiraClient
+from src.services.jira.metrics import get_metrics_registry
+from src.services.mongodb_client import MongoDBClient
+from src.services.progress import ProgressReporter
+from src.services.data_sync.checkpoint import SyncCheckpoint
+from src.services.data_sync.issue_sync import sync_sprint_issues
+from src.services.worklog_service import WorklogReport
+
+# Thư mục gốc của repo (chứa thư mục pages)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCENARIOS = ("sync", "worklog", "steve")
+
+
+def _load_steve_est_page():
+    """Nạp trang Steve Est như một module (không chạy main của trang)"""
+    path = glob.glob(os.path.join(ROOT_DIR, "pages", "04_*Steve_Est.py"))[0]
+    spec = importlib.util.spec_from_file_location("benchmark_steve_est_page", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _reset_sprint_data(mongo_client, fixtures, sprint_id):
+    """Xóa dữ liệu đã lưu của sprint để lần đồng bộ bắt đầu từ đầu"""
+    if mongo_client.db is None:
+        return
+    mongo_client.db["data"].delete_one({"_id": f"sprint_{sprint_id}"})
+    mongo_client.issue_collection.delete(sprint_id)
+    mongo_client.aggregate_store.delete(sprint_id)
+    mongo_client.db["issue_store"].delete_many(
+        {"_id": {"$in": fixtures.sprint_issues[sprint_id]}}
+    )
+    SyncCheckpoint(mongo_client.db, sprint_id).clear()
+
+
+class BenchmarkContext:
+    """Các client dùng chung giữa các kịch bản benchmark"""
+
+    def __init__(self, fixtures):
+        self.fixtures = fixtures
+        self.reporter = ProgressReporter()
+        self.jira = JiraClient(reporter=self.reporter)
+        self.mongo = MongoDBClient(reporter=self.reporter)
+        self._steve_page = None
+
+    @property
+    def steve_page(self):
+        if self._steve_page is None:
+            self._steve_page = _load_steve_est_page()
+        return self._steve_page
+
+    def run_sync(self, sprint):
+        """Đồng bộ toàn bộ issues của sprint (sync_sprint_issues)"""
+        _reset_sprint_data(self.mongo, self.fixtures, sprint["id"])
+        issue_count = sync_sprint_issues(
+            self.jira,
+            self.mongo,
+            sprint["id"],
+            with_progress=False,
+            reporter=self.reporter,
+        )
+        if issue_count is None:
+            raise RuntimeError(f"Không đồng bộ được sprint {sprint['id']}")
+        return issue_count
+
+    def run_worklog(self, sprint):
+        """Báo cáo worklog trong khoảng thời gian của sprint (WorklogReport)"""
+        report = WorklogReport(project_key=self.fixtures.project_key)
+        data = report.get_project_worklogs(
+            sprint["startDate"][:10], sprint["endDate"][:10]
+        )
+        return len(data["by_issue"]) if data else 0
+
+    def run_steve(self, sprint):
+        """Luồng của trang Steve Est: tìm issues có Steve Estimate rồi lấy subtasks"""
+        page = self.steve_page
+        service = page.SteveEstimateService()
+        issues = service.search_issues_with_steve_estimate(sprint["id"])
+        page.process_issues_data(issues, service, status_filter="all")
+        return len(issues)
+
+
+def measure(name, sprint, size, func, server, quiet=True):
+    """Chạy một kịch bản và đo thời gian, số request, bộ nhớ đỉnh
+
+    Args:
+        name (str): Tên kịch bản
+        sprint (dict): Sprint của fixtures
+        size (int): Số issues của sprint
+        func (callable): Hàm (sprint) -> số issues đã xử lý
+        server (MockJiraServer): Server để lấy số request phía server
+        quiet (bool): Bỏ output in ra trong lúc chạy
+
+    Returns:
+        dict: Kết quả đo
+    """
+    server.reset_stats()
+    tracemalloc.start()
+    output = io.StringIO() if quiet else None
+    try:
+        with get_metrics_registry().scope() as scope:
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+                items = func(sprint)
+            seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    summary = scope.summary()
+    server_stats = server.stats()
+    return {
+        "scenario": name,
+        "sprint_id": sprint["id"],
+        "size": size,
+        "issues": items,
+        "seconds": round(seconds, 3),
+        "issues_per_second": round(items / seconds, 1) if seconds else 0.0,
+        "requests": summary["requests"],
+        "retries": summary["retries"],
+        "errors": summary["errors"],
+        "bytes_received": summary["bytes_received"],
+        "server_requests": server_stats["requests"],
+        "rate_limited": server_stats["rate_limited"],
+        "server_endpoints": server_stats["endpoints"],
+        "peak_memory_mb": round(peak / (1024 * 1024), 1),
+    }
+
+
+def run_benchmarks(fixtures, server, scenarios=SCENARIOS, quiet=True):
+    """Chạy các kịch bản trên từng sprint của fixtures
+
+    Args:
+        fixtures (JiraFixtures): Dữ liệu mock server đang phát lại
+        server (MockJiraServer): Mock server đang chạy (JIRA_URL đã trỏ tới server)
+        scenarios (iterable): Các kịch bản cần chạy (sync, worklog, steve)
+        quiet (bool): Bỏ output in ra trong lúc chạy
+
+    Returns:
+        list: Kết quả đo của từng kịch bản và sprint
+    """
+    context = BenchmarkContext(fixtures)
+    runners = {
+        "sync": context.run_sync,
+        "worklog": context.run_worklog,
+        "steve": context.run_steve,
+    }
+    results = []
+    for sprint in fixtures.sprints:
+        size = len(fixtures.sprint_issues.get(sprint["id"], []))
+        for name in scenarios:
+            results.append(measure(name, sprint, size, runners[name], server, quiet))
+    return results
+
+
+def format_results(results):
+    """Định dạng kết quả thành bảng văn bản"""
+    headers = [
+        ("scenario", "Kịch bản"),
+        ("size", "Issues sprint"),
+        ("issues", "Đã xử lý"),
+        ("seconds", "Giây"),
+        ("issues_per_second", "Issues/giây"),
+        ("requests", "Requests"),
+        ("retries", "Retries"),
+        ("rate_limited", "429"),
+        ("peak_memory_mb", "Bộ nhớ đỉnh (MB)"),
+    ]
+    rows = [[title for _, title in headers]]
+    rows += [[str(result[key]) for key, _ in headers] for result in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(headers))]
+    lines = ["  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
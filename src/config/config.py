@@ -14,6 +14,65 @@ API_TOKEN = os.getenv("JIRA_API_TOKEN")
 EMAIL = os.getenv("JIRA_USER")
 JIRA_URL = os.getenv("JIRA_URL")
 
+# Connection pool dùng chung cho tất cả Jira client
+JIRA_POOL_CONNECTIONS = int(os.getenv("JIRA_POOL_CONNECTIONS", 4))  # Số host được giữ pool
+JIRA_POOL_MAXSIZE = int(os.getenv("JIRA_POOL_MAXSIZE", 20))  # Số kết nối tối đa mỗi host
+JIRA_KEEP_ALIVE = os.getenv("JIRA_KEEP_ALIVE", "TRUE") == "TRUE"
+JIRA_CONNECT_TIMEOUT = float(os.getenv("JIRA_CONNECT_TIMEOUT", 10))  # Giây
+JIRA_READ_TIMEOUT = float(os.getenv("JIRA_READ_TIMEOUT", 60))  # Giây
+
+# Retry và giới hạn tốc độ gọi Jira API
+JIRA_MAX_RETRIES = int(os.getenv("JIRA_MAX_RETRIES", 5))
+JIRA_RETRY_BASE_DELAY = float(os.getenv("JIRA_RETRY_BASE_DELAY", 1))  # Giây
+JIRA_RETRY_MAX_DELAY = float(os.getenv("JIRA_RETRY_MAX_DELAY", 60))  # Giây
+JIRA_RATE_LIMIT_PER_SECOND = float(os.getenv("JIRA_RATE_LIMIT_PER_SECOND", 10))
+JIRA_RATE_LIMIT_BURST = int(os.getenv("JIRA_RATE_LIMIT_BURST", 20))
+
+# Số request đồng thời tối đa của async Jira client
+JIRA_ASYNC_MAX_CONCURRENCY = int(os.getenv("JIRA_ASYNC_MAX_CONCURRENCY", 20))
+
+# Số request đồng thời tối đa tới một host Jira trong toàn process (mọi client, mọi thread)
+JIRA_MAX_IN_FLIGHT = int(os.getenv("JIRA_MAX_IN_FLIGHT", 20))
+
+# Số trang search được lấy song song khi phân trang
+JIRA_PAGE_FANOUT = int(os.getenv("JIRA_PAGE_FANOUT", 4))
+
+# Kích thước trang search tự điều chỉnh theo tập trường (xem services/jira/pagination.py)
+JIRA_SEARCH_MAX_PAGE_SIZE = int(os.getenv("JIRA_SEARCH_MAX_PAGE_SIZE", 1000))
+JIRA_SEARCH_MIN_PAGE_SIZE = int(os.getenv("JIRA_SEARCH_MIN_PAGE_SIZE", 10))
+# Trang đầu tiên khi tập trường có trường nặng (worklog, comment, changelog)
+JIRA_SEARCH_HEAVY_PAGE_SIZE = int(os.getenv("JIRA_SEARCH_HEAVY_PAGE_SIZE", 50))
+JIRA_SEARCH_TARGET_PAGE_BYTES = int(
+    os.getenv("JIRA_SEARCH_TARGET_PAGE_BYTES", 2 * 1024 * 1024)
+)  # 2 MB
+JIRA_SEARCH_TARGET_PAGE_SECONDS = float(
+    os.getenv("JIRA_SEARCH_TARGET_PAGE_SECONDS", 5)
+)  # Giây, nhỏ hơn nhiều so với JIRA_READ_TIMEOUT
+
+# Đồng bộ tăng dần: lấy lùi thêm số phút này trước mốc đồng bộ lần trước
+# để không bỏ sót issue cập nhật ngay lúc đồng bộ hoặc do lệch đồng hồ
+SYNC_WATERMARK_OVERLAP_MINUTES = int(os.getenv("SYNC_WATERMARK_OVERLAP_MINUTES", 5))
+
+# Số issues đã xử lý được lưu tạm (checkpoint) mỗi lần khi đồng bộ toàn bộ sprint
+SYNC_CHECKPOINT_BATCH_SIZE = int(os.getenv("SYNC_CHECKPOINT_BATCH_SIZE", 100))
+# Checkpoint cũ hơn số giờ này bị bỏ và đồng bộ lại từ đầu
+SYNC_CHECKPOINT_MAX_AGE_HOURS = int(os.getenv("SYNC_CHECKPOINT_MAX_AGE_HOURS", 24))
+# Lease đồng bộ một sprint hết hạn sau số phút này nếu không được gia hạn
+SYNC_LEASE_MINUTES = int(os.getenv("SYNC_LEASE_MINUTES", 30))
+
+# Số phần tử tối đa trong hàng đợi giữa hai bước của pipeline đồng bộ (fetch -> enrich -> transform -> write)
+SYNC_PIPELINE_QUEUE_SIZE = int(os.getenv("SYNC_PIPELINE_QUEUE_SIZE", 200))
+
+# Tiến trình lập lịch đồng bộ chạy nền (python run.py scheduler)
+SCHEDULER_ACTIVE_INTERVAL_MINUTES = int(os.getenv("SCHEDULER_ACTIVE_INTERVAL_MINUTES", 10))
+SCHEDULER_FUTURE_INTERVAL_MINUTES = int(os.getenv("SCHEDULER_FUTURE_INTERVAL_MINUTES", 60))
+SCHEDULER_MAX_WORKERS = int(os.getenv("SCHEDULER_MAX_WORKERS", 2))
+SCHEDULER_TICK_SECONDS = int(os.getenv("SCHEDULER_TICK_SECONDS", 30))
+SCHEDULER_SPRINT_REFRESH_MINUTES = int(os.getenv("SCHEDULER_SPRINT_REFRESH_MINUTES", 60))
+# Job đang chạy không được gia hạn (heartbeat) trong thời gian này (ví dụ do tiến trình
+# bị tắt đột ngột) sẽ được đưa lại vào hàng đợi. Job đang chạy được gia hạn mỗi chu kỳ tick
+SCHEDULER_STALE_JOB_MINUTES = int(os.getenv("SCHEDULER_STALE_JOB_MINUTES", 10))
+
 # Default timezone
 DEFAULT_TIMEZONE = "Asia/Bangkok"
 
@@ -57,6 +116,13 @@ CHANGELOG_DIR = os.path.join(DATA_DIR, "changelogs")
 # Cache timeout (seconds)
 CACHE_TTL = 3600  # 1 hour
 
+# Cache HTTP trên đĩa cho các endpoint metadata ít thay đổi của Jira
+JIRA_HTTP_CACHE_ENABLED = os.getenv("JIRA_HTTP_CACHE_ENABLED", "TRUE") == "TRUE"
+JIRA_HTTP_CACHE_DIR = os.path.join(DATA_DIR, "http_cache")
+JIRA_HTTP_CACHE_MAX_BYTES = int(
+    os.getenv("JIRA_HTTP_CACHE_MAX_BYTES", 50 * 1024 * 1024)
+)  # 50 MB
+
 # MongoDB settings
 MONGO_HOST = os.environ.get("MONGO_HOST", "localhost")
 MONGO_PORT = int(os.environ.get("MONGO_PORT", 27017))
@@ -64,6 +130,19 @@ MONGO_DB = os.environ.get("MONGO_DB", "jira_data")
 MONGO_USER = os.environ.get("MONGO_USER", "")
 MONGO_PASSWORD = os.environ.get("MONGO_PASSWORD", "")
 
+# Kết nối MongoDB dùng chung trong process (xem services/mongo_connection.py)
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 30000))
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+# Số giây giữ kết quả kiểm tra kết nối (ping) thay vì ping trước mỗi lần đọc/ghi
+MONGO_HEALTH_TTL_SECONDS = float(os.getenv("MONGO_HEALTH_TTL_SECONDS", 30))
+
+# Ghi issues vào MongoDB theo lô bulk_write: lô được gửi khi đủ số thao tác hoặc đủ kích thước
+MONGO_BULK_MAX_OPERATIONS = int(os.getenv("MONGO_BULK_MAX_OPERATIONS", 500))
+MONGO_BULK_TARGET_BYTES = int(os.getenv("MONGO_BULK_TARGET_BYTES", 2 * 1024 * 1024))
+# Số lần thử lại một lô khi gặp lỗi tạm thời (mất kết nối, timeout, failover)
+MONGO_BULK_MAX_RETRIES = int(os.getenv("MONGO_BULK_MAX_RETRIES", 3))
+MONGO_BULK_RETRY_BASE_DELAY = float(os.getenv("MONGO_BULK_RETRY_BASE_DELAY", 0.5))  # Giây
+
 # Jira API settings
 JIRA_SERVER = os.environ.get("JIRA_SERVER", "https://jira.example.com")
 JIRA_USERNAME = os.environ.get("JIRA_USERNAME", "")
@@ -97,8 +176,8 @@ REDIS_PASSWORD = os.environ.get("REDIS_PASSWORD", "")
 # Số lượng issues tối đa để hiển thị trong biểu đồ
 MAX_ISSUES_IN_CHART = 50
 
-# Thiết lập số lượng worker threads
-NUM_WORKERS = 5
+# Thiết lập số lượng worker threads (số sprint được đồng bộ song song)
+NUM_WORKERS = int(os.getenv("NUM_WORKERS", 5))
 
 # Danh sách các trạng thái cuối cùng (done)
 FINAL_STATUS_LIST = [
@@ -0,0 +1,113 @@
+import argparse
+import json
+import os
+from src.benchmark import JiraFixtures, MockJiraServer, generate_sprint_fixtures
+
+
+def parse_args():
+    """Đọc tham số dòng lệnh"""
+    parser = argparse.ArgumentParser(
+        description="Đo hiệu năng đồng bộ với Jira giả lập (không gọi Jira thật)"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="100,1000,10000",
+        help="Số issues của từng sprint tổng hợp, phân tách bằng dấu phẩy",
+    )
+    parser.add_argument(
+        "--scenarios",
+        default="sync,worklog,steve",
+        help="Các kịch bản cần chạy: sync, worklog, steve",
+    )
+    parser.add_argument(
+        "--fixtures", help="File fixtures JSON thay cho dữ liệu tổng hợp"
+    )
+    parser.add_argument(
+        "--save-fixtures", help="Ghi fixtures đang dùng ra file JSON"
+    )
+    parser.add_argument(
+        "--carry-over",
+        type=float,
+        default=0.0,
+        help="Tỉ lệ issues chuyển từ sprint trước sang sprint sau",
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=0, help="Độ trễ mỗi request (ms)"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0, help="Độ trễ ngẫu nhiên thêm tối đa (ms)"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0,
+        help="Số request mỗi giây server phục vụ trước khi trả 429 (0: không giới hạn)",
+    )
+    parser.add_argument(
+        "--rate-limit-burst", type=int, default=20, help="Số request liên tiếp tối đa"
+    )
+    parser.add_argument(
+        "--max-results", type=int, default=100, help="maxResults tối đa mỗi trang search"
+    )
+    parser.add_argument(
+        "--mongodb-uri",
+        help="MongoDB dùng để lưu kết quả đồng bộ (chỉ dùng database thử nghiệm). "
+        "Không truyền thì đồng bộ không lưu vào MongoDB",
+    )
+    parser.add_argument("--json", help="Ghi kết quả ra file JSON")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Hiện output của ứng dụng khi chạy"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Hàm chính của script"""
+    args = parse_args()
+
+    if args.fixtures:
+        fixtures = JiraFixtures.load(args.fixtures)
+    else:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+        fixtures = generate_sprint_fixtures(sizes, carry_over=args.carry_over)
+    if args.save_fixtures:
+        fixtures.save(args.save_fixtures)
+
+    server = MockJiraServer(
+        fixtures,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        rate_limit_burst=args.rate_limit_burst,
+        max_results=args.max_results,
+    ).start()
+
+    # Cấu hình được đọc khi import nên phải đặt trước khi nạp suite.
+    # Biến môi trường đã đặt không bị .env ghi đè, nên không có kết nối tới Jira/MongoDB thật
+    os.environ.update(
+        {
+            "JIRA_URL": server.url,
+            "JIRA_USER": "benchmark",
+            "JIRA_API_TOKEN": "benchmark",
+            "JIRA_HTTP_CACHE_ENABLED": "FALSE",
+            "MONGODB_URI": args.mongodb_uri or "",
+            "DB_HOST": "",
+            "DB_PASSWORD": "",
+        }
+    )
+    from src.benchmark.suite import format_results, run_benchmarks
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    try:
+        results = run_benchmarks(fixtures, server, scenarios, quiet=not args.verbose)
+    finally:
+        server.stop()
+
+    print(format_results(results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import logging
+import sys
+from src.services.mongodb_client import MongoDBClient
+from src.services.progress import ProgressReporter, LogProgressReporter
+from src.services.issue_collection import migrate_embedded_issues
+
+
+def parse_args():
+    """Đọc tham số dòng lệnh"""
+    parser = argparse.ArgumentParser(
+        description="Chuyển issues nằm trong document sprint (collection data) sang collection issues"
+    )
+    parser.add_argument(
+        "sprint_ids", nargs="*", type=int, help="ID các sprint cần chuyển, mặc định tất cả"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Không ghi log tiến trình"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Hàm chính của script"""
+    args = parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    reporter = ProgressReporter() if args.quiet else LogProgressReporter()
+
+    mongo_client = MongoDBClient(reporter=reporter)
+    if mongo_client.db is None:
+        sys.exit(1)
+
+    migrated = migrate_embedded_issues(mongo_client.db, args.sprint_ids, reporter)
+    reporter.info(
+        f"Đã chuyển {len(migrated)} sprint, {sum(migrated.values())} issues sang collection issues"
+    )
+
+
+if __name__ == "__main__":
+    main()
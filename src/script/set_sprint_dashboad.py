@@ -125,6 +125,9 @@ def main():
     sprint_issues = jira_client.get_sprint_issues(
         sprint_id=target_sprint["id"], status_names=TARGET_STATUSES
     )
+    if sprint_issues is None:
+        print("Không lấy được đầy đủ issues của sprint, dừng cập nhật")
+        return
 
     # In thống kê
     status_counts = Counter(
@@ -0,0 +1,49 @@
+import argparse
+import logging
+import signal
+import sys
+from src.config.config import DEFAULT_PROJECT, SCHEDULER_MAX_WORKERS
+from src.services.data_sync.scheduler import SyncScheduler
+
+
+def parse_args():
+    """Đọc tham số dòng lệnh"""
+    parser = argparse.ArgumentParser(
+        description="Chạy nền và đồng bộ các sprint theo lịch (active/future/closed)"
+    )
+    parser.add_argument(
+        "--project",
+        action="append",
+        help=f"Mã dự án cần đồng bộ, có thể lặp lại (mặc định {DEFAULT_PROJECT})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SCHEDULER_MAX_WORKERS,
+        help="Số sprint được đồng bộ cùng lúc",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Hàm chính của script"""
+    args = parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    scheduler = SyncScheduler(project_keys=args.project, max_workers=args.workers)
+
+    # Dừng êm khi nhận SIGTERM (systemd, docker stop) hoặc Ctrl+C
+    def handle_signal(signum, frame):
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    if not scheduler.run_forever():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
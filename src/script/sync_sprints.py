@@ -0,0 +1,74 @@
+import argparse
+import logging
+import sys
+from src.config.config import DEFAULT_PROJECT, NUM_WORKERS
+from src.services.progress import ProgressReporter, LogProgressReporter
+from src.services.data_sync.headless_runner import run_headless_sync
+
+
+def parse_args():
+    """Đọc tham số dòng lệnh"""
+    parser = argparse.ArgumentParser(
+        description="Đồng bộ issues của sprint từ Jira về MongoDB (không cần Streamlit)"
+    )
+    parser.add_argument(
+        "sprint_ids", nargs="*", type=int, help="ID các sprint cần đồng bộ"
+    )
+    parser.add_argument(
+        "--project", default=DEFAULT_PROJECT, help="Mã dự án khi không truyền sprint ID"
+    )
+    parser.add_argument(
+        "--state",
+        default="active",
+        choices=["active", "future", "closed", "all"],
+        help="Trạng thái sprint cần đồng bộ khi không truyền sprint ID",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Đồng bộ lại toàn bộ issues thay vì chỉ các issues thay đổi",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=NUM_WORKERS,
+        help="Số sprint được đồng bộ cùng lúc",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Không ghi log tiến trình"
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Hàm chính của script"""
+    args = parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    reporter = ProgressReporter() if args.quiet else LogProgressReporter()
+
+    results = run_headless_sync(
+        sprint_ids=args.sprint_ids,
+        project_key=args.project,
+        state=None if args.state == "all" else args.state,
+        reporter=reporter,
+        incremental=not args.full,
+        max_workers=args.workers,
+    )
+
+    failed = [sprint_id for sprint_id, count in results.items() if count is None]
+    synced = sum(count for count in results.values() if count is not None)
+    reporter.info(
+        f"Đã đồng bộ {len(results) - len(failed)}/{len(results)} sprints "
+        f"({synced} issues), {len(failed)} sprints thất bại"
+    )
+
+    # Mã thoát khác 0 để cron/systemd nhận biết lần đồng bộ thất bại
+    if not results or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import random
+import time
+import bson
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, PyMongoError, WTimeoutError
+from src.config.config import (
+    MONGO_BULK_MAX_OPERATIONS,
+    MONGO_BULK_MAX_RETRIES,
+    MONGO_BULK_RETRY_BASE_DELAY,
+    MONGO_BULK_TARGET_BYTES,
+)
+from src.services.jira.metrics import get_metrics_registry
+
+
+def is_transient_error(error):
+    """Lỗi tạm thời của MongoDB, có thể gửi lại cả lô (mất kết nối, timeout, failover)"""
+    if isinstance(error, (ConnectionFailure, ExecutionTimeout, WTimeoutError)):
+        return True
+    return isinstance(error, PyMongoError) and error.has_error_label("RetryableWriteError")
+
+
+class BulkWriter:
+    """Gom các thao tác ghi thành lô bulk_write theo số thao tác và kích thước
+
+    Lô được gửi khi đủ max_operations thao tác hoặc kích thước ước tính (BSON) đạt
+    target_bytes, nên document lớn (issues có nhiều trường) được ghi theo lô nhỏ
+    hơn. Mỗi lô được thử lại riêng khi gặp lỗi tạm thời, vì vậy các thao tác phải
+    idempotent (ReplaceOne/UpdateOne với upsert, DeleteMany). Thời gian, kích
+    thước và số lần thử lại của từng lô được ghi vào MetricsRegistry.
+    """
+
+    def __init__(
+        self,
+        collection,
+        ordered=True,
+        max_operations=MONGO_BULK_MAX_OPERATIONS,
+        target_bytes=MONGO_BULK_TARGET_BYTES,
+        max_retries=MONGO_BULK_MAX_RETRIES,
+        retry_base_delay=MONGO_BULK_RETRY_BASE_DELAY,
+    ):
+        """Khởi tạo bộ ghi
+
+        Args:
+            collection (pymongo.collection.Collection): Collection cần ghi
+            ordered (bool): Thực hiện các thao tác trong lô theo thứ tự
+            max_operations (int): Số thao tác tối đa mỗi lô
+            target_bytes (int): Kích thước ước tính tối đa mỗi lô
+            max_retries (int): Số lần thử lại một lô khi gặp lỗi tạm thời
+            retry_base_delay (float): Thời gian chờ cơ sở cho backoff (giây)
+        """
+        self.collection = collection
+        self.ordered = ordered
+        self.max_operations = max(1, max_operations)
+        self.target_bytes = max(1, target_bytes)
+        self.max_retries = max(0, max_retries)
+        self.retry_base_delay = retry_base_delay
+        self.operations = []
+        self.pending_bytes = 0
+        # Số liệu của từng lô đã gửi: {"operations", "bytes", "seconds", "retries"}
+        self.batches = []
+
+    def add(self, operation, document):
+        """Thêm một thao tác, gửi lô nếu đã đủ số thao tác hoặc kích thước
+
+        Args:
+            operation: Thao tác pymongo (ReplaceOne, UpdateOne, DeleteMany, ...)
+            document (dict): Nội dung chính của thao tác, dùng để ước tính kích thước
+        """
+        self.operations.append(operation)
+        self.pending_bytes += len(bson.encode(document))
+        if (
+            len(self.operations) >= self.max_operations
+            or self.pending_bytes >= self.target_bytes
+        ):
+            self.flush()
+
+    def flush(self):
+        """Gửi lô đang chờ
+
+        Raises:
+            PyMongoError: Lỗi không tạm thời, hoặc lỗi tạm thời sau khi đã thử lại hết
+        """
+        if not self.operations:
+            return
+        operations, size = self.operations, self.pending_bytes
+        self.operations, self.pending_bytes = [], 0
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                self.collection.bulk_write(operations, ordered=self.ordered)
+                break
+            except PyMongoError as e:
+                if not is_transient_error(e) or attempt >= self.max_retries:
+                    self._record(operations, size, started, attempt, failed=True)
+                    raise
+                time.sleep(random.uniform(0, self.retry_base_delay * (2**attempt)))
+                attempt += 1
+        self._record(operations, size, started, attempt)
+
+    def _record(self, operations, size, started, retries, failed=False):
+        seconds = time.monotonic() - started
+        self.batches.append(
+            {
+                "operations": len(operations),
+                "bytes": size,
+                "seconds": round(seconds, 4),
+                "retries": retries,
+            }
+        )
+        get_metrics_registry().record_write_batch(
+            self.collection.name, len(operations), size, seconds, retries, failed
+        )
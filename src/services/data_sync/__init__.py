@@ -19,6 +19,14 @@ from src.services.data_sync.issue_sync import (
     get_sprint_info_from_mongo,
     get_issues_from_mongo,
 )
+from src.services.data_sync.batch_sync import sync_sprints_issues
+from src.services.data_sync.headless_runner import run_headless_sync
+from src.services.data_sync.scheduler import (
+    SyncScheduler,
+    SyncJobStore,
+    get_sync_status,
+    enqueue_sprint_sync,
+)
 
 __all__ = [
     # Folder manager
@@ -39,4 +47,13 @@ __all__ = [
     "process_issue_details",
     "get_sprint_info_from_mongo",
     "get_issues_from_mongo",
+    # Batch sync
+    "sync_sprints_issues",
+    # Headless runner
+    "run_headless_sync",
+    # Scheduler
+    "SyncScheduler",
+    "SyncJobStore",
+    "get_sync_status",
+    "enqueue_sprint_sync",
 ]
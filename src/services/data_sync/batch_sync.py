@@ -0,0 +1,101 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from src.config.config import NUM_WORKERS
+from src.services.jira.metrics import bind_metrics_scope
+from src.services.jira_client import JiraClient
+from src.services.mongodb_client import MongoDBClient
+from src.services.progress import QueuedProgressReporter, get_default_reporter
+from src.services.data_sync.issue_sync import sync_sprint_issues
+
+# Chu kỳ (giây) thread chính chuyển thông báo của các worker sang reporter
+DRAIN_INTERVAL_SECONDS = 0.5
+
+
+def sync_sprints_issues(
+    sprint_ids, incremental=True, max_workers=NUM_WORKERS, reporter=None
+):
+    """Đồng bộ issues của nhiều sprint song song
+
+    Các sprint được chia cho tối đa max_workers thread. Mọi worker dùng chung
+    transport, token bucket và limiter số request đồng thời của Jira, nên tổng
+    tải lên Jira không tăng theo số worker.
+
+    Args:
+        sprint_ids (list): ID các sprint cần đồng bộ
+        incremental (bool): Chỉ lấy issues thay đổi từ lần đồng bộ trước của mỗi sprint
+        max_workers (int): Số sprint được đồng bộ cùng lúc
+        reporter (ProgressReporter, optional): Nơi nhận thông báo và tiến trình tổng.
+            Chỉ được gọi từ thread gọi hàm này
+
+    Returns:
+        dict: Mapping sprint ID -> số issues đã đồng bộ (None nếu thất bại)
+    """
+    if reporter is None:
+        reporter = get_default_reporter()
+    if not sprint_ids:
+        return {}
+
+    # Các worker không gọi trực tiếp reporter (Streamlit chỉ dùng được từ thread chính)
+    worker_reporter = QueuedProgressReporter()
+    jira_client = JiraClient(reporter=worker_reporter)
+    mongo_client = MongoDBClient(reporter=worker_reporter)
+    if not mongo_client.is_connected():
+        reporter.error("Không thể kết nối đến MongoDB, dừng đồng bộ")
+        return {}
+
+    def sync_one(sprint_id):
+        try:
+            issue_count = sync_sprint_issues(
+                jira_client,
+                mongo_client,
+                sprint_id,
+                with_progress=False,
+                reporter=worker_reporter,
+                incremental=incremental,
+            )
+            # Lỗi đã được báo qua reporter; None khác với sprint rỗng (0 issues)
+            return issue_count
+        except Exception as e:
+            worker_reporter.error(f"Lỗi khi đồng bộ sprint {sprint_id}: {str(e)}")
+            return None
+
+    results = {}
+    total = len(sprint_ids)
+    reporter.progress(0, total, f"Đang đồng bộ {total} sprints...")
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, total)), thread_name_prefix="sprint-sync"
+    ) as executor:
+        run_one = bind_metrics_scope(sync_one)
+        futures = {
+            executor.submit(run_one, sprint_id): sprint_id for sprint_id in sprint_ids
+        }
+        pending = set(futures)
+        while pending:
+            done, pending = wait(
+                pending, timeout=DRAIN_INTERVAL_SECONDS, return_when=FIRST_COMPLETED
+            )
+            worker_reporter.drain(reporter)
+            for future in done:
+                sprint_id = futures[future]
+                results[sprint_id] = future.result()
+                outcome = (
+                    "thất bại"
+                    if results[sprint_id] is None
+                    else f"{results[sprint_id]} issues"
+                )
+                reporter.progress(
+                    len(results),
+                    total,
+                    f"Sprint {sprint_id}: {outcome} ({len(results)}/{total} sprints)",
+                )
+
+    worker_reporter.drain(reporter)
+    reporter.clear_progress()
+
+    failed = [sprint_id for sprint_id, count in results.items() if count is None]
+    if failed:
+        reporter.error(
+            f"Đồng bộ thất bại {len(failed)}/{total} sprints: "
+            f"{', '.join(str(sprint_id) for sprint_id in failed)}"
+        )
+    return results
@@ -0,0 +1,233 @@
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from src.config.config import (
+    SYNC_CHECKPOINT_BATCH_SIZE,
+    SYNC_CHECKPOINT_MAX_AGE_HOURS,
+    SYNC_LEASE_MINUTES,
+)
+from src.services.issue_collection import issue_document_id, strip_internal_fields
+
+logger = logging.getLogger("jirave.sync")
+
+# Các trường thời gian của sprint ảnh hưởng tới kết quả xử lý issues
+SPRINT_DATE_FIELDS = ("startDate", "endDate", "completeDate")
+
+
+class SyncCheckpoint:
+    """Lưu tạm issues đã xử lý theo từng lô trong lúc đồng bộ toàn bộ một sprint
+
+    Mỗi lô là một document trong collection sync_staging, thông tin lần đồng bộ
+    (mốc bắt đầu, thời gian sprint, các trường lấy thêm) nằm trong sync_checkpoints.
+    Nếu lần đồng bộ bị ngắt giữa chừng, lần chạy sau chỉ cần lấy các issues chưa
+    được lưu tạm. Checkpoint bị xóa khi dữ liệu đã được lưu đầy đủ vào MongoDB.
+
+    Khi issues được ghi thẳng vào collection issues qua SprintIssueWriter, lô chỉ
+    lưu key của issues; lần chạy sau đọc lại các issues này từ collection issues.
+    Mỗi sprint chỉ có một lần đồng bộ tại một thời điểm nhờ lease trong
+    sync_leases (acquire/release).
+    """
+
+    def __init__(self, db, sprint_id, batch_size=SYNC_CHECKPOINT_BATCH_SIZE):
+        """Khởi tạo checkpoint
+
+        Args:
+            db (pymongo.database.Database): Database MongoDB (MongoDBClient.db)
+            sprint_id (int): ID của sprint
+            batch_size (int): Số issues mỗi lô được lưu tạm
+        """
+        self.checkpoints = db["sync_checkpoints"]
+        self.staging = db["sync_staging"]
+        self.leases = db["sync_leases"]
+        self.issues = db["issues"]
+        self.sprint_id = sprint_id
+        self.batch_size = max(1, batch_size)
+        self.checkpoint_id = f"sprint_{sprint_id}"
+        self.owner = uuid.uuid4().hex
+        self.buffer = []
+        self.next_batch = 0
+        # Bộ ghi issues của lần đồng bộ (chỉ lưu tạm key khi có)
+        self.writer = None
+
+    def acquire(self):
+        """Giữ lease của sprint để không có lần đồng bộ khác chạy cùng lúc
+
+        Lease hết hạn sau SYNC_LEASE_MINUTES phút nếu không được gia hạn (ví dụ
+        tiến trình bị tắt đột ngột), mỗi lần lưu tạm một lô sẽ gia hạn lease.
+
+        Returns:
+            bool: True nếu đã giữ được lease, False nếu sprint đang được đồng bộ ở nơi khác
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            # Lease đang do nơi khác giữ và còn hạn thì upsert bị trùng _id
+            self.leases.find_one_and_update(
+                {
+                    "_id": self.checkpoint_id,
+                    "$or": [{"owner": self.owner}, {"expires_at": {"$lt": now}}],
+                },
+                {
+                    "$set": {
+                        "owner": self.owner,
+                        "expires_at": now + timedelta(minutes=SYNC_LEASE_MINUTES),
+                    }
+                },
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    def release(self):
+        """Trả lease của sprint (chỉ khi lease vẫn do lần đồng bộ này giữ)"""
+        try:
+            self.leases.delete_one({"_id": self.checkpoint_id, "owner": self.owner})
+        except PyMongoError as e:
+            # Lease tự hết hạn sau SYNC_LEASE_MINUTES phút
+            logger.warning("Không trả được lease của sprint %s: %s", self.sprint_id, e)
+
+    def attach_writer(self, writer):
+        """Dùng bộ ghi issues của lần đồng bộ: chỉ lưu tạm key của issues
+
+        Args:
+            writer (SprintIssueWriter): Bộ ghi issues vào collection issues
+        """
+        self.writer = writer
+
+    def load(self, sprint_info, fields=None):
+        """Đọc checkpoint còn hiệu lực của sprint
+
+        Args:
+            sprint_info (dict): Thông tin sprint hiện tại từ Jira
+            fields (list, optional): Các trường lấy thêm của lần đồng bộ hiện tại
+
+        Returns:
+            tuple: (issues đã lưu tạm, mốc bắt đầu lần đồng bộ dạng datetime UTC),
+                None nếu không có checkpoint hợp lệ
+        """
+        checkpoint = self.checkpoints.find_one({"_id": self.checkpoint_id})
+        if not checkpoint:
+            return None
+
+        started_at = checkpoint["started_at"].replace(tzinfo=timezone.utc)
+        max_age = timedelta(hours=SYNC_CHECKPOINT_MAX_AGE_HOURS)
+        sprint_changed = any(
+            checkpoint.get("sprint_dates", {}).get(key) != sprint_info.get(key)
+            for key in SPRINT_DATE_FIELDS
+        )
+        if (
+            datetime.now(timezone.utc) - started_at > max_age
+            or sprint_changed
+            or checkpoint.get("fields") != sorted(fields or [])
+        ):
+            self.clear()
+            return None
+
+        issues = []
+        batches = self.staging.find({"sprint_id": self.sprint_id}).sort("batch", 1)
+        for batch in batches:
+            if "keys" in batch:
+                issues.extend(self._load_written(batch["keys"]))
+            else:
+                issues.extend(batch.get("issues", []))
+            self.next_batch = batch["batch"] + 1
+        return issues, started_at
+
+    def _load_written(self, keys):
+        """Đọc lại từ collection issues các issues đã ghi qua bộ ghi, theo thứ tự key"""
+        ids = [issue_document_id(self.sprint_id, key) for key in keys]
+        documents = {
+            document.get("key"): strip_internal_fields(document)
+            for document in self.issues.find({"_id": {"$in": ids}})
+        }
+        # Issue không còn trong collection sẽ được lấy lại từ Jira
+        return [documents[key] for key in keys if key in documents]
+
+    def start(self, sprint_info, started_at, fields=None):
+        """Bắt đầu checkpoint mới, xóa dữ liệu tạm của lần đồng bộ trước
+
+        Args:
+            sprint_info (dict): Thông tin sprint từ Jira
+            started_at (datetime): Mốc bắt đầu lần đồng bộ (UTC)
+            fields (list, optional): Các trường lấy thêm ngoài field profile "sync"
+        """
+        self.clear()
+        self.checkpoints.insert_one(
+            {
+                "_id": self.checkpoint_id,
+                "sprint_id": self.sprint_id,
+                "started_at": started_at,
+                "sprint_dates": {key: sprint_info.get(key) for key in SPRINT_DATE_FIELDS},
+                "fields": sorted(fields or []),
+                "staged_issues": 0,
+            }
+        )
+
+    def add(self, issues):
+        """Thêm issues đã xử lý, lưu tạm khi đủ một lô
+
+        Args:
+            issues (list): Issues đã xử lý (kết quả của process_issues_data)
+        """
+        self.buffer.extend(issues)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Lưu tạm các issues đang chờ trong bộ đệm và gia hạn lease"""
+        if not self.buffer:
+            return
+        batch = self.next_batch
+        document = {"sprint_id": self.sprint_id, "batch": batch}
+        if self.writer is not None:
+            # Issues phải nằm trong collection issues trước khi key được lưu tạm
+            self.writer.flush()
+            document["keys"] = [issue.get("key") for issue in self.buffer]
+        else:
+            document["issues"] = self.buffer
+        self.staging.replace_one(
+            {"_id": f"{self.checkpoint_id}_{batch}"}, document, upsert=True
+        )
+        self.checkpoints.update_one(
+            {"_id": self.checkpoint_id},
+            {
+                "$inc": {"staged_issues": len(self.buffer)},
+                "$set": {"updated_at": datetime.now(timezone.utc)},
+            },
+        )
+        self.next_batch += 1
+        self.buffer = []
+        self.acquire()
+
+    def clear(self):
+        """Xóa checkpoint và toàn bộ dữ liệu tạm của sprint"""
+        self.staging.delete_many({"sprint_id": self.sprint_id})
+        self.checkpoints.delete_one({"_id": self.checkpoint_id})
+        self.buffer = []
+        self.next_batch = 0
+
+
+def get_sync_checkpoint(mongo_client, sprint_id):
+    """Tạo checkpoint cho lần đồng bộ sprint
+
+    Args:
+        mongo_client (MongoDBClient): Client MongoDB
+        sprint_id (int): ID của sprint
+
+    Returns:
+        SyncCheckpoint: Checkpoint, None nếu không kết nối được MongoDB
+    """
+    if not mongo_client.is_connected():
+        return None
+    mongo_client.connection.ensure_indexes("sync_checkpoints", ensure_checkpoint_indexes)
+    return SyncCheckpoint(mongo_client.db, sprint_id)
+
+
+def ensure_checkpoint_indexes(db):
+    """Tạo index của các collection checkpoint
+
+    Args:
+        db (pymongo.database.Database): Database MongoDB
+    """
+    db["sync_staging"].create_index("sprint_id")
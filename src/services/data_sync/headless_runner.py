@@ -0,0 +1,48 @@
+from src.config.config import DEFAULT_PROJECT, NUM_WORKERS
+from src.services.progress import LogProgressReporter
+from src.services.data_sync.sync_service import DataSyncService
+
+
+def run_headless_sync(
+    sprint_ids=None,
+    project_key=DEFAULT_PROJECT,
+    state="active",
+    reporter=None,
+    incremental=True,
+    max_workers=NUM_WORKERS,
+):
+    """Đồng bộ issues của các sprint không cần giao diện Streamlit (cron, systemd)
+
+    Args:
+        sprint_ids (list, optional): ID các sprint cần đồng bộ. Nếu không có sẽ lấy
+            các sprint của dự án theo trạng thái
+        project_key (str): Mã dự án, dùng khi không truyền sprint_ids
+        state (str, optional): Trạng thái sprint cần đồng bộ (active, future, closed).
+            None để đồng bộ tất cả sprints
+        reporter (ProgressReporter, optional): Nơi nhận thông báo, mặc định ghi ra logging
+        incremental (bool): Chỉ lấy issues thay đổi từ lần đồng bộ trước của mỗi sprint
+        max_workers (int): Số sprint được đồng bộ cùng lúc
+
+    Returns:
+        dict: Mapping sprint ID -> số issues đã đồng bộ (None nếu thất bại)
+    """
+    if reporter is None:
+        reporter = LogProgressReporter()
+
+    service = DataSyncService(reporter=reporter)
+    if not service.mongo_client.is_connected():
+        reporter.error("Không thể kết nối đến MongoDB, dừng đồng bộ")
+        return {}
+
+    if not sprint_ids:
+        sprints = service.sync_all_sprints(project_key, show_toast=False)
+        sprint_ids = [
+            sprint["id"]
+            for sprint in sprints
+            if state is None or sprint.get("state") == state
+        ]
+        reporter.info(
+            f"Tìm thấy {len(sprint_ids)} sprints cần đồng bộ của dự án {project_key}"
+        )
+
+    return service.sync_sprints_issues(sprint_ids, incremental, max_workers)
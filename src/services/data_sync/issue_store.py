@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+from pymongo import ReplaceOne
+from src.services.jira.field_profiles import get_field_profile
+
+
+def get_store_fields(fields=None):
+    """Danh sách trường được lấy khi đồng bộ (field profile "sync" và các trường thêm)
+
+    Args:
+        fields (list, optional): Các trường lấy thêm ngoài field profile "sync"
+
+    Returns:
+        list: Danh sách trường đã sắp xếp
+    """
+    return sorted(set(get_field_profile("sync").fields) | set(fields or []))
+
+
+class IssueStore:
+    """Kho issues dùng chung giữa các sprint, khóa theo issue key và thời gian updated
+
+    Mỗi document trong collection issue_store giữ dữ liệu gốc từ Jira của một
+    issue (fields gồm cả worklog, changelog đầy đủ) tại phiên bản updated gần
+    nhất. Issue chuyển từ sprint trước sang mà không thay đổi sẽ được xử lý lại
+    từ kho với khoảng thời gian của sprint mới thay vì lấy lại từ Jira.
+    """
+
+    def __init__(self, db, fields=None):
+        """Khởi tạo kho issues
+
+        Args:
+            db (pymongo.database.Database): Database MongoDB (MongoDBClient.db)
+            fields (list, optional): Các trường lấy thêm của lần đồng bộ hiện tại
+        """
+        self.collection = db["issue_store"]
+        self.field_names = get_store_fields(fields)
+
+    def load(self, versions):
+        """Lấy các issues trong kho còn đúng phiên bản hiện tại trên Jira
+
+        Args:
+            versions (dict): Mapping issue key -> giá trị updated hiện tại trên Jira
+
+        Returns:
+            dict: Mapping issue key -> issue gốc ({"key", "fields", "changelog"})
+        """
+        if not versions:
+            return {}
+
+        required_fields = set(self.field_names)
+        cached = {}
+        documents = self.collection.find({"_id": {"$in": list(versions)}})
+        for document in documents:
+            key = document["_id"]
+            # Issue đã thay đổi hoặc được lưu với ít trường hơn thì phải lấy lại
+            if document.get("updated") != versions.get(key):
+                continue
+            if not required_fields <= set(document.get("field_names", [])):
+                continue
+            cached[key] = {
+                "key": key,
+                "fields": document.get("fields", {}),
+                "changelog": document.get("changelog"),
+            }
+        return cached
+
+    def save(self, issues):
+        """Lưu dữ liệu gốc của các issues vừa lấy từ Jira
+
+        Args:
+            issues (list): Issues gốc kèm changelog đầy đủ ({"key", "fields", "changelog"})
+        """
+        now = datetime.now(timezone.utc)
+        operations = [
+            ReplaceOne(
+                {"_id": issue["key"]},
+                {
+                    "updated": issue["fields"].get("updated"),
+                    "field_names": self.field_names,
+                    "fields": issue["fields"],
+                    "changelog": issue.get("changelog"),
+                    "stored_at": now,
+                },
+                upsert=True,
+            )
+            for issue in issues
+        ]
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+
+
+class CachedIssueStream:
+    """Nguồn issues lấy từ kho, cùng giao diện với IssueStream để đưa vào pipeline"""
+
+    def __init__(self, issues):
+        """Khởi tạo stream
+
+        Args:
+            issues (list): Issues gốc lấy từ kho ({"key", "fields", "changelog"})
+        """
+        self.issues = issues
+        self.total = len(issues)
+        self.count = 0
+        self.failed = False
+
+    def __iter__(self):
+        for issue in self.issues:
+            self.count += 1
+            yield issue
+
+
+def get_issue_store(mongo_client, fields=None):
+    """Tạo kho issues dùng chung
+
+    Args:
+        mongo_client (MongoDBClient): Client MongoDB
+        fields (list, optional): Các trường lấy thêm của lần đồng bộ hiện tại
+
+    Returns:
+        IssueStore: Kho issues, None nếu không kết nối được MongoDB
+    """
+    if not mongo_client.is_connected():
+        return None
+    return IssueStore(mongo_client.db, fields)
@@ -1,43 +1,51 @@
-import streamlit as st
 import re
-import json
-from src.services.mongodb_client import is_running_in_streamlit
+import math
 from src.config import DEBUG
-from datetime import datetime
+from src.config.config import (
+    JIRA_ASYNC_MAX_CONCURRENCY,
+    JIRA_PAGE_FANOUT,
+    SYNC_WATERMARK_OVERLAP_MINUTES,
+)
+from src.services.jira.async_client import fetch_issues_changelog
+from src.services.data_sync.checkpoint import get_sync_checkpoint
+from src.services.data_sync.issue_store import CachedIssueStream, get_issue_store
+from src.services.data_sync.pipeline import PipelineStage, SyncPipeline
+from src.services.jira.field_profiles import get_field_profile
+from src.services.jira.metrics import get_metrics_registry
+from src.services.progress import get_default_reporter
+from src.services.utils.changelog_analyzer import (
+    DEV_DONE_STATUSES,
+    TEST_DONE_STATUSES,
+    analyze_changelog,
+    get_sprint_window,
+)
+from datetime import datetime, timezone
 
 
 def get_default_issue_fields():
     """Trả về danh sách mặc định các trường cần lấy từ Jira API
 
     Returns:
-        list: Danh sách các trường cần lấy
+        list: Danh sách các trường cần lấy (theo field profile "sync")
     """
-    return [
-        "summary",
-        "status",
-        "assignee",
-        "issuetype",
-        "priority",
-        "created",
-        "updated",
-        "customfield_10160",  # Show in Dashboard
-        "customfield_10130",  # Popup
-        "customfield_10159",  # Steve Estimate
-        "subtasks",  # Thông tin về sub-tasks
-        "parent",  # Thông tin về parent nếu là sub-task
-        "duedate",  # Ngày đến hạn
-        "resolutiondate",  # Ngày hoàn thành
-        "timeoriginalestimate",  # Thời gian ước tính ban đầu
-        "timeestimate",  # Thời gian ước tính còn lại
-        "timespent",  # Thời gian đã dùng
-        "worklog",  # Nhật ký công việc
-        "customfield_10092",  # Customer
-        "customfield_10132",  # Feature
-        "customfield_10031",  # Tester
-        "comment",  # Lấy comments để tìm thông tin commit
-        "development",  # Thông tin phát triển có thể chứa commit
-        "changelog",  # Lấy changelog để tìm thời gian chuyển trạng thái
-    ]
+    return list(get_field_profile("sync").fields)
+
+
+def is_changelog_truncated(changelog_data):
+    """Kiểm tra changelog trả về kèm search có bị cắt bớt hay không
+
+    Search với expand=changelog chỉ trả về tối đa một số histories nhất định cho mỗi issue.
+
+    Args:
+        changelog_data (dict): Changelog của issue (có thể None)
+
+    Returns:
+        bool: True nếu cần lấy lại toàn bộ changelog qua endpoint riêng
+    """
+    if changelog_data is None:
+        return True
+    histories = changelog_data.get("histories", [])
+    return changelog_data.get("total", len(histories)) > len(histories)
 
 
 def sync_sprint_issues(
@@ -47,6 +55,8 @@ def sync_sprint_issues(
     sprint_info=None,
     fields=None,
     with_progress=True,
+    reporter=None,
+    incremental=False,
 ):
     """Đồng bộ issues của một sprint
 
@@ -55,15 +65,18 @@ def sync_sprint_issues(
         mongo_client: Client kết nối đến MongoDB
         sprint_id (int): ID của sprint
         sprint_info (dict, optional): Thông tin sprint. Nếu không cung cấp sẽ tự động lấy từ API
-        fields (list, optional): Danh sách các trường cần lấy
+        fields (list, optional): Các trường cần lấy thêm ngoài field profile "sync"
         with_progress (bool): Hiển thị tiến trình hay không
+        reporter (ProgressReporter, optional): Nơi nhận thông báo và tiến trình.
+            Mặc định chọn theo môi trường (Streamlit hoặc logging)
+        incremental (bool): Chỉ lấy issues thay đổi từ lần đồng bộ trước và gộp vào dữ liệu
+            đã lưu. Tự động đồng bộ toàn bộ nếu chưa có mốc đồng bộ hợp lệ
 
     Returns:
-        list: Danh sách issues đã đồng bộ
+        int: Số issues đã đồng bộ (0 nếu sprint không có issues), None nếu đồng bộ thất bại
     """
-    # Sử dụng danh sách trường mặc định nếu không được cung cấp
-    if fields is None:
-        fields = get_default_issue_fields()
+    if reporter is None:
+        reporter = get_default_reporter()
 
     # Lấy thông tin sprint nếu chưa có
     if sprint_info is None:
@@ -72,339 +85,790 @@ def sync_sprint_issues(
                 f"sprint/{sprint_id}", use_agile_api=True
             ).json()
         except Exception as e:
-            if is_running_in_streamlit():
-                st.error(f"Lỗi khi lấy thông tin sprint {sprint_id}: {str(e)}")
-            return []
+            reporter.error(f"Lỗi khi lấy thông tin sprint {sprint_id}: {str(e)}")
+            return None
 
     sprint_name = sprint_info.get("name", f"Sprint {sprint_id}")
 
     # Lấy thông tin board để lấy project key
     board_id = sprint_info.get("originBoardId")
     if not board_id:
-        if is_running_in_streamlit():
-            st.error(f"Không tìm thấy board ID cho sprint {sprint_id}")
-        return []
+        reporter.error(f"Không tìm thấy board ID cho sprint {sprint_id}")
+        return None
 
     try:
         board_info = jira_client.get(f"board/{board_id}", use_agile_api=True).json()
         project_key = board_info.get("location", {}).get("projectKey")
         if not project_key:
-            if is_running_in_streamlit():
-                st.error(f"Không tìm thấy project key cho board {board_id}")
-            return []
+            reporter.error(f"Không tìm thấy project key cho board {board_id}")
+            return None
     except Exception as e:
-        if is_running_in_streamlit():
-            st.error(f"Lỗi khi lấy thông tin board {board_id}: {str(e)}")
-        return []
+        reporter.error(f"Lỗi khi lấy thông tin board {board_id}: {str(e)}")
+        return None
 
-    # Lấy danh sách issues
-    try:
-        progress_text = f"Đang đồng bộ issues của sprint {sprint_name}..."
-        progress_bar = None
-
-        if with_progress and is_running_in_streamlit():
-            st.toast(progress_text, icon="ℹ️")
-            progress_bar = st.progress(0)
-
-        # Không giới hạn số lượng issues (max_issues=-1 sẽ lấy tất cả)
-        issues = jira_client.get_sprint_issues(
-            sprint_id, 
-            fields=fields, 
-            max_issues=-1,
-            project_key=project_key
-        )
+    # Lấy danh sách issues, ghi lại số liệu gọi Jira API của lần đồng bộ này
+    with get_metrics_registry().scope() as metrics_scope:
+        checkpoint = None
+        try:
+            # Mỗi sprint chỉ có một lần đồng bộ tại một thời điểm
+            checkpoint = get_sync_checkpoint(mongo_client, sprint_id)
+            if checkpoint and not checkpoint.acquire():
+                reporter.error(
+                    f"Sprint {sprint_name} đang được đồng bộ ở nơi khác, "
+                    "bỏ qua lần đồng bộ này"
+                )
+                checkpoint = None
+                return None
 
-        if not issues:
-            if is_running_in_streamlit():
-                st.warning(f"Không có issues nào trong sprint {sprint_name}")
-            return []
+            if with_progress:
+                reporter.toast(
+                    f"Đang đồng bộ issues của sprint {sprint_name}...", icon="ℹ️"
+                )
 
-        # Lọc bỏ các issue không có quyền truy cập
-        valid_issues = []
-        no_access_count = 0
+            # Mốc thời gian lấy trước khi gọi Jira để lần đồng bộ sau không bỏ sót thay đổi
+            sync_started = datetime.now(timezone.utc)
+            complete = True
 
-        for issue in issues:
-            # Kiểm tra xem issue có thông báo lỗi quyền truy cập không
-            if issue.get("key") and issue.get("fields") is not None:
-                # Thêm issue hợp lệ vào danh sách
-                valid_issues.append(issue)
+            # Lần đồng bộ toàn bộ trước bị ngắt giữa chừng thì tiếp tục từ checkpoint
+            resume = checkpoint.load(sprint_info, fields) if checkpoint else None
+
+            base = None
+            if incremental and resume is None:
+                base = get_incremental_base(mongo_client, sprint_id, sprint_info)
+                if base is None:
+                    reporter.info(
+                        f"Sprint {sprint_name} chưa có mốc đồng bộ hợp lệ, đồng bộ toàn bộ"
+                    )
+
+            versions, cached = None, {}
+            # Bộ ghi MongoDB khi issues được ghi theo lô ngay trong pipeline
+            issue_writer = None
+            issue_store = get_issue_store(mongo_client, fields)
+            if resume is None and base is None:
+                # Issues đã xử lý được lưu tạm theo lô để lần chạy sau có thể tiếp tục
+                if checkpoint:
+                    checkpoint.start(sprint_info, sync_started, fields)
+
+                # Issues chuyển từ sprint khác sang mà chưa thay đổi được lấy từ kho issues
+                # dùng chung, chỉ các issues còn lại được lấy từ Jira
+                if issue_store:
+                    versions = get_sprint_issue_versions(
+                        jira_client, sprint_id, project_key
+                    )
+                    if versions:
+                        cached = issue_store.load(versions)
+
+            if resume is not None:
+                staged_issues, sync_started = resume
+                reporter.info(
+                    f"Tiếp tục đồng bộ sprint {sprint_name} từ checkpoint "
+                    f"({len(staged_issues)} issues đã lưu tạm)"
+                )
+                result = resume_sprint_sync(
+                    jira_client,
+                    mongo_client,
+                    sprint_id,
+                    project_key,
+                    sprint_info,
+                    staged_issues,
+                    checkpoint,
+                    fields,
+                    reporter,
+                    with_progress,
+                    issue_store,
+                )
+                if result is None:
+                    if with_progress:
+                        reporter.clear_progress()
+                    reporter.error(
+                        f"Không thể tiếp tục đồng bộ sprint {sprint_name}, "
+                        "checkpoint được giữ lại cho lần chạy sau"
+                    )
+                    return None
+                issues, no_access_count = result
+            elif base is not None:
+                stored_issues, watermark = base
+                result = sync_changed_issues(
+                    jira_client,
+                    mongo_client,
+                    sprint_id,
+                    project_key,
+                    sprint_info,
+                    stored_issues,
+                    watermark,
+                    fields,
+                    reporter,
+                    with_progress,
+                    issue_store,
+                )
+                if result is None:
+                    if with_progress:
+                        reporter.clear_progress()
+                    reporter.error(
+                        f"Không thể đồng bộ tăng dần sprint {sprint_name}, "
+                        "dữ liệu cũ được giữ nguyên"
+                    )
+                    return None
+                issues, no_access_count = result
+            elif cached:
+                reporter.info(
+                    f"Sprint {sprint_name}: dùng lại {len(cached)}/{len(versions)} "
+                    "issues chưa thay đổi từ kho issues"
+                )
+                result = sync_issues_by_keys(
+                    jira_client,
+                    mongo_client,
+                    set(versions) - set(cached),
+                    sprint_info,
+                    fields,
+                    reporter,
+                    with_progress,
+                    checkpoint,
+                    issue_store,
+                    cached=list(cached.values()),
+                )
+                if result is None:
+                    if with_progress:
+                        reporter.clear_progress()
+                    reporter.error(
+                        f"Không thể lấy đầy đủ issues của sprint {sprint_name}, "
+                        "checkpoint được giữ lại cho lần chạy sau"
+                    )
+                    return None
+                issues, no_access_count = result
+                # Giữ thứ tự issues như trong sprint
+                order = {key: i for i, key in enumerate(versions)}
+                issues.sort(key=lambda issue: order.get(issue.get("key"), len(order)))
             else:
-                # Đếm số issue không có quyền truy cập
-                no_access_count += 1
-                if is_running_in_streamlit():
-                    st.toast(
-                        f"Không có quyền truy cập issue {issue.get('key', 'Unknown')}",
-                        icon="⚠️",
+                # Stream từng issue thay vì tải cả sprint vào bộ nhớ: mỗi issue được xử lý
+                # thành bản ghi gọn rồi bỏ dữ liệu gốc (worklogs, changelog) ngay
+                # Profile "sync" lấy changelog kèm kết quả search để tránh gọi API riêng cho từng issue.
+                # Các trang sau trang đầu được lấy trước song song, bộ nhớ chỉ tăng theo số trang lấy trước
+                stream = jira_client.iter_sprint_issues(
+                    sprint_id,
+                    fields=fields,
+                    max_issues=-1,
+                    project_key=project_key,
+                    profiles=["sync"],
+                    fanout=JIRA_PAGE_FANOUT,
+                )
+                # Issues được ghi vào MongoDB theo lô ngay sau bước transform
+                if mongo_client.is_connected():
+                    issue_writer = mongo_client.open_issue_writer(sprint_id)
+                    # Issues đã ghi vào collection issues nên checkpoint chỉ lưu tạm key
+                    if checkpoint:
+                        checkpoint.attach_writer(issue_writer)
+                issues, no_access_count, failed_count = process_issue_stream(
+                    jira_client,
+                    mongo_client,
+                    stream,
+                    sprint_info,
+                    reporter,
+                    with_progress,
+                    checkpoint,
+                    issue_store,
+                    issue_writer,
+                )
+
+                if stream.failed:
+                    complete = False
+                    reporter.warning(
+                        f"Không thể lấy đầy đủ issues của sprint {sprint_name} "
+                        f"({stream.count}/{stream.total or '?'})"
+                    )
+                if failed_count:
+                    # Checkpoint được giữ lại, lần chạy sau lấy lại các issues này
+                    complete = False
+                    reporter.warning(
+                        f"Sprint {sprint_name}: {failed_count} issues chưa lấy được "
+                        "changelog đầy đủ, sẽ được lấy lại ở lần đồng bộ sau"
                     )
 
-        if no_access_count > 0 and is_running_in_streamlit():
-            st.warning(f"Đã bỏ qua {no_access_count} issues do không có quyền truy cập")
+            if no_access_count > 0:
+                reporter.warning(
+                    f"Đã bỏ qua {no_access_count} issues do không có quyền truy cập"
+                )
+
+            # Issues ghi qua issue_writer không được giữ lại trong bộ nhớ
+            issue_count = issue_writer.count if issue_writer else len(issues)
+            if not issue_count:
+                if not complete:
+                    # Không lấy được issue nào: giữ nguyên dữ liệu đã lưu
+                    if with_progress:
+                        reporter.clear_progress()
+                    reporter.error(f"Không lấy được issues của sprint {sprint_name}")
+                    return None
+                # Sprint rỗng vẫn được lưu để xóa issues cũ và số liệu tổng hợp
+                reporter.warning(f"Không có issues nào trong sprint {sprint_name}")
+
+            # Lưu vào MongoDB
+            if mongo_client.is_connected():
+                reporter.toast("Đang xử lý và lưu dữ liệu vào MongoDB...", icon="ℹ️")
+                # Issues đã được xử lý trong lúc stream nên save_issues chỉ lọc lại các trường
+                # Chỉ cập nhật mốc đồng bộ và xóa issues đã rời sprint khi đã lấy đủ issues
+                save_result = mongo_client.save_issues(
+                    issues,
+                    sprint_id,
+                    sprint_name,
+                    sprint_info,
+                    sync_metrics=metrics_scope.summary(),
+                    sync_watermark=sync_started if complete else None,
+                    writer=issue_writer,
+                    delete_missing=complete,
+                )
+                if not save_result:
+                    if with_progress:
+                        reporter.clear_progress()
+                    return None
+                reporter.toast("Dữ liệu đã được xử lý và lưu vào MongoDB!", icon="✅")
+                # Giữ checkpoint khi chưa lấy đủ issues để lần sau lấy tiếp phần còn thiếu
+                if checkpoint and complete:
+                    checkpoint.clear()
+            else:
+                if with_progress:
+                    reporter.clear_progress()
+                reporter.error("Không thể kết nối đến MongoDB. Dữ liệu không được lưu.")
+                return None
 
-        # Cập nhật danh sách issues
-        issues = valid_issues
-        total_issues = len(issues)
+            if with_progress:
+                reporter.clear_progress()
 
-        # Xử lý chi tiết từng issue
-        for i, issue in enumerate(issues):
-            issue_key = issue.get("key")
+            reporter.toast(
+                f"Đã đồng bộ {issue_count} issues của sprint {sprint_name}", icon="✅"
+            )
+
+            return issue_count
+        except Exception as e:
+            if with_progress:
+                reporter.clear_progress()
+            reporter.error(f"Lỗi khi đồng bộ issues của sprint {sprint_id}: {str(e)}")
+            return None
+        finally:
+            if checkpoint:
+                checkpoint.release()
 
-            if with_progress and progress_bar is not None and is_running_in_streamlit():
-                # Cập nhật tiến trình
-                progress = min((i + 1) / total_issues, 1.0)
-                progress_bar.progress(
-                    progress, text=f"Đồng bộ {i+1}/{total_issues} issues: {issue_key}"
+
+def process_issue_stream(
+    jira_client,
+    mongo_client,
+    stream,
+    sprint_info,
+    reporter,
+    with_progress=True,
+    checkpoint=None,
+    issue_store=None,
+    issue_writer=None,
+):
+    """Xử lý các issues từ stream thành bản ghi lưu trong MongoDB theo pipeline
+
+    Các bước chạy đồng thời, nối với nhau bằng hàng đợi giới hạn kích thước:
+    fetch (đọc stream) -> enrich (changelog, trạng thái trong sprint) ->
+    transform (process_issues_data) -> write (ghi MongoDB theo lô, lưu tạm
+    checkpoint, tiến trình).
+
+    Args:
+        jira_client: Client kết nối đến Jira
+        mongo_client: Client kết nối đến MongoDB
+        stream (IssueStream): Stream issues lấy với field profile "sync"
+        sprint_info (dict): Thông tin sprint
+        reporter (ProgressReporter): Nơi nhận thông báo và tiến trình
+        with_progress (bool): Hiển thị tiến trình hay không
+        checkpoint (SyncCheckpoint, optional): Nơi lưu tạm issues đã xử lý theo lô
+        issue_store (IssueStore, optional): Kho lưu dữ liệu gốc để các sprint sau dùng lại
+        issue_writer (SprintIssueWriter, optional): Ghi từng issue đã xử lý vào MongoDB theo lô
+
+    Returns:
+        tuple: (danh sách issues đã xử lý, số issues không có quyền truy cập,
+            số issues không lấy được changelog đầy đủ). Các issues thiếu changelog vẫn
+            được xử lý với changelog bị cắt bớt nhưng không được lưu tạm vào checkpoint.
+            Khi có issue_writer, issues được ghi ngay và không được giữ lại: phần tử
+            đầu là None, số issues lấy từ issue_writer.count
+    """
+    issues = None if issue_writer else []
+    written = 0
+    no_access_count = 0
+    # Key của các issues không lấy được changelog đầy đủ
+    failed_keys = set()
+
+    def enrich(batch):
+        nonlocal no_access_count
+        ready = []
+        # Issues có changelog bị cắt bớt được gom lại để lấy changelog đầy đủ đồng thời
+        truncated = []
+        for issue in batch:
+            # Kiểm tra xem issue có thông báo lỗi quyền truy cập không
+            if not issue.get("key") or issue.get("fields") is None:
+                # Đếm số issue không có quyền truy cập
+                no_access_count += 1
+                reporter.toast(
+                    f"Không có quyền truy cập issue {issue.get('key', 'Unknown')}",
+                    icon="⚠️",
                 )
+                continue
 
+            # Changelog đã có sẵn từ search, chỉ lấy lại những changelog bị cắt bớt
+            if is_changelog_truncated(issue.get("changelog")):
+                truncated.append(issue)
+            else:
+                ready.append((issue, issue.get("changelog")))
+
+        if truncated:
+            changelogs = fetch_issues_changelog([issue.get("key") for issue in truncated])
+            for issue in truncated:
+                key = issue.get("key")
+                changelog = changelogs.get(key)
+                if changelog is None:
+                    # Lấy đồng thời thất bại: thử lại qua endpoint /changelog có phân trang
+                    changelog = jira_client.get_issue_changelog(key)
+                if changelog is None:
+                    failed_keys.add(key)
+                    reporter.warning(
+                        f"Không lấy được changelog đầy đủ của issue {key}, "
+                        "trạng thái trong sprint có thể chưa chính xác"
+                    )
+                    changelog = issue.get("changelog") or {}
+                ready.append((issue, changelog))
+
+        # Lưu dữ liệu gốc (kèm changelog đầy đủ) trước khi issue bị bổ sung các trường đã xử lý.
+        # Issues chỉ có changelog bị cắt bớt không được lưu để sprint khác không dùng lại
+        complete = [
+            (issue, changelog_data)
+            for issue, changelog_data in ready
+            if issue["key"] not in failed_keys
+        ]
+        if issue_store and complete:
+            issue_store.save(
+                [
+                    {
+                        "key": issue["key"],
+                        "fields": issue["fields"],
+                        "changelog": changelog_data,
+                    }
+                    for issue, changelog_data in complete
+                ]
+            )
+
+        enriched = []
+        for issue, changelog_data in ready:
+            issue.pop("changelog", None)
             # Xử lý thêm thông tin cho issue
-            process_issue_details(jira_client, issue, sprint_info)
-
-        # Lưu vào MongoDB
-        if mongo_client.is_connected():
-            if is_running_in_streamlit():
-                st.toast("Đang xử lý và lưu dữ liệu vào MongoDB...", icon="ℹ️")
-            # Truyền cả thông tin sprint để có thể xử lý worklogs một cách chính xác
-            save_result = mongo_client.save_issues(
-                issues, sprint_id, sprint_name, sprint_info
+            process_issue_details(
+                jira_client, issue, sprint_info, changelog_data, reporter
             )
-            if save_result and is_running_in_streamlit():
-                st.toast("Dữ liệu đã được xử lý và lưu vào MongoDB!", icon="✅")
-        else:
-            if is_running_in_streamlit():
-                st.error("Không thể kết nối đến MongoDB. Dữ liệu không được lưu.")
+            enriched.append(issue)
+        return enriched
 
-        if with_progress and progress_bar is not None and is_running_in_streamlit():
-            progress_bar.empty()
+    def transform(batch):
+        return mongo_client.process_issues_data(batch, sprint_info)
 
-        if is_running_in_streamlit():
-            st.toast(
-                f"Đã đồng bộ {len(issues)} issues của sprint {sprint_name}", icon="✅"
+    def write(issue):
+        nonlocal written
+        written += 1
+        if issue_writer:
+            issue_writer.add(issue)
+        else:
+            issues.append(issue)
+        # Issues thiếu changelog không được lưu tạm để lần chạy tiếp theo lấy lại
+        if checkpoint and issue.get("key") not in failed_keys:
+            checkpoint.add([issue])
+
+        if with_progress:
+            # Cập nhật tiến trình
+            total_issues = max(stream.total or 0, written)
+            reporter.progress(
+                written,
+                total_issues,
+                text=f"Đồng bộ {written}/{total_issues} issues: {issue.get('key')}",
             )
 
-        return issues
-    except Exception as e:
-        if is_running_in_streamlit():
-            st.error(f"Lỗi khi đồng bộ issues của sprint {sprint_id}: {str(e)}")
-        return []
+    pipeline = SyncPipeline(
+        stream,
+        [
+            PipelineStage("enrich", enrich, batch_size=JIRA_ASYNC_MAX_CONCURRENCY),
+            PipelineStage("transform", transform, batch_size=50),
+        ],
+    )
+    try:
+        pipeline.run(write)
+    finally:
+        # Lưu tạm cả lô dở dang, kể cả khi bị ngắt (lỗi mạng, Streamlit chạy lại script)
+        if checkpoint:
+            checkpoint.flush()
 
+    return issues, no_access_count, len(failed_keys)
 
-def get_last_status_in_sprint(changelog_data, sprint_start=None, sprint_end=None):
-    """Lấy trạng thái cuối cùng của issue trong sprint dựa trên changelog
+
+def get_incremental_base(mongo_client, sprint_id, sprint_info):
+    """Lấy dữ liệu đã lưu làm nền cho đồng bộ tăng dần
 
     Args:
-        changelog_data (dict): Dữ liệu changelog của issue
-        sprint_start (datetime, optional): Thời gian bắt đầu sprint
-        sprint_end (datetime, optional): Thời gian kết thúc sprint
+        mongo_client: Client kết nối đến MongoDB
+        sprint_id (int): ID của sprint
+        sprint_info (dict): Thông tin sprint hiện tại từ Jira
 
     Returns:
-        tuple: (last_status, current_status) - Trạng thái cuối cùng trong sprint và trạng thái hiện tại
+        tuple: (issues đã lưu, mốc đồng bộ dạng datetime UTC), hoặc None nếu cần đồng bộ toàn bộ
     """
-    status_changes_in_sprint = []
-    current_status = None
-
-    if changelog_data and "histories" in changelog_data:
-        # Duyệt qua tất cả lịch sử thay đổi
-        for history in changelog_data.get("histories", []):
-            history_created = history.get("created", "")
-            if history_created:
-                try:
-                    history_date = datetime.fromisoformat(
-                        history_created.replace("Z", "+00:00")
-                    )
+    if not mongo_client.is_connected():
+        return None
+
+    sprint_document = mongo_client.get_sprint_info(sprint_id)
+    if not sprint_document or not sprint_document.get("sync_watermark"):
+        return None
+
+    # Trạng thái trong sprint và thời gian trong sprint phụ thuộc khoảng thời gian của sprint
+    stored_details = sprint_document.get("details") or {}
+    for key in ("startDate", "endDate", "completeDate"):
+        if stored_details.get(key) != sprint_info.get(key):
+            return None
+
+    stored_issues = mongo_client.get_issues(sprint_id)
+    # Dữ liệu lưu từ phiên bản cũ chưa đánh dấu processed thì không thể gộp an toàn
+    if not stored_issues or not all(issue.get("processed") for issue in stored_issues):
+        return None
+
+    watermark = sprint_document["sync_watermark"]
+    if watermark.tzinfo is None:
+        # pymongo trả về datetime UTC không kèm múi giờ
+        watermark = watermark.replace(tzinfo=timezone.utc)
+    return stored_issues, watermark
+
+
+def sync_changed_issues(
+    jira_client,
+    mongo_client,
+    sprint_id,
+    project_key,
+    sprint_info,
+    stored_issues,
+    watermark,
+    fields=None,
+    reporter=None,
+    with_progress=True,
+    issue_store=None,
+):
+    """Đồng bộ tăng dần: chỉ lấy issues thay đổi từ lần đồng bộ trước rồi gộp vào dữ liệu đã lưu
+
+    Args:
+        jira_client: Client kết nối đến Jira
+        mongo_client: Client kết nối đến MongoDB
+        sprint_id (int): ID của sprint
+        project_key (str): Mã dự án
+        sprint_info (dict): Thông tin sprint
+        stored_issues (list): Issues đã lưu trong MongoDB
+        watermark (datetime): Mốc đồng bộ lần trước (UTC)
+        fields (list, optional): Các trường cần lấy thêm ngoài field profile "sync"
+        reporter (ProgressReporter, optional): Nơi nhận thông báo và tiến trình
+        with_progress (bool): Hiển thị tiến trình hay không
+        issue_store (IssueStore, optional): Kho lưu dữ liệu gốc để các sprint sau dùng lại
+
+    Returns:
+        tuple: (danh sách issues sau khi gộp, số issues không có quyền truy cập),
+            None nếu không lấy được đầy đủ dữ liệu từ Jira
+    """
+    if reporter is None:
+        reporter = get_default_reporter()
+
+    # Danh sách key hiện tại của sprint để phát hiện issue bị bỏ khỏi sprint
+    current_keys = get_sprint_issue_keys(jira_client, sprint_id, project_key)
+    if current_keys is None:
+        return None
+
+    # Issues được cập nhật kể từ mốc đồng bộ lần trước
+    elapsed = (datetime.now(timezone.utc) - watermark).total_seconds()
+    minutes = math.ceil(max(elapsed, 0) / 60) + SYNC_WATERMARK_OVERLAP_MINUTES
+    changed_stream = jira_client.iter_sprint_issues(
+        sprint_id,
+        fields=fields,
+        project_key=project_key,
+        profiles=["sync"],
+        updated_within=minutes,
+    )
+    changed, no_access_count, failed_count = process_issue_stream(
+        jira_client,
+        mongo_client,
+        changed_stream,
+        sprint_info,
+        reporter,
+        with_progress,
+        issue_store=issue_store,
+    )
+    if changed_stream.failed or failed_count:
+        return None
+
+    # Issues có trong sprint nhưng chưa được lưu và không nằm trong kết quả trên
+    changed_keys = {issue.get("key") for issue in changed}
+    stored_keys = {issue.get("key") for issue in stored_issues}
+    missing_keys = current_keys - stored_keys - changed_keys
+    result = sync_issues_by_keys(
+        jira_client,
+        mongo_client,
+        missing_keys,
+        sprint_info,
+        fields,
+        reporter,
+        with_progress,
+        issue_store=issue_store,
+    )
+    if result is None:
+        return None
+    missing, missing_no_access = result
+    changed.extend(missing)
+    no_access_count += missing_no_access
+    changed_keys.update(issue.get("key") for issue in missing)
+
+    # Giữ issues không đổi (theo thứ tự cũ), bỏ issues đã rời sprint, thêm issues mới/đã cập nhật
+    merged = [
+        issue
+        for issue in stored_issues
+        if issue.get("key") in current_keys and issue.get("key") not in changed_keys
+    ]
+    merged.extend(changed)
+
+    removed_count = len(stored_keys - current_keys)
+    reporter.info(
+        f"Đồng bộ tăng dần sprint {sprint_id}: {len(changed)} issues thay đổi, "
+        f"{removed_count} issues đã rời sprint"
+    )
+    return merged, no_access_count
+
+
+def get_sprint_issue_keys(jira_client, sprint_id, project_key):
+    """Lấy danh sách key hiện tại của sprint (chỉ trường key nên rẻ)
+
+    Args:
+        jira_client: Client kết nối đến Jira
+        sprint_id (int): ID của sprint
+        project_key (str): Mã dự án
+
+    Returns:
+        set: Các issue key, None nếu không lấy được đầy đủ
+    """
+    versions = get_sprint_issue_versions(jira_client, sprint_id, project_key)
+    if versions is None:
+        return None
+    return set(versions)
+
+
+def get_sprint_issue_versions(jira_client, sprint_id, project_key):
+    """Lấy key và thời gian updated hiện tại của các issues trong sprint
+
+    Args:
+        jira_client: Client kết nối đến Jira
+        sprint_id (int): ID của sprint
+        project_key (str): Mã dự án
+
+    Returns:
+        dict: Mapping issue key -> updated theo thứ tự trong sprint,
+            None nếu không lấy được đầy đủ
+    """
+    version_stream = jira_client.iter_sprint_issues(
+        sprint_id, fields=["updated"], project_key=project_key
+    )
+    versions = {
+        issue.get("key"): (issue.get("fields") or {}).get("updated")
+        for issue in version_stream
+        if issue.get("key")
+    }
+    if version_stream.failed:
+        return None
+    return versions
+
+
+def sync_issues_by_keys(
+    jira_client,
+    mongo_client,
+    issue_keys,
+    sprint_info,
+    fields=None,
+    reporter=None,
+    with_progress=True,
+    checkpoint=None,
+    issue_store=None,
+    cached=None,
+):
+    """Lấy và xử lý các issues theo danh sách key (mỗi lần search tối đa 100 key)
 
-                    # Kiểm tra xem thời gian có nằm trong sprint không
-                    if sprint_start and sprint_end:
-                        if not (sprint_start <= history_date <= sprint_end):
-                            continue
-
-                    # Kiểm tra các thay đổi trạng thái
-                    items = history.get("items", [])
-                    status_changes = [
-                        item for item in items if item.get("field") == "status"
-                    ]
-
-                    if status_changes:
-                        for change in status_changes:
-                            status_changes_in_sprint.append(
-                                {
-                                    "date": history_date,
-                                    "status": change.get("toString", ""),
-                                    "history": history,
-                                }
-                            )
-                except Exception as e:
-                    print(f"Lỗi khi xử lý thời gian changelog: {str(e)}")
-                    continue
-
-    # Sắp xếp các thay đổi trạng thái theo thời gian giảm dần (mới nhất lên đầu)
-    if status_changes_in_sprint:
-        status_changes_in_sprint.sort(key=lambda x: x["date"], reverse=True)
-        # Lấy trạng thái mới nhất trong sprint
-        last_status = status_changes_in_sprint[0]["status"]
-        return last_status, last_status
-
-    return None, None
-
-
-def process_issue_details(jira_client, issue, sprint_info=None):
+    Args:
+        jira_client: Client kết nối đến Jira
+        mongo_client: Client kết nối đến MongoDB
+        issue_keys (iterable): Các issue key cần lấy
+        sprint_info (dict): Thông tin sprint
+        fields (list, optional): Các trường cần lấy thêm ngoài field profile "sync"
+        reporter (ProgressReporter, optional): Nơi nhận thông báo và tiến trình
+        with_progress (bool): Hiển thị tiến trình hay không
+        checkpoint (SyncCheckpoint, optional): Nơi lưu tạm issues đã xử lý theo lô
+        issue_store (IssueStore, optional): Kho lưu dữ liệu gốc để các sprint sau dùng lại
+        cached (list, optional): Issues gốc chưa thay đổi lấy từ kho, được xử lý lại
+            với khoảng thời gian của sprint này thay vì lấy từ Jira
+
+    Returns:
+        tuple: (danh sách issues đã xử lý, số issues không có quyền truy cập),
+            None nếu không lấy được đầy đủ dữ liệu từ Jira
+    """
+    if reporter is None:
+        reporter = get_default_reporter()
+
+    issues = []
+    no_access_count = 0
+    if cached:
+        # Trạng thái và thời gian trong sprint được tính lại từ changelog, worklog đã lưu
+        issues, no_access_count, failed_count = process_issue_stream(
+            jira_client,
+            mongo_client,
+            CachedIssueStream(cached),
+            sprint_info,
+            reporter,
+            with_progress,
+            checkpoint,
+        )
+        if failed_count:
+            return None
+
+    issue_keys = sorted(issue_keys)
+    for i in range(0, len(issue_keys), 100):
+        chunk = issue_keys[i : i + 100]
+        stream = jira_client.iter_search_issues(
+            f"key in ({','.join(chunk)})", fields=fields, profiles=["sync"]
+        )
+        chunk_issues, chunk_no_access, chunk_failed = process_issue_stream(
+            jira_client,
+            mongo_client,
+            stream,
+            sprint_info,
+            reporter,
+            with_progress,
+            checkpoint,
+            issue_store,
+        )
+        if stream.failed or chunk_failed:
+            return None
+        issues.extend(chunk_issues)
+        no_access_count += chunk_no_access
+    return issues, no_access_count
+
+
+def resume_sprint_sync(
+    jira_client,
+    mongo_client,
+    sprint_id,
+    project_key,
+    sprint_info,
+    staged_issues,
+    checkpoint,
+    fields=None,
+    reporter=None,
+    with_progress=True,
+    issue_store=None,
+):
+    """Tiếp tục lần đồng bộ toàn bộ bị ngắt: chỉ lấy các issues chưa được lưu tạm
+
+    Danh sách key được lấy lại từ Jira thay vì dựa vào vị trí trang, nên issues
+    được thêm vào hoặc bỏ khỏi sprint trong lúc bị ngắt không bị bỏ sót. Issues
+    đã lưu tạm nhưng thay đổi sau đó sẽ được lần đồng bộ tăng dần sau lấy lại,
+    vì mốc đồng bộ vẫn là thời điểm bắt đầu của checkpoint.
+
+    Args:
+        jira_client: Client kết nối đến Jira
+        mongo_client: Client kết nối đến MongoDB
+        sprint_id (int): ID của sprint
+        project_key (str): Mã dự án
+        sprint_info (dict): Thông tin sprint
+        staged_issues (list): Issues đã lưu tạm trong checkpoint
+        checkpoint (SyncCheckpoint): Checkpoint đang tiếp tục
+        fields (list, optional): Các trường cần lấy thêm ngoài field profile "sync"
+        reporter (ProgressReporter, optional): Nơi nhận thông báo và tiến trình
+        with_progress (bool): Hiển thị tiến trình hay không
+        issue_store (IssueStore, optional): Kho lưu dữ liệu gốc để các sprint sau dùng lại
+
+    Returns:
+        tuple: (danh sách issues của sprint, số issues không có quyền truy cập),
+            None nếu không lấy được đầy đủ dữ liệu từ Jira
+    """
+    current_keys = get_sprint_issue_keys(jira_client, sprint_id, project_key)
+    if current_keys is None:
+        return None
+
+    # Bỏ issues đã rời sprint, giữ thứ tự đã lưu tạm
+    issues = [issue for issue in staged_issues if issue.get("key") in current_keys]
+    staged_keys = {issue.get("key") for issue in issues}
+
+    result = sync_issues_by_keys(
+        jira_client,
+        mongo_client,
+        current_keys - staged_keys,
+        sprint_info,
+        fields,
+        reporter,
+        with_progress,
+        checkpoint,
+        issue_store,
+    )
+    if result is None:
+        return None
+    remaining, no_access_count = result
+    issues.extend(remaining)
+    return issues, no_access_count
+
+
+def process_issue_details(
+    jira_client, issue, sprint_info=None, changelog_data=None, reporter=None
+):
     """Xử lý chi tiết của issue
 
     Args:
         jira_client: Client kết nối đến Jira
         issue (dict): Dữ liệu issue
         sprint_info (dict, optional): Thông tin sprint
+        changelog_data (dict, optional): Changelog đã lấy sẵn. Nếu không có sẽ gọi API
+        reporter (ProgressReporter, optional): Nơi nhận thông báo lỗi
 
     Returns:
         dict: Issue đã được xử lý
     """
+    if reporter is None:
+        reporter = get_default_reporter()
+
     try:
         issue_key = issue.get("key")
 
-        # Lấy changelog từ API Jira với tham số expand=changelog
-        response = jira_client.get(f"issue/{issue_key}?expand=changelog")
-        changelog_data = response.json().get("changelog", {})
-
-        # Xác định khoảng thời gian của sprint nếu có
-        sprint_start = None
-        sprint_end = None
-        if sprint_info:
-            if sprint_info.get("startDate"):
-                sprint_start = datetime.fromisoformat(
-                    sprint_info.get("startDate").replace("Z", "+00:00")
-                )
-            if sprint_info.get("endDate"):
-                sprint_end = datetime.fromisoformat(
-                    sprint_info.get("endDate").replace("Z", "+00:00")
+        # Lấy changelog từ API Jira nếu chưa được truyền vào
+        if changelog_data is None:
+            changelog_data = jira_client.get_issue_changelog(issue_key)
+            if changelog_data is None:
+                # Hết số lần retry: vẫn xử lý các trường khác thay vì bỏ qua cả issue
+                reporter.warning(
+                    f"Không lấy được changelog cho issue {issue_key} sau khi thử lại"
                 )
+                changelog_data = {}
+
+        current_status = issue.get("fields", {}).get("status", {}).get("name", "N/A")
 
-        # Lấy trạng thái cuối cùng trong sprint
-        last_status_in_sprint, _ = get_last_status_in_sprint(
-            changelog_data, sprint_start, sprint_end
+        # Phân tích changelog một lần, process_issues_data dùng lại kết quả này
+        sprint_start, sprint_end = get_sprint_window(sprint_info)
+        analysis = analyze_changelog(
+            changelog_data,
+            sprint_start,
+            sprint_end,
+            created=issue.get("fields", {}).get("created"),
         )
+        issue["changelog_analysis"] = analysis
 
         # Nếu không có thay đổi trạng thái trong sprint, sử dụng trạng thái hiện tại
-        if not last_status_in_sprint:
-            current_status = (
-                issue.get("fields", {}).get("status", {}).get("name", "N/A")
-            )
-            issue["sprint_status"] = current_status
-        else:
-            issue["sprint_status"] = last_status_in_sprint
+        issue["sprint_status"] = analysis.last_status_in_sprint or current_status
 
         # Lưu trạng thái hiện tại vào issue để so sánh
-        issue["current_status"] = (
-            issue.get("fields", {}).get("status", {}).get("name", "N/A")
-        )
+        issue["current_status"] = current_status
 
-        # Tìm thời gian gần nhất khi issue chuyển sang trạng thái Dev Done và Test Done trong sprint
-        dev_done_date = None
-        test_done_date = None
-
-        if changelog_data and "histories" in changelog_data:
-            for history in changelog_data.get("histories", []):
-                created_date = history.get("created")
-
-                # Kiểm tra xem thời gian chuyển trạng thái có nằm trong khoảng thời gian của sprint không
-                history_in_sprint = True
-                history_date = None
-
-                if created_date and sprint_start and sprint_end:
-                    try:
-                        history_date = datetime.fromisoformat(
-                            created_date.replace("Z", "+00:00")
-                        )
-                        if history_date < sprint_start or history_date > sprint_end:
-                            history_in_sprint = False
-                    except Exception as e:
-                        print(f"Lỗi khi chuyển đổi thời gian: {str(e)}")
-
-                # Nếu không có thông tin sprint hoặc thời gian nằm trong sprint
-                if history_in_sprint:
-                    items = history.get("items", [])
-                    for item in items:
-                        if item.get("field") == "status":
-                            if item.get("toString") == "Dev Done":
-                                # Cập nhật dev_done_date nếu gần đây hơn
-                                if dev_done_date is None or (
-                                    history_date
-                                    and history_date
-                                    > datetime.fromisoformat(
-                                        dev_done_date.replace("Z", "+00:00")
-                                    )
-                                ):
-                                    dev_done_date = created_date
-
-                            if item.get("toString") == "Test Done":
-                                # Cập nhật test_done_date nếu gần đây hơn
-                                if test_done_date is None or (
-                                    history_date
-                                    and history_date
-                                    > datetime.fromisoformat(
-                                        test_done_date.replace("Z", "+00:00")
-                                    )
-                                ):
-                                    test_done_date = created_date
-
-        # Định dạng thời gian Dev Done nếu có
-        formatted_dev_done_date = ""
-        if dev_done_date:
-            try:
-                # Kiểm tra kiểu dữ liệu trước khi xử lý
-                if isinstance(dev_done_date, dict):
-                    # Nếu dev_done_date là một từ điển, thử lấy trường "toString" hoặc "name"
-                    if "toString" in dev_done_date:
-                        dev_done_date = dev_done_date.get("toString", "")
-                    elif "name" in dev_done_date:
-                        dev_done_date = dev_done_date.get("name", "")
-                    else:
-                        # Nếu không có trường hợp nào phù hợp, chuyển đổi thành chuỗi JSON
-                        dev_done_date = json.dumps(dev_done_date)
-                elif not isinstance(dev_done_date, str):
-                    dev_done_date = str(dev_done_date)
-
-                # Chỉ xử lý nếu dev_done_date là chuỗi và có định dạng ngày hợp lệ
-                if isinstance(dev_done_date, str) and (
-                    "T" in dev_done_date or ":" in dev_done_date
-                ):
-                    date_obj = datetime.fromisoformat(
-                        dev_done_date.replace("Z", "+00:00")
-                    )
-                    formatted_dev_done_date = date_obj.strftime("%d/%m/%Y %H:%M")
-                else:
-                    formatted_dev_done_date = str(dev_done_date)
-            except Exception as e:
-                print(f"Lỗi khi định dạng thời gian Dev Done: {str(e)}")
-                formatted_dev_done_date = str(dev_done_date)
-
-        # Định dạng thời gian Test Done nếu có
-        formatted_test_done_date = ""
-        if test_done_date:
-            try:
-                # Kiểm tra kiểu dữ liệu trước khi xử lý
-                if isinstance(test_done_date, dict):
-                    # Nếu test_done_date là một từ điển, thử lấy trường "toString" hoặc "name"
-                    if "toString" in test_done_date:
-                        test_done_date = test_done_date.get("toString", "")
-                    elif "name" in test_done_date:
-                        test_done_date = test_done_date.get("name", "")
-                    else:
-                        # Nếu không có trường hợp nào phù hợp, chuyển đổi thành chuỗi JSON
-                        test_done_date = json.dumps(test_done_date)
-                elif not isinstance(test_done_date, str):
-                    test_done_date = str(test_done_date)
-
-                # Chỉ xử lý nếu test_done_date là chuỗi và có định dạng ngày hợp lệ
-                if isinstance(test_done_date, str) and (
-                    "T" in test_done_date or ":" in test_done_date
-                ):
-                    date_obj = datetime.fromisoformat(
-                        test_done_date.replace("Z", "+00:00")
-                    )
-                    formatted_test_done_date = date_obj.strftime("%d/%m/%Y %H:%M")
-                else:
-                    formatted_test_done_date = str(test_done_date)
-            except Exception as e:
-                print(f"Lỗi khi định dạng thời gian Test Done: {str(e)}")
-                formatted_test_done_date = str(test_done_date)
+        # Thời gian gần nhất trong sprint khi issue chuyển sang Dev Done và Test Done
+        dev_done = analysis.last_transition_in_sprint(DEV_DONE_STATUSES)
+        test_done = analysis.last_transition_in_sprint(TEST_DONE_STATUSES)
+        formatted_dev_done_date = (
+            dev_done.date.strftime("%d/%m/%Y %H:%M") if dev_done else ""
+        )
+        formatted_test_done_date = (
+            test_done.date.strftime("%d/%m/%Y %H:%M") if test_done else ""
+        )
 
         # Thêm changelog và thời gian Test Done và Dev Done vào issue
         issue["changelog"] = changelog_data
@@ -477,10 +941,9 @@ def process_issue_details(jira_client, issue, sprint_info=None):
 
         return issue
     except Exception as e:
-        if is_running_in_streamlit():
-            st.error(
-                f"Lỗi khi xử lý thêm dữ liệu cho issue {issue.get('key')}: {str(e)}"
-            )
+        reporter.error(
+            f"Lỗi khi xử lý thêm dữ liệu cho issue {issue.get('key')}: {str(e)}"
+        )
         return issue
 
 
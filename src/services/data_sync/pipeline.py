@@ -0,0 +1,234 @@
+import queue
+import threading
+import time
+from src.config.config import SYNC_PIPELINE_QUEUE_SIZE
+from src.services.jira.metrics import bind_metrics_scope, get_metrics_registry
+from src.services.progress import propagate_script_context
+
+# Khoảng thời gian (giây) các thread kiểm tra lại yêu cầu dừng khi đang chờ hàng đợi
+POLL_SECONDS = 0.2
+
+# Đánh dấu bước trước đã xử lý xong toàn bộ dữ liệu
+_DONE = object()
+
+
+class _Stopped(Exception):
+    """Pipeline bị dừng (lỗi ở bước khác hoặc bên gọi ngừng đọc kết quả)"""
+
+
+class PipelineStage:
+    """Một bước của pipeline, chạy trong thread riêng
+
+    Hàm xử lý nhận một lô phần tử và trả về danh sách kết quả (có thể rỗng hoặc
+    nhiều hơn đầu vào). Lô gồm phần tử đầu tiên cùng các phần tử đã có sẵn trong
+    hàng đợi, tối đa batch_size, nên bước chậm hơn tự động xử lý theo lô lớn hơn.
+    """
+
+    def __init__(self, name, func, batch_size=1):
+        """Khởi tạo bước
+
+        Args:
+            name (str): Tên bước để ghi số liệu
+            func (callable): Hàm (list) -> list
+            batch_size (int): Số phần tử tối đa mỗi lần gọi func
+        """
+        self.name = name
+        self.func = func
+        self.batch_size = max(1, batch_size)
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.input_wait_seconds = 0.0
+        self.output_wait_seconds = 0.0
+
+
+class SyncPipeline:
+    """Pipeline nhiều bước nối với nhau bằng hàng đợi giới hạn kích thước
+
+    Nguồn dữ liệu (ví dụ: IssueStream) và mỗi bước chạy trong thread riêng, bước
+    cuối (sink) chạy trong thread gọi run() nên có thể gọi Streamlit. Hàng đợi
+    đầy sẽ chặn bước trước (backpressure), vì vậy bộ nhớ không tăng khi một bước
+    chậm và tổng thời gian tiến gần thời gian của bước chậm nhất.
+
+    Usage:
+        pipeline = SyncPipeline(stream, [PipelineStage("enrich", enrich)])
+        pipeline.run(lambda issue: save(issue))
+    """
+
+    def __init__(
+        self,
+        source,
+        stages,
+        queue_size=SYNC_PIPELINE_QUEUE_SIZE,
+        source_name="fetch",
+        sink_name="write",
+    ):
+        """Khởi tạo pipeline
+
+        Args:
+            source (iterable): Nguồn dữ liệu, được đọc trong thread riêng
+            stages (list): Các PipelineStage theo thứ tự
+            queue_size (int): Số phần tử tối đa trong mỗi hàng đợi
+            source_name (str): Tên bước đọc nguồn để ghi số liệu
+            sink_name (str): Tên bước cuối để ghi số liệu
+        """
+        self.source = source
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.source_stage = PipelineStage(source_name, None)
+        self.sink_stage = PipelineStage(sink_name, None)
+        self._stop = threading.Event()
+        self._error = None
+
+    def _get(self, q):
+        while True:
+            try:
+                return q.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _Stopped()
+
+    def _put(self, q, item):
+        while True:
+            try:
+                q.put(item, timeout=POLL_SECONDS)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Stopped()
+
+    def _fail(self, error):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _run_source(self, output):
+        stage = self.source_stage
+        try:
+            iterator = iter(self.source)
+            while True:
+                started = time.monotonic()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stage.busy_seconds += time.monotonic() - started
+                stage.items += 1
+
+                started = time.monotonic()
+                self._put(output, item)
+                stage.output_wait_seconds += time.monotonic() - started
+            self._put(output, _DONE)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            self._fail(e)
+
+    def _run_stage(self, stage, input_queue, output):
+        try:
+            done = False
+            while not done:
+                started = time.monotonic()
+                batch = [self._get(input_queue)]
+                stage.input_wait_seconds += time.monotonic() - started
+                if batch[0] is _DONE:
+                    break
+
+                # Gom thêm các phần tử đã có sẵn, không chờ
+                while len(batch) < stage.batch_size:
+                    try:
+                        item = input_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        done = True
+                        break
+                    batch.append(item)
+
+                started = time.monotonic()
+                results = stage.func(batch)
+                stage.busy_seconds += time.monotonic() - started
+                stage.items += len(batch)
+
+                started = time.monotonic()
+                for result in results:
+                    self._put(output, result)
+                stage.output_wait_seconds += time.monotonic() - started
+            self._put(output, _DONE)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            self._fail(e)
+
+    def run(self, sink):
+        """Chạy pipeline, gọi sink cho từng kết quả của bước cuối trong thread hiện tại
+
+        Args:
+            sink (callable): Hàm nhận từng kết quả (ví dụ: ghi MongoDB, cập nhật tiến trình)
+
+        Raises:
+            Exception: Lỗi đầu tiên xảy ra ở bất kỳ bước nào
+        """
+        queues = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+        threads = [
+            threading.Thread(
+                target=bind_metrics_scope(self._run_source),
+                args=(queues[0],),
+                name=f"pipeline-{self.source_stage.name}",
+                daemon=True,
+            )
+        ]
+        for i, stage in enumerate(self.stages):
+            threads.append(
+                threading.Thread(
+                    target=bind_metrics_scope(self._run_stage),
+                    args=(stage, queues[i], queues[i + 1]),
+                    name=f"pipeline-{stage.name}",
+                    daemon=True,
+                )
+            )
+        for thread in threads:
+            propagate_script_context(thread)
+            thread.start()
+
+        stage = self.sink_stage
+        output = queues[-1]
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    item = output.get(timeout=POLL_SECONDS)
+                except queue.Empty:
+                    stage.input_wait_seconds += time.monotonic() - started
+                    if self._stop.is_set():
+                        break
+                    continue
+                stage.input_wait_seconds += time.monotonic() - started
+                if item is _DONE or self._error is not None:
+                    break
+
+                started = time.monotonic()
+                sink(item)
+                stage.busy_seconds += time.monotonic() - started
+                stage.items += 1
+        finally:
+            # Dừng các bước còn lại nếu sink lỗi hoặc bị ngắt (ví dụ: Streamlit chạy lại script)
+            self._stop.set()
+
+        for thread in threads:
+            thread.join()
+        self._record_metrics()
+        if self._error is not None:
+            raise self._error
+
+    def _record_metrics(self):
+        registry = get_metrics_registry()
+        for stage in [self.source_stage, *self.stages, self.sink_stage]:
+            registry.record_stage(
+                stage.name,
+                stage.items,
+                stage.busy_seconds,
+                stage.input_wait_seconds,
+                stage.output_wait_seconds,
+            )
@@ -0,0 +1,493 @@
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pymongo
+from pymongo.errors import DuplicateKeyError
+
+from src.config.config import (
+    DEFAULT_PROJECT,
+    SCHEDULER_ACTIVE_INTERVAL_MINUTES,
+    SCHEDULER_FUTURE_INTERVAL_MINUTES,
+    SCHEDULER_MAX_WORKERS,
+    SCHEDULER_TICK_SECONDS,
+    SCHEDULER_SPRINT_REFRESH_MINUTES,
+    SCHEDULER_STALE_JOB_MINUTES,
+)
+from src.services.progress import LogProgressReporter
+
+logger = logging.getLogger("jirave.scheduler")
+
+# Trạng thái của một job đồng bộ sprint
+JOB_IDLE = "idle"  # Chờ tới lịch chạy tiếp theo
+JOB_QUEUED = "queued"  # Đã vào hàng đợi, chờ worker
+JOB_RUNNING = "running"
+JOB_FAILED = "failed"  # Lần chạy gần nhất thất bại, sẽ chạy lại theo lịch
+
+# Job đang chờ hoặc đang chạy không được đưa vào hàng đợi lần nữa
+ACTIVE_JOB_STATUSES = [JOB_QUEUED, JOB_RUNNING]
+
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+def get_schedule_interval(sprint_state):
+    """Lấy chu kỳ đồng bộ tự động theo trạng thái sprint
+
+    Args:
+        sprint_state (str): Trạng thái sprint (active, future, closed)
+
+    Returns:
+        int: Số phút giữa hai lần đồng bộ, None nếu không đồng bộ tự động
+    """
+    return {
+        "active": SCHEDULER_ACTIVE_INTERVAL_MINUTES,
+        "future": SCHEDULER_FUTURE_INTERVAL_MINUTES,
+    }.get(sprint_state)
+
+
+def get_job_id(sprint_id):
+    return f"sprint_{sprint_id}"
+
+
+class SyncJobStore:
+    """Hàng đợi job đồng bộ sprint lưu trong MongoDB
+
+    Mỗi sprint có đúng một document trong collection sync_jobs, vừa là lịch
+    đồng bộ vừa là job trong hàng đợi. Mọi chuyển trạng thái đều là một lệnh
+    update có điều kiện nên nhiều tiến trình (scheduler, trang Sync Data) có
+    thể dùng chung mà không tạo job trùng.
+    """
+
+    def __init__(self, db):
+        """Khởi tạo hàng đợi
+
+        Args:
+            db (pymongo.database.Database): Database MongoDB (MongoDBClient.db)
+        """
+        self.jobs = db["sync_jobs"]
+        self.meta = db["sync_scheduler"]
+        self.jobs.create_index(
+            [("status", pymongo.ASCENDING), ("queued_at", pymongo.ASCENDING)]
+        )
+        self.jobs.create_index(
+            [("status", pymongo.ASCENDING), ("next_run_at", pymongo.ASCENDING)]
+        )
+
+    def upsert_schedule(self, sprint, project_key=DEFAULT_PROJECT):
+        """Tạo hoặc cập nhật lịch đồng bộ của một sprint
+
+        Sprint vừa chuyển sang closed được đồng bộ thêm một lần cuối.
+
+        Args:
+            sprint (dict): Thông tin sprint từ Jira (id, name, state)
+            project_key (str): Mã dự án
+
+        Returns:
+            dict: Document của job
+        """
+        now = utc_now()
+        state = sprint.get("state")
+        interval = get_schedule_interval(state)
+        previous = self.jobs.find_one_and_update(
+            {"_id": get_job_id(sprint["id"])},
+            {
+                "$set": {
+                    "sprint_name": sprint.get("name", ""),
+                    "sprint_state": state,
+                    "project_key": project_key,
+                    "interval_minutes": interval,
+                },
+                "$setOnInsert": {
+                    "sprint_id": sprint["id"],
+                    "status": JOB_IDLE,
+                    "next_run_at": now if interval else None,
+                    "created_at": now,
+                },
+            },
+            upsert=True,
+            return_document=pymongo.ReturnDocument.BEFORE,
+        )
+
+        if previous is not None and previous.get("sprint_state") != state:
+            if state == "closed":
+                self.enqueue(sprint["id"], reason="closed")
+            elif interval:
+                # Sprint chuyển sang trạng thái có lịch: chạy ngay ở lần tick tới
+                self.jobs.update_one(
+                    {"_id": get_job_id(sprint["id"])}, {"$set": {"next_run_at": now}}
+                )
+        return self.get_job(sprint["id"])
+
+    def enqueue(self, sprint_id, incremental=True, reason="manual"):
+        """Đưa một sprint vào hàng đợi ngay lập tức
+
+        Args:
+            sprint_id (int): ID của sprint
+            incremental (bool): Chỉ lấy issues thay đổi từ lần đồng bộ trước
+            reason (str): Lý do (manual, schedule, closed) để hiển thị
+
+        Returns:
+            bool: True nếu đã đưa vào hàng đợi, False nếu sprint đang chờ hoặc đang chạy
+        """
+        now = utc_now()
+        try:
+            result = self.jobs.update_one(
+                {"_id": get_job_id(sprint_id), "status": {"$nin": ACTIVE_JOB_STATUSES}},
+                {
+                    "$set": {
+                        "status": JOB_QUEUED,
+                        "queued_at": now,
+                        "reason": reason,
+                        "incremental": incremental,
+                    },
+                    "$setOnInsert": {
+                        "sprint_id": sprint_id,
+                        "interval_minutes": None,
+                        "created_at": now,
+                    },
+                },
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            # Document đã tồn tại nhưng không khớp điều kiện: job đang chờ hoặc đang chạy
+            return False
+        return result.upserted_id is not None or result.modified_count > 0
+
+    def enqueue_due(self):
+        """Đưa các sprint đã tới lịch đồng bộ vào hàng đợi
+
+        Returns:
+            int: Số job được đưa vào hàng đợi
+        """
+        now = utc_now()
+        result = self.jobs.update_many(
+            {
+                "status": {"$in": [JOB_IDLE, JOB_FAILED]},
+                "interval_minutes": {"$ne": None},
+                "next_run_at": {"$lte": now},
+            },
+            {
+                "$set": {
+                    "status": JOB_QUEUED,
+                    "queued_at": now,
+                    "reason": "schedule",
+                    "incremental": True,
+                }
+            },
+        )
+        return result.modified_count
+
+    def claim(self, worker_id):
+        """Lấy job chờ lâu nhất và đánh dấu đang chạy
+
+        Args:
+            worker_id (str): Định danh tiến trình nhận job
+
+        Returns:
+            dict: Document của job, None nếu hàng đợi rỗng
+        """
+        now = utc_now()
+        return self.jobs.find_one_and_update(
+            {"status": JOB_QUEUED},
+            {
+                "$set": {
+                    "status": JOB_RUNNING,
+                    "started_at": now,
+                    "heartbeat_at": now,
+                    "worker": worker_id,
+                }
+            },
+            sort=[("queued_at", pymongo.ASCENDING)],
+            return_document=pymongo.ReturnDocument.AFTER,
+        )
+
+    def finish(self, job, issues_count=0, error=None):
+        """Ghi nhận kết quả của job và đặt lịch chạy tiếp theo
+
+        Args:
+            job (dict): Document của job đã claim
+            issues_count (int): Số issues đã đồng bộ
+            error (str, optional): Lỗi nếu job thất bại
+        """
+        now = utc_now()
+        # Đọc lại chu kỳ vì trạng thái sprint có thể đã thay đổi trong lúc chạy
+        current = self.jobs.find_one({"_id": job["_id"]}, {"interval_minutes": 1})
+        interval = (current or {}).get("interval_minutes")
+        started_at = job.get("started_at")
+        duration = None
+        if started_at:
+            duration = (now - started_at.replace(tzinfo=timezone.utc)).total_seconds()
+        self.jobs.update_one(
+            {"_id": job["_id"], "status": JOB_RUNNING},
+            {
+                "$set": {
+                    "status": JOB_FAILED if error else JOB_IDLE,
+                    "finished_at": now,
+                    "next_run_at": (
+                        now + timedelta(minutes=interval) if interval else None
+                    ),
+                    "last_result": {
+                        "issues": issues_count,
+                        "error": error,
+                        "reason": job.get("reason"),
+                        "duration_seconds": (
+                            round(duration, 3) if duration is not None else None
+                        ),
+                    },
+                }
+            },
+        )
+
+    def touch_running(self, worker_id, job_ids):
+        """Gia hạn các job mà tiến trình hiện tại đang chạy để không bị coi là kẹt
+
+        Args:
+            worker_id (str): Định danh tiến trình đã nhận job
+            job_ids (list): _id các job đang chạy
+        """
+        if not job_ids:
+            return
+        self.jobs.update_many(
+            {"_id": {"$in": list(job_ids)}, "status": JOB_RUNNING, "worker": worker_id},
+            {"$set": {"heartbeat_at": utc_now()}},
+        )
+
+    def requeue_stale(self, exclude=(), older_than_minutes=SCHEDULER_STALE_JOB_MINUTES):
+        """Đưa lại vào hàng đợi các job kẹt ở trạng thái running (tiến trình bị tắt giữa chừng)
+
+        Args:
+            exclude (list): _id các job mà tiến trình hiện tại vẫn đang chạy
+            older_than_minutes (int): Job không được gia hạn trong chừng này phút được
+                coi là bị kẹt
+
+        Returns:
+            int: Số job được đưa lại vào hàng đợi
+        """
+        stale_before = utc_now() - timedelta(minutes=older_than_minutes)
+        result = self.jobs.update_many(
+            {
+                "_id": {"$nin": list(exclude)},
+                "status": JOB_RUNNING,
+                "$or": [
+                    {"heartbeat_at": {"$lt": stale_before}},
+                    # Job được nhận trước khi có heartbeat_at
+                    {"heartbeat_at": None, "started_at": {"$lt": stale_before}},
+                ],
+            },
+            {"$set": {"status": JOB_QUEUED, "queued_at": utc_now(), "reason": "stale"}},
+        )
+        return result.modified_count
+
+    def heartbeat(self, worker_id, running_jobs, max_workers):
+        """Ghi trạng thái của tiến trình scheduler để giao diện hiển thị"""
+        self.meta.update_one(
+            {"_id": "scheduler"},
+            {
+                "$set": {
+                    "worker": worker_id,
+                    "heartbeat_at": utc_now(),
+                    "running_jobs": running_jobs,
+                    "max_workers": max_workers,
+                    "tick_seconds": SCHEDULER_TICK_SECONDS,
+                }
+            },
+            upsert=True,
+        )
+
+    def get_job(self, sprint_id):
+        return self.jobs.find_one({"_id": get_job_id(sprint_id)})
+
+    def get_status(self):
+        """Lấy trạng thái scheduler và toàn bộ job
+
+        Returns:
+            dict: {"scheduler": heartbeat hoặc None, "alive": bool, "jobs": danh sách job}
+        """
+        scheduler = self.meta.find_one({"_id": "scheduler"})
+        alive = False
+        if scheduler and scheduler.get("heartbeat_at"):
+            heartbeat_at = scheduler["heartbeat_at"].replace(tzinfo=timezone.utc)
+            # Coi là còn chạy nếu heartbeat trong vòng 3 chu kỳ tick
+            alive = utc_now() - heartbeat_at < timedelta(
+                seconds=3 * scheduler.get("tick_seconds", SCHEDULER_TICK_SECONDS)
+            )
+        jobs = list(
+            self.jobs.find().sort(
+                [("status", pymongo.DESCENDING), ("next_run_at", pymongo.ASCENDING)]
+            )
+        )
+        return {"scheduler": scheduler, "alive": alive, "jobs": jobs}
+
+
+def get_sync_status(mongo_client):
+    """Lấy trạng thái đồng bộ chạy nền để trang Sync Data hiển thị
+
+    Args:
+        mongo_client (MongoDBClient): Client MongoDB đã kết nối
+
+    Returns:
+        dict: Kết quả của SyncJobStore.get_status(), None nếu không kết nối được MongoDB
+    """
+    if not mongo_client.is_connected():
+        return None
+    return SyncJobStore(mongo_client.db).get_status()
+
+
+def enqueue_sprint_sync(mongo_client, sprint_id, incremental=True):
+    """Yêu cầu scheduler đồng bộ một sprint ngay
+
+    Args:
+        mongo_client (MongoDBClient): Client MongoDB đã kết nối
+        sprint_id (int): ID của sprint
+        incremental (bool): Chỉ lấy issues thay đổi từ lần đồng bộ trước
+
+    Returns:
+        bool: True nếu đã đưa vào hàng đợi, False nếu sprint đang chờ/đang chạy hoặc lỗi kết nối
+    """
+    if not mongo_client.is_connected():
+        return False
+    return SyncJobStore(mongo_client.db).enqueue(sprint_id, incremental=incremental)
+
+
+class SyncScheduler:
+    """Tiến trình chạy nền đồng bộ các sprint theo lịch
+
+    Mỗi chu kỳ tick: cập nhật danh sách sprint từ Jira (theo SCHEDULER_SPRINT_REFRESH_MINUTES),
+    đưa các sprint tới lịch vào hàng đợi rồi giao job cho tối đa max_workers thread.
+    """
+
+    def __init__(
+        self,
+        service=None,
+        project_keys=None,
+        max_workers=SCHEDULER_MAX_WORKERS,
+        tick_seconds=SCHEDULER_TICK_SECONDS,
+        reporter=None,
+    ):
+        """Khởi tạo scheduler
+
+        Args:
+            service (DataSyncService, optional): Dịch vụ đồng bộ dùng chung cho các worker
+            project_keys (list, optional): Các dự án cần đồng bộ, mặc định DEFAULT_PROJECT
+            max_workers (int): Số sprint được đồng bộ cùng lúc
+            tick_seconds (int): Khoảng thời gian giữa hai lần kiểm tra hàng đợi
+            reporter (ProgressReporter, optional): Nơi nhận thông báo, mặc định ghi ra logging
+        """
+        from src.services.data_sync.sync_service import DataSyncService
+
+        self.reporter = reporter or LogProgressReporter()
+        self.service = service or DataSyncService(reporter=self.reporter)
+        self.project_keys = project_keys or [DEFAULT_PROJECT]
+        self.max_workers = max(1, max_workers)
+        self.tick_seconds = tick_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.store = None
+        self._executor = None
+        self._running = {}  # job _id -> Future
+        self._stop_event = threading.Event()
+        self._last_refresh = None
+
+    def refresh_schedules(self):
+        """Lấy danh sách sprint từ Jira và cập nhật lịch đồng bộ"""
+        for project_key in self.project_keys:
+            sprints = self.service.sync_all_sprints(project_key, show_toast=False)
+            for sprint in sprints or []:
+                self.store.upsert_schedule(sprint, project_key)
+            logger.info(
+                f"Đã cập nhật lịch của {len(sprints or [])} sprints dự án {project_key}"
+            )
+        self._last_refresh = time.monotonic()
+
+    def _run_job(self, job):
+        sprint_id = job["sprint_id"]
+        logger.info(f"Bắt đầu đồng bộ sprint {sprint_id} ({job.get('reason')})")
+        try:
+            issue_count = self.service.sync_sprint_issues(
+                sprint_id,
+                with_progress=False,
+                incremental=job.get("incremental", True),
+            )
+            if issue_count is None:
+                logger.warning(f"Sprint {sprint_id}: không đồng bộ được issues")
+                self.store.finish(job, 0, "Không đồng bộ được issues")
+                return
+            # Sprint rỗng vẫn là một lần đồng bộ thành công với 0 issues
+            self.store.finish(job, issue_count)
+            logger.info(f"Sprint {sprint_id}: đã đồng bộ {issue_count} issues")
+        except Exception as e:
+            logger.exception(f"Lỗi khi đồng bộ sprint {sprint_id}")
+            self.store.finish(job, 0, str(e))
+
+    def _dispatch(self):
+        """Giao job trong hàng đợi cho các worker còn trống"""
+        for job_id, future in list(self._running.items()):
+            if future.done():
+                del self._running[job_id]
+
+        while len(self._running) < self.max_workers:
+            job = self.store.claim(self.worker_id)
+            if job is None:
+                break
+            self._running[job["_id"]] = self._executor.submit(self._run_job, job)
+
+    def tick(self):
+        """Thực hiện một chu kỳ của scheduler"""
+        # Gia hạn các job đang chạy trước các bước có thể chậm (gọi Jira)
+        self.store.touch_running(self.worker_id, list(self._running))
+        refresh_due = self._last_refresh is None or (
+            time.monotonic() - self._last_refresh
+            >= SCHEDULER_SPRINT_REFRESH_MINUTES * 60
+        )
+        if refresh_due:
+            try:
+                self.refresh_schedules()
+            except Exception:
+                logger.exception("Lỗi khi cập nhật danh sách sprint")
+
+        stale = self.store.requeue_stale(exclude=self._running)
+        if stale:
+            logger.warning(f"Đưa lại {stale} job bị kẹt vào hàng đợi")
+        queued = self.store.enqueue_due()
+        if queued:
+            logger.info(f"Đưa {queued} sprint tới lịch vào hàng đợi")
+        self._dispatch()
+        self.store.heartbeat(self.worker_id, list(self._running), self.max_workers)
+
+    def run_forever(self):
+        """Chạy scheduler cho tới khi stop() được gọi
+
+        Returns:
+            bool: False nếu không thể khởi động (không kết nối được MongoDB)
+        """
+        if not self.service.mongo_client.is_connected():
+            self.reporter.error("Không thể kết nối đến MongoDB, dừng scheduler")
+            return False
+
+        self.store = SyncJobStore(self.service.mongo_client.db)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="sync-worker"
+        )
+        logger.info(
+            f"Scheduler {self.worker_id} bắt đầu chạy (tối đa {self.max_workers} sprint cùng lúc)"
+        )
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self.tick()
+                except Exception:
+                    logger.exception("Lỗi trong chu kỳ scheduler")
+                self._stop_event.wait(self.tick_seconds)
+        finally:
+            logger.info("Scheduler đang dừng, chờ các job đang chạy hoàn tất")
+            self._executor.shutdown(wait=True)
+        return True
+
+    def stop(self):
+        """Yêu cầu scheduler dừng sau chu kỳ hiện tại"""
+        self._stop_event.set()
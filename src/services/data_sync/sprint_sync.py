@@ -1,43 +1,52 @@
-import streamlit as st
 from datetime import datetime
-from src.services.mongodb_client import is_running_in_streamlit
 from src.config.config import DEFAULT_PROJECT
+from src.services.progress import get_default_reporter
 
 
-def sync_all_sprints(jira_client, show_toast=True, project_key=DEFAULT_PROJECT):
+def sync_all_sprints(
+    jira_client, show_toast=True, project_key=DEFAULT_PROJECT, reporter=None
+):
     """Đồng bộ tất cả các sprints của dự án
 
     Args:
         jira_client: Client kết nối đến Jira
         show_toast (bool): Hiển thị thông báo hay không
         project_key (str): Mã dự án
+        reporter (ProgressReporter, optional): Nơi nhận thông báo
 
     Returns:
         list: Danh sách các sprints đã đồng bộ
     """
-    if show_toast and is_running_in_streamlit():
-        st.toast(f"Đang đồng bộ tất cả sprints của dự án {project_key}", icon="ℹ️")
+    if reporter is None:
+        reporter = get_default_reporter()
+
+    if show_toast:
+        reporter.toast(f"Đang đồng bộ tất cả sprints của dự án {project_key}", icon="ℹ️")
 
     sprints = jira_client.get_all_sprints(project_key)
 
-    if show_toast and is_running_in_streamlit():
-        st.toast(
+    if show_toast:
+        reporter.toast(
             f"Đã đồng bộ {len(sprints)} sprints của dự án {project_key}", icon="✅"
         )
 
     return sprints
 
 
-def get_sprint_info(jira_client, sprint_id):
+def get_sprint_info(jira_client, sprint_id, reporter=None):
     """Lấy thông tin sprint từ API Jira
 
     Args:
         jira_client: Client kết nối đến Jira
         sprint_id (int): ID của sprint
+        reporter (ProgressReporter, optional): Nơi nhận thông báo lỗi
 
     Returns:
         dict: Thông tin của sprint
     """
+    if reporter is None:
+        reporter = get_default_reporter()
+
     try:
         # Lấy thông tin sprint từ API Jira
         sprint_info = jira_client.sprint_client.get(
@@ -45,8 +54,7 @@ def get_sprint_info(jira_client, sprint_id):
         ).json()
         return sprint_info
     except Exception as e:
-        if is_running_in_streamlit():
-            st.error(f"Lỗi khi lấy thông tin sprint {sprint_id}: {str(e)}")
+        reporter.error(f"Lỗi khi lấy thông tin sprint {sprint_id}: {str(e)}")
         return None
 
 
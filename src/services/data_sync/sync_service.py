@@ -1,7 +1,8 @@
 import streamlit as st
 from src.services.jira_client import JiraClient
 from src.services.mongodb_client import MongoDBClient, is_running_in_streamlit
-from src.config.config import DEFAULT_PROJECT
+from src.config.config import DEFAULT_PROJECT, NUM_WORKERS
+from src.services.progress import get_default_reporter
 
 from src.services.data_sync.folder_manager import ensure_data_dirs, clear_local_data
 from src.services.data_sync.sprint_sync import (
@@ -16,16 +17,24 @@ from src.services.data_sync.issue_sync import (
     get_sprint_info_from_mongo,
     get_issues_from_mongo,
 )
+from src.services.data_sync.batch_sync import sync_sprints_issues
+from src.services.utils.changelog_analyzer import analyze_changelog
 
 
 class DataSyncService:
     """Dịch vụ đồng bộ dữ liệu từ Jira về MongoDB"""
 
-    def __init__(self):
-        """Khởi tạo dịch vụ đồng bộ dữ liệu"""
-        self.jira = JiraClient()
+    def __init__(self, reporter=None):
+        """Khởi tạo dịch vụ đồng bộ dữ liệu
+
+        Args:
+            reporter (ProgressReporter, optional): Nơi nhận thông báo và tiến trình.
+                Mặc định chọn theo môi trường (Streamlit hoặc logging)
+        """
+        self.reporter = reporter or get_default_reporter()
+        self.jira = JiraClient(reporter=self.reporter)
         ensure_data_dirs()
-        self.mongo_client = MongoDBClient()
+        self.mongo_client = MongoDBClient(reporter=self.reporter)
 
     def sync_all_sprints(self, project_key=DEFAULT_PROJECT, show_toast=True):
         """Đồng bộ tất cả các sprints của dự án
@@ -37,23 +46,48 @@ class DataSyncService:
         Returns:
             list: Danh sách các sprints đã đồng bộ
         """
-        return sync_all_sprints(self.jira, show_toast, project_key)
+        return sync_all_sprints(self.jira, show_toast, project_key, self.reporter)
 
-    def sync_sprint_issues(self, sprint_id, fields=None, with_progress=True):
+    def sync_sprint_issues(
+        self, sprint_id, fields=None, with_progress=True, incremental=False
+    ):
         """Đồng bộ issues của một sprint
 
         Args:
             sprint_id (int): ID của sprint
             fields (list, optional): Danh sách các trường cần lấy
             with_progress (bool): Hiển thị tiến trình hay không
+            incremental (bool): Chỉ lấy issues thay đổi từ lần đồng bộ trước
 
         Returns:
-            list: Danh sách issues đã đồng bộ
+            int: Số issues đã đồng bộ, None nếu đồng bộ thất bại
         """
         return sync_sprint_issues(
-            self.jira, self.mongo_client, sprint_id, None, fields, with_progress
+            self.jira,
+            self.mongo_client,
+            sprint_id,
+            None,
+            fields,
+            with_progress,
+            self.reporter,
+            incremental,
         )
 
+    def sync_sprints_issues(
+        self, sprint_ids, incremental=True, max_workers=NUM_WORKERS
+    ):
+        """Đồng bộ issues của nhiều sprint song song
+
+        Args:
+            sprint_ids (list): ID các sprint cần đồng bộ
+            incremental (bool): Chỉ lấy issues thay đổi từ lần đồng bộ trước
+            max_workers (int): Số sprint được đồng bộ cùng lúc
+
+        Returns:
+            dict: Mapping sprint ID -> số issues đã đồng bộ (0 nếu thất bại)
+        """
+        return sync_sprints_issues(sprint_ids, incremental, max_workers, self.reporter)
+
     def fix_missing_status(self, sprint_id):
         """Phương thức này đã bị vô hiệu hóa - chức năng cập nhật trạng thái không còn được hỗ trợ
 
@@ -63,8 +97,7 @@ class DataSyncService:
         Returns:
             tuple: (tổng số issue, 0, 0) - không còn thực hiện cập nhật
         """
-        if is_running_in_streamlit():
-            st.warning("Chức năng cập nhật trạng thái đã bị vô hiệu hóa")
+        self.reporter.warning("Chức năng cập nhật trạng thái đã bị vô hiệu hóa")
 
         # Trả về tuple (total_issues, fixed_issues, error_issues)
         return (0, 0, 0)
@@ -101,7 +134,7 @@ class DataSyncService:
         # Tạo cache trong session_state nếu chưa có
         cache_key = f"sprint_info_{sprint_id}"
         if cache_key not in st.session_state:
-            sprint_info = get_sprint_info(self.jira, sprint_id)
+            sprint_info = get_sprint_info(self.jira, sprint_id, self.reporter)
             if sprint_info:
                 st.session_state[cache_key] = sprint_info
             return sprint_info
@@ -124,17 +157,15 @@ class DataSyncService:
                 return mongo_issues
             else:
                 # Nếu không tìm thấy trong MongoDB, thông báo cần đồng bộ
-                if is_running_in_streamlit():
-                    st.warning(
-                        f"Không tìm thấy dữ liệu Sprint {sprint_id} trong MongoDB. Vui lòng đồng bộ lại."
-                    )
+                self.reporter.warning(
+                    f"Không tìm thấy dữ liệu Sprint {sprint_id} trong MongoDB. Vui lòng đồng bộ lại."
+                )
                 return []
         else:
             # Thông báo không thể kết nối MongoDB
-            if is_running_in_streamlit():
-                st.error(
-                    "Không thể kết nối đến MongoDB. Không có dữ liệu issues để hiển thị."
-                )
+            self.reporter.error(
+                "Không thể kết nối đến MongoDB. Không có dữ liệu issues để hiển thị."
+            )
             return []
 
     def clear_local_data(self):
@@ -152,8 +183,8 @@ class DataSyncService:
 
         result = clear_local_data(confirm_callback)
 
-        if result and is_running_in_streamlit():
-            st.toast("Đã xóa tất cả dữ liệu local", icon="✅")
+        if result:
+            self.reporter.toast("Đã xóa tất cả dữ liệu local", icon="✅")
 
         return result
 
@@ -170,11 +201,10 @@ class DataSyncService:
         try:
             # Lấy changelog từ API Jira
             response = self.jira.get(f"issue/{issue_key}?expand=changelog")
+            if response is None:
+                return None
             changelog_data = response.json().get("changelog", {})
 
-            # Lấy lịch sử thay đổi
-            histories = changelog_data.get("histories", [])
-
             # Danh sách các trạng thái thử tìm theo thứ tự ưu tiên
             statuses_to_check = [target_status]
 
@@ -182,25 +212,14 @@ class DataSyncService:
             if target_status == "Dev Done":
                 statuses_to_check.extend(["Test Done", "Deployed", "Done"])
 
-            # Tìm kiếm qua các trạng thái theo thứ tự
-            for status in statuses_to_check:
-                # Duyệt qua lịch sử thay đổi theo thứ tự từ mới nhất đến cũ nhất
-                for history in reversed(histories):
-                    created_date = history.get("created")
-                    items = history.get("items", [])
-
-                    # Tìm thay đổi trạng thái
-                    for item in items:
-                        if (
-                            item.get("field") == "status"
-                            and item.get("toString") == status
-                        ):
-                            return created_date
+            # Lần chuyển gần nhất sang trạng thái đầu tiên có trong changelog
+            change = analyze_changelog(changelog_data).last_transition(statuses_to_check)
+            if change:
+                return change.created
 
             return None
         except Exception as e:
-            if is_running_in_streamlit():
-                st.error(
-                    f"Lỗi khi lấy thời gian chuyển trạng thái cho issue {issue_key}: {str(e)}"
-                )
+            self.reporter.error(
+                f"Lỗi khi lấy thời gian chuyển trạng thái cho issue {issue_key}: {str(e)}"
+            )
             return None
@@ -0,0 +1,440 @@
+from pymongo import ASCENDING, DeleteMany, ReplaceOne, UpdateOne
+from src.services.bulk_writer import BulkWriter
+from src.services.sprint_aggregates import AGGREGATE_FIELDS
+from src.services.utils.issue_diff import IssueDiff, diff_issue_fields
+
+# Giá trị trường issue_storage của document sprint khi issues nằm trong collection issues
+NORMALIZED_STORAGE = "issues"
+
+# Số _id tối đa trong một thao tác xóa issues đã rời sprint
+DELETE_CHUNK_SIZE = 1000
+
+# Số issues mới được so sánh cùng lúc (một lần đọc các bản đã lưu tương ứng)
+COMPARE_BATCH_SIZE = 200
+
+# Các trường nội bộ của document issue, không trả về cho caller
+SPRINT_FIELD = "sprint_ref"
+POSITION_FIELD = "position"
+INTERNAL_FIELDS = ("_id", SPRINT_FIELD, POSITION_FIELD)
+
+
+def sprint_ref(sprint_id):
+    """Giá trị dùng để lọc issues theo sprint (cùng dạng với _id sprint_{id} của document sprint)"""
+    return str(sprint_id)
+
+
+def sprint_refs(sprint_ids):
+    """Giá trị lọc của nhiều sprint (nhận một ID hoặc danh sách ID)"""
+    if not isinstance(sprint_ids, (list, tuple, set)):
+        sprint_ids = [sprint_ids]
+    return [sprint_ref(sprint_id) for sprint_id in sprint_ids]
+
+
+def sprint_document_ids(sprint_ids):
+    """_id các document sprint trong collection data"""
+    return [f"sprint_{ref}" for ref in sprint_refs(sprint_ids)]
+
+
+def issue_projection(fields=None):
+    """Projection trả về các trường cần dùng (hoặc tất cả), không kèm trường nội bộ"""
+    if fields:
+        return {"_id": 0, **{field: 1 for field in fields}}
+    return {field: 0 for field in INTERNAL_FIELDS}
+
+
+def count_by_stages(field):
+    """Các bước aggregation đếm issues theo giá trị của một trường"""
+    return [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}]
+
+
+def embedded_issue_stages(sprint_ids, filters=None, fields=None):
+    """Các bước aggregation đọc issues nằm trong mảng issues của document sprint (định dạng cũ)
+
+    Args:
+        sprint_ids (list): ID các sprint
+        filters (dict, optional): Điều kiện lọc theo cú pháp query của MongoDB
+        fields (list, optional): Chỉ lấy các trường này, mặc định tất cả
+
+    Returns:
+        list: Pipeline chạy trên collection data
+    """
+    stages = [
+        {"$match": {"_id": {"$in": sprint_document_ids(sprint_ids)}}},
+        {"$project": {"issues": 1}},
+        {"$unwind": "$issues"},
+        {"$replaceRoot": {"newRoot": "$issues"}},
+    ]
+    if filters:
+        stages.append({"$match": filters})
+    if fields:
+        stages.append({"$project": issue_projection(fields)})
+    return stages
+
+
+def issue_document_id(sprint_id, key):
+    """_id của document issue: mỗi issue có một document cho từng sprint chứa nó"""
+    return f"{sprint_ref(sprint_id)}:{key}"
+
+
+def strip_internal_fields(document):
+    """Bỏ các trường nội bộ, trả về issue như khi được lưu"""
+    return {
+        field: value for field, value in document.items() if field not in INTERNAL_FIELDS
+    }
+
+
+class SprintIssueCollection:
+    """Issues đã xử lý của các sprint, mỗi issue của mỗi sprint là một document
+
+    Document sprint trong collection data chỉ giữ thông tin sprint (không còn mảng
+    issues), nên không bị giới hạn 16 MB khi sprint lớn và các trang chỉ đọc các
+    issues (và trường) cần dùng. Thứ tự issues trong sprint được giữ bằng trường
+    position.
+    """
+
+    def __init__(self, db):
+        """Khởi tạo collection và các index
+
+        Args:
+            db (pymongo.database.Database): Database MongoDB (MongoDBClient.db)
+        """
+        self.collection = db["issues"]
+        self.ensure_indexes()
+
+    def ensure_indexes(self):
+        """Tạo các index dùng cho đọc theo sprint và lọc theo assignee, status, dashboard"""
+        self.collection.create_index(
+            [(SPRINT_FIELD, ASCENDING), (POSITION_FIELD, ASCENDING)]
+        )
+        self.collection.create_index([(SPRINT_FIELD, ASCENDING), ("assignee", ASCENDING)])
+        self.collection.create_index([(SPRINT_FIELD, ASCENDING), ("status", ASCENDING)])
+        self.collection.create_index(
+            [(SPRINT_FIELD, ASCENDING), ("show_in_dashboard_final", ASCENDING)]
+        )
+        self.collection.create_index("key")
+
+    def count(self, sprint_id):
+        """Số issues đã lưu của sprint"""
+        return self.collection.count_documents({SPRINT_FIELD: sprint_ref(sprint_id)})
+
+    def find(self, sprint_id):
+        """Lấy issues của sprint theo thứ tự đã lưu
+
+        Args:
+            sprint_id (int | str): ID của sprint
+
+        Returns:
+            list: Danh sách issues (không kèm trường nội bộ)
+        """
+        documents = self.collection.find(
+            {SPRINT_FIELD: sprint_ref(sprint_id)},
+            {field: 0 for field in INTERNAL_FIELDS},
+        ).sort(POSITION_FIELD, ASCENDING)
+        return list(documents)
+
+    def _match(self, sprint_ids, filters=None):
+        return {**(filters or {}), SPRINT_FIELD: {"$in": sprint_refs(sprint_ids)}}
+
+    def query(self, sprint_ids, filters=None, fields=None, sort=None, limit=0):
+        """Tìm issues của một hoặc nhiều sprint, lọc và chọn trường phía MongoDB
+
+        Args:
+            sprint_ids (list): ID các sprint
+            filters (dict, optional): Điều kiện lọc theo cú pháp query của MongoDB
+            fields (list, optional): Chỉ lấy các trường này, mặc định tất cả
+            sort (list, optional): Danh sách (trường, 1 hoặc -1), mặc định theo thứ tự trong sprint
+            limit (int, optional): Số issues tối đa, 0 để lấy tất cả
+
+        Returns:
+            list: Danh sách issues (không kèm trường nội bộ)
+        """
+        cursor = self.collection.find(
+            self._match(sprint_ids, filters), issue_projection(fields)
+        )
+        cursor = cursor.sort(
+            sort or [(SPRINT_FIELD, ASCENDING), (POSITION_FIELD, ASCENDING)]
+        )
+        if limit:
+            cursor = cursor.limit(limit)
+        return list(cursor)
+
+    def count_by(self, sprint_ids, field, filters=None):
+        """Đếm issues theo giá trị của một trường bằng aggregation
+
+        Args:
+            sprint_ids (list): ID các sprint
+            field (str): Trường cần nhóm (ví dụ: status)
+            filters (dict, optional): Điều kiện lọc theo cú pháp query của MongoDB
+
+        Returns:
+            dict: Mapping giá trị của trường -> số issues
+        """
+        pipeline = [
+            {"$match": self._match(sprint_ids, filters)},
+            *count_by_stages(field),
+        ]
+        return {row["_id"]: row["count"] for row in self.collection.aggregate(pipeline)}
+
+    def open_writer(self, sprint_id, fields=None, compare=True, aggregates=None):
+        """Mở bộ ghi issues của sprint theo lô
+
+        Args:
+            sprint_id (int | str): ID của sprint
+            fields (list, optional): Chỉ lưu các trường này của mỗi issue
+            compare (bool): So sánh với issues đã lưu để chỉ ghi phần thay đổi
+            aggregates (SprintAggregateUpdater, optional): Cập nhật số liệu tổng hợp
+                của sprint theo các issues được ghi
+
+        Returns:
+            SprintIssueWriter: Bộ ghi, gọi finish() sau khi thêm hết issues
+        """
+        return SprintIssueWriter(self, sprint_id, fields, compare, aggregates)
+
+    def replace(self, sprint_id, issues):
+        """Ghi lại toàn bộ issues của sprint
+
+        Args:
+            sprint_id (int | str): ID của sprint
+            issues (list): Issues đã xử lý theo thứ tự trong sprint
+        """
+        self.delete(sprint_id)
+        writer = self.open_writer(sprint_id, compare=False)
+        for issue in issues:
+            writer.add(issue)
+        writer.finish()
+
+    def delete(self, sprint_id):
+        """Xóa toàn bộ issues đã lưu của sprint"""
+        self.collection.delete_many({SPRINT_FIELD: sprint_ref(sprint_id)})
+
+
+class SprintIssueWriter:
+    """Ghi issues của một sprint theo lô bulk_write khi từng issue được xử lý xong
+
+    Issues được thêm lần lượt (ví dụ từ bước transform của pipeline đồng bộ) và
+    được so sánh với bản đã lưu: issue mới được upsert, issue thay đổi chỉ
+    $set/$unset các trường khác, issue không đổi không được ghi. finish() xóa các
+    issues đã rời sprint. Các thao tác đều idempotent nên mỗi lô có thể gửi lại khi
+    gặp lỗi tạm thời; issue trùng key thì bản thêm sau cùng được giữ.
+
+    Bộ ghi chỉ giữ key của các issues đã lưu; bản đã lưu được đọc theo từng lô
+    COMPARE_BATCH_SIZE issues mới, nên bộ nhớ không tăng theo kích thước sprint.
+    """
+
+    def __init__(
+        self, issue_collection, sprint_id, fields=None, compare=True, aggregates=None
+    ):
+        """Khởi tạo bộ ghi
+
+        Args:
+            issue_collection (SprintIssueCollection): Collection issues
+            sprint_id (int | str): ID của sprint
+            fields (list, optional): Chỉ lưu các trường này của mỗi issue
+            compare (bool): So sánh với issues đã lưu để chỉ ghi phần thay đổi
+            aggregates (SprintAggregateUpdater, optional): Nhận các issues được
+                thêm và đã rời sprint để cập nhật số liệu tổng hợp
+        """
+        self.issue_collection = issue_collection
+        self.sprint_id = sprint_id
+        self.fields = fields
+        self.aggregates = aggregates
+        self.writer = BulkWriter(issue_collection.collection, ordered=True)
+        self.stored_keys = set()
+        if compare:
+            documents = issue_collection.collection.find(
+                {SPRINT_FIELD: sprint_ref(sprint_id)}, {"_id": 0, "key": 1}
+            )
+            self.stored_keys = {document.get("key") for document in documents}
+        if aggregates is not None:
+            aggregates.start(len(self.stored_keys) if compare else None)
+        # Issues đã thêm nhưng chưa được so sánh với bản đã lưu
+        self.pending = []
+        self.positions = {}
+        self.added = []
+        self.added_keys = set()
+        self.modified = {}
+        self.kept_count = 0
+
+    @property
+    def count(self):
+        """Số issues (khác key) đã thêm"""
+        return len(self.positions)
+
+    @property
+    def total(self):
+        """Số issues của sprint sau finish(), gồm cả issues đã lưu được giữ lại"""
+        return self.count + self.kept_count
+
+    @property
+    def batches(self):
+        """Số liệu của từng lô đã gửi"""
+        return self.writer.batches
+
+    def add(self, issue):
+        """Thêm một issue đã xử lý, theo thứ tự trong sprint
+
+        Args:
+            issue (dict): Issue đã xử lý
+        """
+        if self.fields is not None:
+            issue = {field: issue[field] for field in self.fields if field in issue}
+        self.positions.setdefault(issue.get("key"), len(self.positions))
+        self.pending.append(issue)
+        if len(self.pending) >= COMPARE_BATCH_SIZE:
+            self._compare_pending()
+
+    def flush(self):
+        """Gửi ngay các issues đã thêm (issues đã rời sprint chỉ bị xóa trong finish())"""
+        self._compare_pending()
+        self.writer.flush()
+
+    def _load_stored(self, keys, projection=None):
+        """Đọc các issues đã lưu theo key
+
+        Returns:
+            dict: Mapping issue key -> document đã lưu
+        """
+        keys = [key for key in keys if key in self.stored_keys]
+        if not keys:
+            return {}
+        ids = [issue_document_id(self.sprint_id, key) for key in keys]
+        documents = self.issue_collection.collection.find(
+            {"_id": {"$in": ids}}, projection or {"_id": 0}
+        )
+        return {document.get("key"): document for document in documents}
+
+    def _compare_pending(self):
+        """So sánh các issues đang chờ với bản đã lưu (một lần đọc) rồi đưa vào lô ghi"""
+        pending, self.pending = self.pending, []
+        stored = self._load_stored({issue.get("key") for issue in pending})
+        for issue in pending:
+            self._write(issue, stored.get(issue.get("key")))
+
+    def _write(self, issue, stored):
+        """Tạo thao tác ghi của một issue theo bản đã lưu (None nếu là issue mới)"""
+        key = issue.get("key")
+        position = self.positions[key]
+        document_id = issue_document_id(self.sprint_id, key)
+
+        if self.aggregates is not None:
+            self.aggregates.observe(key, stored, issue)
+        if stored is None:
+            document = {
+                **issue,
+                SPRINT_FIELD: sprint_ref(self.sprint_id),
+                POSITION_FIELD: position,
+            }
+            self.writer.add(
+                ReplaceOne({"_id": document_id}, document, upsert=True), document
+            )
+            if key not in self.added_keys:
+                self.added_keys.add(key)
+                self.added.append({"key": key})
+            return
+
+        changed, unset = diff_issue_fields(strip_internal_fields(stored), issue)
+        if changed or unset:
+            # Chỉ giữ tên trường để tóm tắt thay đổi, không giữ giá trị
+            self.modified[key] = (list(changed), unset)
+        update = {}
+        if stored.get(POSITION_FIELD) != position:
+            changed = {**changed, POSITION_FIELD: position}
+        if changed:
+            update["$set"] = changed
+        if unset:
+            update["$unset"] = {field: "" for field in unset}
+        if update:
+            self.writer.add(UpdateOne({"_id": document_id}, update), update)
+
+    def finish(self, delete_missing=True):
+        """Xóa issues đã rời sprint và gửi lô còn lại
+
+        Args:
+            delete_missing (bool): Xóa các issues đã lưu nhưng không được thêm lần này.
+                Nếu False, các issues này được giữ lại và xếp sau issues đã thêm
+
+        Returns:
+            IssueDiff: Thay đổi so với dữ liệu đã lưu
+        """
+        self._compare_pending()
+        missing = [key for key in self.stored_keys if key not in self.positions]
+        removed = missing if delete_missing else []
+        self.kept_count = 0 if delete_missing else len(missing)
+        # (vị trí đã lưu, key) của các issues được giữ lại
+        kept = []
+        if self.aggregates is not None or not delete_missing:
+            # Chỉ đọc các trường dùng để tính số liệu tổng hợp và vị trí của issues không được thêm
+            fields = AGGREGATE_FIELDS if self.aggregates is not None else ["key"]
+            projection = {**issue_projection(fields), POSITION_FIELD: 1}
+            for start in range(0, len(missing), DELETE_CHUNK_SIZE):
+                chunk = missing[start : start + DELETE_CHUNK_SIZE]
+                for key, stored in self._load_stored(chunk, projection).items():
+                    position = stored.pop(POSITION_FIELD, None)
+                    if delete_missing:
+                        self.aggregates.forget(key, stored)
+                        continue
+                    kept.append((position if position is not None else -1, key))
+                    if self.aggregates is not None:
+                        # Issue được giữ lại, không thay đổi
+                        self.aggregates.observe(key, stored, stored)
+        # Vị trí cũ của issues được giữ lại có thể trùng với issues vừa thêm: xếp lại
+        # các issues này sau issues đã thêm, theo thứ tự đã lưu
+        for position, (stored_position, key) in enumerate(sorted(kept), self.count):
+            if stored_position != position:
+                update = {"$set": {POSITION_FIELD: position}}
+                self.writer.add(
+                    UpdateOne({"_id": issue_document_id(self.sprint_id, key)}, update),
+                    update,
+                )
+        for start in range(0, len(removed), DELETE_CHUNK_SIZE):
+            ids = [
+                issue_document_id(self.sprint_id, key)
+                for key in removed[start : start + DELETE_CHUNK_SIZE]
+            ]
+            selector = {"_id": {"$in": ids}}
+            self.writer.add(DeleteMany(selector), selector)
+        self.writer.flush()
+        return IssueDiff(self.added, removed, self.modified)
+
+
+def migrate_embedded_issues(db, sprint_ids=None, reporter=None):
+    """Chuyển issues nằm trong mảng issues của document sprint sang collection issues
+
+    Document sprint được giữ lại (bỏ mảng issues) và đánh dấu issue_storage, nên
+    chạy lại nhiều lần không ảnh hưởng các sprint đã chuyển.
+
+    Args:
+        db (pymongo.database.Database): Database MongoDB (MongoDBClient.db)
+        sprint_ids (list, optional): Chỉ chuyển các sprint này, mặc định tất cả
+        reporter (ProgressReporter, optional): Nơi nhận thông báo tiến trình
+
+    Returns:
+        dict: Mapping _id document sprint -> số issues đã chuyển
+    """
+    data = db["data"]
+    issue_collection = SprintIssueCollection(db)
+    query = {"issues": {"$exists": True}}
+    if sprint_ids:
+        query["_id"] = {"$in": [f"sprint_{sprint_id}" for sprint_id in sprint_ids]}
+    else:
+        query["_id"] = {"$regex": "^sprint_"}
+
+    migrated = {}
+    for document_id in [document["_id"] for document in data.find(query, {"_id": 1})]:
+        document = data.find_one({"_id": document_id}, {"issues": 1})
+        issues = (document or {}).get("issues")
+        if not isinstance(issues, list):
+            continue
+        sprint_id = document_id[len("sprint_"):]
+        issue_collection.replace(sprint_id, issues)
+        data.update_one(
+            {"_id": document_id},
+            {
+                "$set": {"issue_storage": NORMALIZED_STORAGE, "total_issues": len(issues)},
+                "$unset": {"issues": ""},
+            },
+        )
+        migrated[document_id] = len(issues)
+        if reporter is not None:
+            reporter.info(f"Đã chuyển {len(issues)} issues của {document_id}")
+    return migrated
@@ -0,0 +1,549 @@
+import asyncio
+import logging
+import threading
+import time
+import httpx
+from urllib.parse import urlparse
+from src.config.config import (
+    API_TOKEN,
+    EMAIL,
+    JIRA_URL,
+    JIRA_POOL_MAXSIZE,
+    JIRA_CONNECT_TIMEOUT,
+    JIRA_READ_TIMEOUT,
+    JIRA_ASYNC_MAX_CONCURRENCY,
+)
+from src.services.jira.metrics import (
+    bind_metrics_scope,
+    get_metrics_registry,
+    get_response_size,
+)
+from src.services.jira.retry import (
+    classify_endpoint,
+    get_concurrency_limiter,
+    get_retry_policy,
+    get_token_bucket,
+)
+
+# Cùng logger với BaseJiraClient; request chạy trong thread của event loop nên không
+# gọi reporter (Streamlit), bên gọi nhận None và tự báo lỗi cho người dùng
+logger = logging.getLogger("jirave.jira")
+
+
+class AsyncJiraClient:
+    """Async counterpart of JiraClientFacade for running many independent requests concurrently
+
+    Usage:
+        async with AsyncJiraClient() as client:
+            worklogs = await client.get_issues_worklogs(["CLD-1", "CLD-2"])
+    """
+
+    def __init__(self, max_concurrency=JIRA_ASYNC_MAX_CONCURRENCY):
+        """Initialize the async client
+
+        Args:
+            max_concurrency (int, optional): Maximum number of in-flight requests
+        """
+        self.JIRA_URL = f"{JIRA_URL}/rest/api/3/"
+        self.AGILE_URL = f"{JIRA_URL}/rest/agile/1.0/"
+        self.max_concurrency = max_concurrency
+        self.client = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            auth=httpx.BasicAuth(EMAIL or "", API_TOKEN or ""),
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            timeout=httpx.Timeout(JIRA_READ_TIMEOUT, connect=JIRA_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=max(self.max_concurrency, JIRA_POOL_MAXSIZE),
+                max_keepalive_connections=JIRA_POOL_MAXSIZE,
+            ),
+        )
+        # Semaphore phải được tạo trong event loop đang chạy
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.aclose()
+        self.client = None
+
+    async def _request(self, method, url, endpoint_class="default", **kwargs):
+        """Send a request with bounded concurrency, rate limiting and retries
+
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+            endpoint_class (str): Endpoint class used to pick the retry policy
+            **kwargs: Extra arguments passed to httpx (params, json, ...)
+
+        Returns:
+            httpx.Response: The response from the API, None on error
+        """
+        async with self.semaphore:
+            # Chỉ tính thời gian từ khi có slot, không tính thời gian chờ semaphore
+            started = time.monotonic()
+            error_codes = []
+            response, retries = await self._send_with_retries(
+                method, url, endpoint_class, error_codes, **kwargs
+            )
+            get_metrics_registry().record(
+                method,
+                url,
+                time.monotonic() - started,
+                get_response_size(response),
+                retries,
+                error_codes,
+            )
+            return response
+
+    async def _send_with_retries(self, method, url, endpoint_class, error_codes, **kwargs):
+        """Retry loop of _request
+
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+            endpoint_class (str): Endpoint class used to pick the retry policy
+            error_codes (list): Receives the error code of every failed attempt
+            **kwargs: Extra arguments passed to httpx (params, json, ...)
+
+        Returns:
+            tuple: (response or None, number of retries)
+        """
+        policy = get_retry_policy(endpoint_class)
+        host = urlparse(url).netloc
+        bucket = get_token_bucket(host)
+        limiter = get_concurrency_limiter(host)
+        attempt = 0
+
+        while True:
+            wait = bucket.reserve()
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = bucket.reserve()
+
+            try:
+                async with limiter.async_slot():
+                    response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                error_codes.append("network")
+                if policy.retry_on_network_errors and attempt < policy.max_retries:
+                    delay = policy.backoff(attempt)
+                    logger.warning(
+                        f"Lỗi kết nối Jira ({str(e)}), thử lại sau {delay:.1f}s "
+                        f"({attempt + 1}/{policy.max_retries})"
+                    )
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+                logger.error(f"Error connecting to Jira API: {str(e)}")
+                return None, attempt
+
+            bucket.update_from_headers(response.headers)
+
+            if response.status_code >= 400:
+                error_codes.append(response.status_code)
+
+            if (
+                response.status_code in policy.retry_statuses
+                and attempt < policy.max_retries
+            ):
+                delay = policy.delay_for(response, attempt)
+                if response.status_code == 429:
+                    bucket.pause(delay)
+                logger.warning(
+                    f"Jira trả về {response.status_code} cho {method} {url}, "
+                    f"thử lại sau {delay:.1f}s ({attempt + 1}/{policy.max_retries})"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.status_code >= 400:
+                logger.error(
+                    f"Error connecting to Jira API: {response.status_code} "
+                    f"for {method} {url}"
+                )
+                return None, attempt
+            return response, attempt
+
+    async def get(self, endpoint, params=None, use_agile_api=False):
+        """Make a GET request to the Jira API
+
+        Args:
+            endpoint (str): The API endpoint to call
+            params (dict, optional): Query parameters for the request
+            use_agile_api (bool, optional): Whether to use the Agile API instead of the REST API
+
+        Returns:
+            httpx.Response: The response from the API, None on error
+        """
+        base_url = self.AGILE_URL if use_agile_api else self.JIRA_URL
+        return await self._request(
+            "GET",
+            f"{base_url}{endpoint}",
+            endpoint_class=classify_endpoint(endpoint, use_agile_api),
+            params=params,
+        )
+
+    async def search(self, jql, fields=None, max_results=100, start_at=0, expand=None):
+        """Fetch one page of a JQL search
+
+        Args:
+            jql (str): The JQL query string
+            fields (list, optional): List of fields to include in the response
+            max_results (int, optional): Page size
+            start_at (int, optional): Offset of the first issue
+            expand (str, optional): Comma separated expand options (e.g. 'changelog')
+
+        Returns:
+            dict: The raw search response (issues, total, ...), None on error
+        """
+        params = {"jql": jql, "maxResults": max_results, "startAt": start_at}
+        if fields:
+            params["fields"] = ",".join(fields)
+        if expand:
+            params["expand"] = expand
+
+        response = await self.get("search", params=params)
+        if response is not None:
+            return response.json()
+        return None
+
+    async def get_issue(self, issue_key, fields=None, expand=None):
+        """Get details for a specific issue
+
+        Args:
+            issue_key (str): The issue key (e.g., 'CLD-123')
+            fields (list, optional): List of fields to include
+            expand (str, optional): Comma separated expand options (e.g. 'changelog')
+
+        Returns:
+            dict: The issue data if successful, None otherwise
+        """
+        params = {}
+        if fields:
+            params["fields"] = ",".join(fields)
+        if expand:
+            params["expand"] = expand
+
+        response = await self.get(f"issue/{issue_key}", params=params or None)
+        if response is not None:
+            return response.json()
+        return None
+
+    async def get_issue_worklogs(self, issue_key):
+        """Get worklogs for a specific issue
+
+        Args:
+            issue_key (str): The issue key (e.g., 'CLD-123')
+
+        Returns:
+            list: The worklogs if successful, None if the request failed
+        """
+        response = await self.get(f"issue/{issue_key}/worklog")
+        if response is not None:
+            return response.json().get("worklogs", [])
+        return None
+
+    async def get_issues_worklogs(self, issue_keys):
+        """Get worklogs for many issues concurrently
+
+        Args:
+            issue_keys (list): Issue keys
+
+        Returns:
+            dict: Mapping issue key -> list of worklogs (None if the request failed)
+        """
+        results = await asyncio.gather(
+            *(self.get_issue_worklogs(key) for key in issue_keys)
+        )
+        return dict(zip(issue_keys, results))
+
+    async def get_issue_changelog(self, issue_key, page_size=100):
+        """Get the full changelog of an issue using the paginated changelog endpoint
+
+        Args:
+            issue_key (str): The issue key (e.g., 'CLD-123')
+            page_size (int, optional): Number of histories per page
+
+        Returns:
+            dict: Changelog in the same shape as expand=changelog ({"histories": [...], ...}),
+                None if the request failed
+        """
+        histories = []
+        start_at = 0
+        while True:
+            response = await self.get(
+                f"issue/{issue_key}/changelog",
+                params={"startAt": start_at, "maxResults": page_size},
+            )
+            if response is None:
+                return None
+
+            data = response.json()
+            values = data.get("values", [])
+            histories.extend(values)
+            start_at += len(values)
+
+            if data.get("isLast", True) or not values or start_at >= data.get("total", 0):
+                break
+
+        return {
+            "startAt": 0,
+            "maxResults": len(histories),
+            "total": len(histories),
+            "histories": histories,
+        }
+
+    async def get_issues_changelog(self, issue_keys):
+        """Get full changelogs for many issues concurrently
+
+        Args:
+            issue_keys (list): Issue keys
+
+        Returns:
+            dict: Mapping issue key -> changelog dict (None if the request failed)
+        """
+        results = await asyncio.gather(
+            *(self.get_issue_changelog(key) for key in issue_keys)
+        )
+        return dict(zip(issue_keys, results))
+
+    async def get_sprint_issues(self, sprint_id, fields=None, project_key=None, page_size=100):
+        """Get all issues in a sprint, fetching the remaining pages concurrently
+
+        Args:
+            sprint_id (int): ID của sprint
+            fields (list, optional): Danh sách các trường cần lấy
+            project_key (str, optional): Mã dự án cần lọc
+            page_size (int, optional): Số issues mỗi trang
+
+        Returns:
+            list: Danh sách issues
+        """
+        jql = f"sprint = {sprint_id}"
+        if project_key:
+            jql += f" AND project = {project_key}"
+
+        first_page = await self.search(jql, fields, max_results=page_size)
+        if not first_page:
+            return []
+
+        issues = first_page.get("issues", [])
+        total = first_page.get("total", 0)
+        page_size = first_page.get("maxResults") or page_size
+
+        pages = await asyncio.gather(
+            *(
+                self.search(jql, fields, max_results=page_size, start_at=start_at)
+                for start_at in range(len(issues), total, page_size)
+            )
+        )
+        for page in pages:
+            if page:
+                issues.extend(page.get("issues", []))
+        return issues
+
+    async def get_project_boards(self, project_key):
+        """Get all boards for a project
+
+        Args:
+            project_key (str): The project key
+
+        Returns:
+            list: List of boards
+        """
+        response = await self.get(
+            "board", params={"projectKeyOrId": project_key}, use_agile_api=True
+        )
+        if response is not None:
+            return response.json().get("values", [])
+        return []
+
+    async def get_board_sprints(self, board_id, state=None):
+        """Get all sprints in a board
+
+        Args:
+            board_id (int): The board ID
+            state (str, optional): Filter by sprint state (active, future, closed)
+
+        Returns:
+            list: List of sprints
+        """
+        params = {"state": state} if state else None
+        response = await self.get(
+            f"board/{board_id}/sprint", params=params, use_agile_api=True
+        )
+        if response is not None:
+            return response.json().get("values", [])
+        return []
+
+    async def get_all_sprints(self, project_key):
+        """Get all sprints for a project, querying every board concurrently
+
+        Args:
+            project_key (str): The project key
+
+        Returns:
+            list: List of sprints
+        """
+        boards = await self.get_project_boards(project_key)
+        results = await asyncio.gather(
+            *(self.get_board_sprints(board["id"]) for board in boards)
+        )
+        return [sprint for sprints in results for sprint in sprints]
+
+
+def run_async(coro):
+    """Run a coroutine from synchronous code (Streamlit scripts, worker threads)
+
+    Uses asyncio.run when no event loop is running in the current thread,
+    otherwise runs the coroutine in a helper thread with its own loop.
+
+    Args:
+        coro: The coroutine to run
+
+    Returns:
+        The coroutine result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def runner():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=bind_metrics_scope(runner))
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+class AsyncJiraRuntime:
+    """Long-lived event loop thread shared by the synchronous helpers
+
+    The loop owns one AsyncJiraClient (and its httpx connection pool) per
+    concurrency level, so repeated helper calls reuse open connections instead
+    of creating a new loop and pool every time.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.clients = {}
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="jira-async", daemon=True
+        )
+        self.thread.start()
+
+    async def _get_client(self, max_concurrency):
+        # Chỉ chạy trong thread của event loop nên không cần khóa
+        client = self.clients.get(max_concurrency)
+        if client is None:
+            client = await AsyncJiraClient(max_concurrency).__aenter__()
+            self.clients[max_concurrency] = client
+        return client
+
+    async def _call(self, func, max_concurrency):
+        client = await self._get_client(max_concurrency)
+        return await func(client)
+
+    def run(self, func, max_concurrency=JIRA_ASYNC_MAX_CONCURRENCY):
+        """Run an async function with the shared client and wait for its result
+
+        Args:
+            func (callable): Async function taking an AsyncJiraClient
+            max_concurrency (int, optional): Maximum number of in-flight requests
+
+        Returns:
+            The result of func
+        """
+        if threading.current_thread() is self.thread:
+            raise RuntimeError("AsyncJiraRuntime.run cannot be called from its own loop")
+        # Task được tạo trong bản sao context của thread gọi, nên số liệu vẫn
+        # được ghi vào scope của lần đồng bộ đang chạy
+        future = asyncio.run_coroutine_threadsafe(
+            self._call(func, max_concurrency), self.loop
+        )
+        return future.result()
+
+    def close(self):
+        """Close all pooled connections and stop the event loop"""
+
+        async def _close():
+            for client in self.clients.values():
+                await client.__aexit__(None, None, None)
+            self.clients = {}
+
+        asyncio.run_coroutine_threadsafe(_close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_async_runtime():
+    """Get the process-wide async runtime (lazily started, thread-safe)
+
+    Returns:
+        AsyncJiraRuntime: The shared runtime
+    """
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = AsyncJiraRuntime()
+    return _runtime
+
+
+def reset_async_runtime():
+    """Close and drop the current async runtime (e.g. when credentials change)"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is not None:
+            _runtime.close()
+        _runtime = None
+
+
+def fetch_issues_worklogs(issue_keys, max_concurrency=JIRA_ASYNC_MAX_CONCURRENCY):
+    """Synchronous helper: fetch worklogs of many issues concurrently
+
+    Args:
+        issue_keys (list): Issue keys
+        max_concurrency (int, optional): Maximum number of in-flight requests
+
+    Returns:
+        dict: Mapping issue key -> list of worklogs (None if the request failed)
+    """
+    return get_async_runtime().run(
+        lambda client: client.get_issues_worklogs(issue_keys), max_concurrency
+    )
+
+
+def fetch_issues_changelog(issue_keys, max_concurrency=JIRA_ASYNC_MAX_CONCURRENCY):
+    """Synchronous helper: fetch changelogs of many issues concurrently
+
+    Args:
+        issue_keys (list): Issue keys
+        max_concurrency (int, optional): Maximum number of in-flight requests
+
+    Returns:
+        dict: Mapping issue key -> changelog dict (None if the request failed)
+    """
+    return get_async_runtime().run(
+        lambda client: client.get_issues_changelog(issue_keys), max_concurrency
+    )
@@ -1,48 +1,263 @@
+import logging
+import time
 import requests
-from requests.auth import HTTPBasicAuth
-import streamlit as st
+from urllib.parse import urlparse
 from src.config.config import API_TOKEN, EMAIL, JIRA_URL
+from src.services.jira.transport import get_transport
+from src.services.jira.http_cache import get_cache_ttl, get_response_cache
+from src.services.jira.streaming import IssueStream
+from src.services.jira.metrics import get_metrics_registry, get_response_size
+from src.services.jira.pagination import get_page_sizer
+from src.services.progress import get_default_reporter
+from src.services.jira.retry import (
+    classify_endpoint,
+    get_concurrency_limiter,
+    get_retry_policy,
+    get_token_bucket,
+)
+
+logger = logging.getLogger("jirave.jira")
 
 
 class BaseJiraClient:
     """Base client for interacting with the Jira REST API"""
 
-    def __init__(self):
-        """Initialize the Jira client with authentication details"""
+    def __init__(self, transport=None, cache=None, reporter=None):
+        """Initialize the Jira client with authentication details
+
+        Args:
+            transport (JiraTransport, optional): Shared HTTP transport. Defaults to the
+                process-wide pooled transport.
+            cache (ResponseCache, optional): Response cache for metadata endpoints.
+                Defaults to the process-wide on-disk cache.
+            reporter (ProgressReporter, optional): Receiver for notifications and errors.
+                Defaults to Streamlit inside a Streamlit session, logging otherwise.
+        """
         self.API_TOKEN = API_TOKEN
         self.EMAIL = EMAIL
         self.JIRA_URL = f"{JIRA_URL}/rest/api/3/"
         self.AGILE_URL = f"{JIRA_URL}/rest/agile/1.0/"
-        self.auth = HTTPBasicAuth(self.EMAIL, self.API_TOKEN)
-        self.headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
+        self.transport = transport or get_transport()
+        self.cache = cache or get_response_cache()
+        self.reporter = reporter or get_default_reporter()
+        self.metrics = get_metrics_registry()
+        self.auth = self.transport.session.auth
+        # Bản sao: sửa headers của một client không ảnh hưởng tới session dùng chung
+        self.headers = dict(self.transport.session.headers)
+
+    def _request(self, method, url, endpoint_class="default", **kwargs):
+        """Send a request through the shared transport with rate limiting and retries
+
+        Transient failures (429, 5xx, network errors) are retried with jittered
+        exponential backoff, honoring Retry-After and X-RateLimit-* headers.
+        Every request is recorded in the Jira API metrics registry.
+
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+            endpoint_class (str): Endpoint class used to pick the retry policy
+            **kwargs: Extra arguments passed to requests (params, json, ...)
+
+        Returns:
+            requests.Response: The response from the API, None on error
+        """
+        started = time.monotonic()
+        error_codes = []
+        response, retries = self._send_with_retries(
+            method, url, endpoint_class, error_codes, **kwargs
+        )
+        self.metrics.record(
+            method,
+            url,
+            time.monotonic() - started,
+            get_response_size(response),
+            retries,
+            error_codes,
+        )
+        return response
+
+    def _send_with_retries(self, method, url, endpoint_class, error_codes, **kwargs):
+        """Retry loop of _request
+
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+            endpoint_class (str): Endpoint class used to pick the retry policy
+            error_codes (list): Receives the error code of every failed attempt
+            **kwargs: Extra arguments passed to requests (params, json, ...)
+
+        Returns:
+            tuple: (response or None, number of retries)
+        """
+        policy = get_retry_policy(endpoint_class)
+        host = urlparse(url).netloc
+        bucket = get_token_bucket(host)
+        limiter = get_concurrency_limiter(host)
+        attempt = 0
+
+        while True:
+            bucket.acquire()
+            try:
+                with limiter.slot():
+                    response = self.transport.request(method, url, **kwargs)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                error_codes.append("network")
+                if policy.retry_on_network_errors and attempt < policy.max_retries:
+                    delay = policy.backoff(attempt)
+                    logger.warning(
+                        f"Lỗi kết nối Jira ({str(e)}), thử lại sau {delay:.1f}s "
+                        f"({attempt + 1}/{policy.max_retries})"
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                self.reporter.error(f"Error connecting to Jira API: {str(e)}")
+                return None, attempt
+            except requests.exceptions.RequestException as e:
+                error_codes.append("network")
+                self.reporter.error(f"Error connecting to Jira API: {str(e)}")
+                return None, attempt
+
+            bucket.update_from_headers(response.headers)
+
+            if response.status_code >= 400:
+                error_codes.append(response.status_code)
+
+            if (
+                response.status_code in policy.retry_statuses
+                and attempt < policy.max_retries
+            ):
+                delay = policy.delay_for(response, attempt)
+                if response.status_code == 429:
+                    # Dừng tất cả các request tới host, không chỉ request hiện tại
+                    bucket.pause(delay)
+                response.close()  # Trả kết nối về pool (cần thiết với stream=True)
+                logger.warning(
+                    f"Jira trả về {response.status_code} cho {method} {url}, "
+                    f"thử lại sau {delay:.1f}s ({attempt + 1}/{policy.max_retries})"
+                )
+                time.sleep(delay)
+                attempt += 1
+                continue
 
-    def get(self, endpoint, params=None, use_agile_api=False):
+            try:
+                response.raise_for_status()  # Raise exception for 4XX/5XX responses
+                return response, attempt
+            except requests.exceptions.RequestException as e:
+                self.reporter.error(f"Error connecting to Jira API: {str(e)}")
+                return None, attempt
+
+    def get(
+        self, endpoint, params=None, use_agile_api=False, use_cache=True, stream=False
+    ):
         """Make a GET request to the Jira API
 
+        Slow-changing metadata endpoints (fields, projects, boards, sprints) are served
+        from the on-disk response cache while fresh, and revalidated with
+        ETag/Last-Modified once their TTL expires.
+
         Args:
             endpoint (str): The API endpoint to call
             params (dict, optional): Query parameters for the request
             use_agile_api (bool, optional): Whether to use the Agile API instead of the REST API
+            use_cache (bool, optional): Whether the response cache may be used
+            stream (bool, optional): Leave the body unread so it can be decoded incrementally.
+                Streamed responses are never cached.
 
         Returns:
             requests.Response: The response from the API
         """
-        try:
-            base_url = self.AGILE_URL if use_agile_api else self.JIRA_URL
-            response = requests.get(
-                f"{base_url}{endpoint}",
-                headers=self.headers,
-                auth=self.auth,
-                params=params,
+        base_url = self.AGILE_URL if use_agile_api else self.JIRA_URL
+        url = f"{base_url}{endpoint}"
+        endpoint_class = classify_endpoint(endpoint, use_agile_api)
+
+        ttl = get_cache_ttl(endpoint, use_agile_api) if use_cache and not stream else None
+        if ttl is None or self.cache is None:
+            return self._request(
+                "GET", url, endpoint_class=endpoint_class, params=params, stream=stream
             )
-            response.raise_for_status()  # Raise exception for 4XX/5XX responses
+
+        cache_key = self.cache.make_key(url, params)
+        entry = self.cache.get(cache_key)
+        if entry is not None and entry.is_fresh(ttl):
+            self.metrics.record_cache_hit("GET", url)
+            return entry.to_response()
+
+        # Hết hạn: gửi request có điều kiện để server trả về 304 nếu dữ liệu không đổi
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = self._request(
+            "GET",
+            url,
+            endpoint_class=endpoint_class,
+            params=params,
+            headers=headers or None,
+        )
+
+        if response is None:
+            # Jira không phản hồi: dùng tạm dữ liệu cũ nếu có
+            return entry.to_response() if entry is not None else None
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(cache_key)
+            return entry.to_response()
+        if response.status_code == 200:
+            self.cache.put(cache_key, response)
+        return response
+
+    def stream_search(
+        self,
+        jql,
+        fields=None,
+        expand=None,
+        max_issues=-1,
+        page_size=None,
+        profiles=None,
+        prefetch=1,
+    ):
+        """Search issues page by page, decoding each page incrementally
+
+        Args:
+            jql (str): The JQL query string
+            fields (list, optional): List of fields to include in the response
+            expand (str, optional): Comma separated expand options (e.g. 'changelog')
+            max_issues (int, optional): Maximum number of issues, -1 for all
+            page_size (int, optional): Fixed number of issues per page. By default the
+                page size adapts to the field set (see pagination.AdaptivePageSizer)
+            profiles (list, optional): Field profile names, used to label page size metrics
+            prefetch (int, optional): Number of pages fetched ahead concurrently once the
+                total is known, 1 to read pages sequentially
+
+        Returns:
+            IssueStream: Iterable yielding one issue dict at a time
+        """
+
+        def open_page(start_at, max_results):
+            params = {"jql": jql, "maxResults": max_results, "startAt": start_at}
+            if fields:
+                params["fields"] = ",".join(fields)
+            if expand:
+                params["expand"] = expand
+            response = self.get("search", params=params, stream=True)
+            if not response or response.status_code != 200:
+                return None
             return response
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error connecting to Jira API: {str(e)}")
-            return None
+
+        if page_size is None:
+            sizer = get_page_sizer(fields, expand, profiles)
+            return IssueStream(
+                open_page, max_issues=max_issues, sizer=sizer, prefetch=prefetch
+            )
+        return IssueStream(
+            open_page, page_size=page_size, max_issues=max_issues, prefetch=prefetch
+        )
 
     def post(self, endpoint, payload):
         """Make a POST request to the Jira API
@@ -54,18 +269,9 @@ class BaseJiraClient:
         Returns:
             requests.Response: The response from the API
         """
-        try:
-            response = requests.post(
-                f"{self.JIRA_URL}{endpoint}",
-                json=payload,
-                headers=self.headers,
-                auth=self.auth,
-            )
-            response.raise_for_status()  # Raise exception for 4XX/5XX responses
-            return response
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error connecting to Jira API: {str(e)}")
-            return None
+        return self._request(
+            "POST", f"{self.JIRA_URL}{endpoint}", endpoint_class="write", json=payload
+        )
 
     def put(self, endpoint, payload):
         """Make a PUT request to the Jira API
@@ -77,18 +283,9 @@ class BaseJiraClient:
         Returns:
             requests.Response: The response from the API
         """
-        try:
-            response = requests.put(
-                f"{self.JIRA_URL}{endpoint}",
-                json=payload,
-                headers=self.headers,
-                auth=self.auth,
-            )
-            response.raise_for_status()  # Raise exception for 4XX/5XX responses
-            return response
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error connecting to Jira API: {str(e)}")
-            return None
+        return self._request(
+            "PUT", f"{self.JIRA_URL}{endpoint}", endpoint_class="write", json=payload
+        )
 
     def _make_request(self, endpoint):
         """Make a simple GET request to the Jira API
@@ -1,4 +1,3 @@
-import streamlit as st
 from src.services.jira.base_client import BaseJiraClient
 
 
@@ -15,25 +14,26 @@ class CustomFieldClient(BaseJiraClient):
         if response and response.status_code == 200:
             # Hiển thị thông tin gỡ lỗi
             all_fields = response.json()
-            st.info(f"Tổng số trường: {len(all_fields)}")
+            self.reporter.info(f"Tổng số trường: {len(all_fields)}")
 
             # Lọc chỉ lấy các custom field
             custom_fields = [
                 field for field in all_fields if field.get("custom", False)
             ]
-            st.info(f"Số trường tùy chỉnh: {len(custom_fields)}")
+            self.reporter.info(f"Số trường tùy chỉnh: {len(custom_fields)}")
 
             # Hiển thị một số trường đầu tiên để kiểm tra
             if all_fields and len(all_fields) > 0:
-                st.subheader("Mẫu dữ liệu trường:")
-                st.json(all_fields[0])
+                self.reporter.show_data("Mẫu dữ liệu trường:", all_fields[0])
 
             return custom_fields
         else:
             if response:
-                st.error(f"Lỗi khi gọi API: {response.status_code} - {response.text}")
+                self.reporter.error(
+                    f"Lỗi khi gọi API: {response.status_code} - {response.text}"
+                )
             else:
-                st.error("Không nhận được phản hồi từ API")
+                self.reporter.error("Không nhận được phản hồi từ API")
             return []
 
     def get_field_details(self, field_id):
@@ -0,0 +1,176 @@
+class FieldProfile:
+    """Danh sách trường và expand mà một nơi sử dụng dữ liệu Jira thực sự cần"""
+
+    def __init__(self, name, fields, expand=None, description=""):
+        """Khởi tạo field profile
+
+        Args:
+            name (str): Tên profile
+            fields (list): Các trường Jira cần lấy
+            expand (list, optional): Các phần mở rộng cần lấy (ví dụ: changelog)
+            description (str, optional): Mô tả nơi sử dụng profile
+        """
+        self.name = name
+        self.fields = list(fields)
+        self.expand = list(expand or [])
+        self.description = description
+
+
+FIELD_PROFILES = {}
+
+
+def register_field_profile(name, fields, expand=None, description=""):
+    """Đăng ký (hoặc ghi đè) một field profile
+
+    Args:
+        name (str): Tên profile
+        fields (list): Các trường Jira cần lấy
+        expand (list, optional): Các phần mở rộng cần lấy
+        description (str, optional): Mô tả nơi sử dụng profile
+
+    Returns:
+        FieldProfile: Profile đã đăng ký
+    """
+    profile = FieldProfile(name, fields, expand, description)
+    FIELD_PROFILES[name] = profile
+    return profile
+
+
+def get_field_profile(name):
+    """Lấy field profile theo tên
+
+    Args:
+        name (str): Tên profile
+
+    Returns:
+        FieldProfile: Profile tương ứng
+
+    Raises:
+        KeyError: Nếu profile chưa được đăng ký
+    """
+    if name not in FIELD_PROFILES:
+        raise KeyError(f"Field profile chưa được đăng ký: {name}")
+    return FIELD_PROFILES[name]
+
+
+def _merge_unique(*groups):
+    """Gộp các danh sách, giữ thứ tự xuất hiện và bỏ phần tử trùng"""
+    merged = []
+    for group in groups:
+        for item in group or []:
+            if item and item not in merged:
+                merged.append(item)
+    return merged
+
+
+def resolve_request_fields(fields=None, expand=None, profiles=None):
+    """Tính tập trường và expand tối thiểu cho một request
+
+    Args:
+        fields (list, optional): Các trường được yêu cầu trực tiếp
+        expand (str | list, optional): Expand được yêu cầu trực tiếp
+        profiles (list, optional): Tên các field profile cần đáp ứng
+
+    Returns:
+        tuple: (fields, expand) - danh sách trường (None nếu không có) và chuỗi expand (None nếu không có)
+    """
+    if isinstance(expand, str):
+        expand = [e.strip() for e in expand.split(",")]
+
+    profile_objects = [get_field_profile(name) for name in profiles or []]
+    merged_fields = _merge_unique(fields, *(p.fields for p in profile_objects))
+    merged_expand = _merge_unique(expand, *(p.expand for p in profile_objects))
+
+    return (merged_fields or None, ",".join(merged_expand) or None)
+
+
+# Đồng bộ sprint vào MongoDB: chỉ các trường mà process_issues_data sử dụng
+register_field_profile(
+    "sync",
+    [
+        "summary",
+        "status",
+        "assignee",
+        "issuetype",
+        "priority",
+        "created",
+        "updated",
+        "customfield_10160",  # Show in Dashboard
+        "customfield_10130",  # Popup
+        "customfield_10159",  # Steve Estimate
+        "subtasks",  # Thông tin về sub-tasks
+        "parent",  # Thông tin về parent nếu là sub-task
+        "duedate",  # Ngày đến hạn
+        "resolutiondate",  # Ngày hoàn thành
+        "timeoriginalestimate",  # Thời gian ước tính ban đầu
+        "timeestimate",  # Thời gian ước tính còn lại
+        "timespent",  # Thời gian đã dùng
+        "worklog",  # Nhật ký công việc (tính thời gian trong sprint)
+        "customfield_10092",  # Customer
+        "customfield_10132",  # Feature
+        "customfield_10031",  # Tester
+        "development",  # Thông tin phát triển có thể chứa commit
+    ],
+    expand=["changelog"],  # Thời gian chuyển trạng thái trong sprint
+    description="Đồng bộ issues của sprint vào MongoDB",
+)
+
+register_field_profile(
+    "issue_warning",
+    [
+        "summary",
+        "issuetype",
+        "priority",
+        "assignee",
+        "status",
+        "duedate",
+        "created",
+        "updated",
+        "subtasks",
+        "timeestimate",
+        "timeoriginalestimate",
+        "worklog",
+    ],
+    description="Trang Issue Warning",
+)
+
+register_field_profile(
+    "sprint_plan",
+    [
+        "summary",
+        "issuetype",
+        "priority",
+        "assignee",
+        "status",
+        "customfield_10016",  # Story Points
+        "timeoriginalestimate",
+        "timeestimate",
+        "timespent",
+        "created",
+        "subtasks",
+    ],
+    description="Trang Sprint Plan",
+)
+
+register_field_profile(
+    "steve_est",
+    [
+        "summary",
+        "issuetype",
+        "timeoriginalestimate",
+        "timeestimate",
+        "timespent",
+        "customfield_10159",  # Steve Estimate
+        "subtasks",
+        "status",
+        "assignee",
+    ],
+    description="Trang Steve Est",
+)
+
+# Worklog chi tiết được lấy riêng qua issue/{key}/worklog nên không cần trường worklog
+register_field_profile(
+    "worklog_report",
+    ["summary", "assignee"],
+    description="Báo cáo worklog (app.py)",
+)
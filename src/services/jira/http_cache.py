@@ -0,0 +1,271 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+from src.config.config import (
+    EMAIL,
+    JIRA_HTTP_CACHE_ENABLED,
+    JIRA_HTTP_CACHE_DIR,
+    JIRA_HTTP_CACHE_MAX_BYTES,
+)
+
+logger = logging.getLogger("jirave.jira")
+
+# TTL (giây) cho từng endpoint metadata: (regex của endpoint, dùng Agile API, ttl)
+CACHE_RULES = [
+    (re.compile(r"^field$"), False, 24 * 3600),
+    (re.compile(r"^field/[^/]+$"), False, 24 * 3600),
+    (re.compile(r"^project$"), False, 3600),
+    (re.compile(r"^project/[^/]+/statuses$"), False, 3600),
+    (re.compile(r"^board$"), True, 3600),
+    (re.compile(r"^board/\d+$"), True, 3600),
+    # Trạng thái sprint thay đổi (future -> active -> closed) nên TTL ngắn hơn
+    (re.compile(r"^board/\d+/sprint$"), True, 300),
+    (re.compile(r"^sprint/\d+$"), True, 300),
+]
+
+
+def get_cache_ttl(endpoint, use_agile_api=False):
+    """Lấy TTL cache của một endpoint
+
+    Args:
+        endpoint (str): Endpoint của API (có thể kèm query string)
+        use_agile_api (bool): Endpoint thuộc Agile API hay không
+
+    Returns:
+        int: TTL tính bằng giây, hoặc None nếu endpoint không được cache
+    """
+    path = endpoint.split("?", 1)[0].strip("/")
+    for pattern, agile, ttl in CACHE_RULES:
+        if agile == use_agile_api and pattern.match(path):
+            return ttl
+    return None
+
+
+class CacheEntry:
+    """Một response đã được lưu trong cache"""
+
+    def __init__(self, url, body, headers, stored_at):
+        self.url = url
+        self.body = body
+        self.headers = headers
+        self.stored_at = stored_at
+
+    @property
+    def etag(self):
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        return self.headers.get("Last-Modified")
+
+    def is_fresh(self, ttl):
+        """Kiểm tra entry còn trong thời hạn TTL hay không"""
+        return time.time() - self.stored_at < ttl
+
+    def to_response(self):
+        """Tạo lại requests.Response từ entry để caller dùng như response thật
+
+        Returns:
+            requests.Response: Response với status 200
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = "utf-8"
+        response._content = self.body.encode("utf-8")
+        return response
+
+
+class ResponseCache:
+    """Cache response GET của Jira trên đĩa, giới hạn dung lượng theo LRU (thread-safe)
+
+    Mỗi entry được lưu thành một file JSON; thời điểm truy cập gần nhất được
+    ghi vào mtime của file để có thể loại bỏ các entry ít dùng nhất. Dung lượng
+    cache được theo dõi trong bộ nhớ, thư mục chỉ được quét khi cần loại bỏ entry.
+    """
+
+    def __init__(self, cache_dir=JIRA_HTTP_CACHE_DIR, max_bytes=JIRA_HTTP_CACHE_MAX_BYTES):
+        """Khởi tạo cache
+
+        Args:
+            cache_dir (str): Thư mục lưu cache
+            max_bytes (int): Dung lượng tối đa của cache
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # Dung lượng hiện tại, đọc từ thư mục ở lần ghi đầu tiên
+        self.total_bytes = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, url, params=None):
+        """Tạo khóa cache từ URL, tham số và người dùng hiện tại"""
+        raw = json.dumps(
+            {"user": EMAIL, "url": url, "params": params or {}},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Đọc entry từ cache
+
+        Args:
+            key (str): Khóa cache
+
+        Returns:
+            CacheEntry: Entry nếu có, None nếu không có hoặc file hỏng
+        """
+        path = self._path(key)
+        with self.lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                os.utime(path, None)  # Đánh dấu vừa được sử dụng (LRU)
+            except (OSError, ValueError):
+                return None
+        return CacheEntry(
+            data.get("url", ""),
+            data.get("body", ""),
+            data.get("headers", {}),
+            data.get("stored_at", 0),
+        )
+
+    def put(self, key, response):
+        """Lưu response vào cache
+
+        Args:
+            key (str): Khóa cache
+            response (requests.Response): Response 200 từ Jira
+        """
+        headers = {
+            name: response.headers[name]
+            for name in ("ETag", "Last-Modified", "Content-Type")
+            if name in response.headers
+        }
+        data = {
+            "url": response.url,
+            "headers": headers,
+            "stored_at": time.time(),
+            "body": response.text,
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self.lock:
+            old_size = self._size(path)
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning("Không thể ghi cache HTTP: %s", e)
+                return
+            if self.total_bytes is None:
+                self.total_bytes = self._scan()[1]
+            else:
+                self.total_bytes += self._size(path) - old_size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, key):
+        """Làm mới thời điểm lưu của entry sau khi server xác nhận 304 Not Modified"""
+        path = self._path(key)
+        with self.lock:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                data["stored_at"] = time.time()
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def _size(path):
+        """Kích thước file, 0 nếu file không tồn tại"""
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def _scan(self):
+        """Quét thư mục cache
+
+        Returns:
+            tuple: (danh sách (mtime, kích thước, đường dẫn) của các entry, tổng dung lượng)
+        """
+        files = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        return files, total
+
+    def _evict(self):
+        """Xóa các entry ít được dùng nhất cho đến khi dung lượng nằm trong giới hạn"""
+        # Quét lại thư mục vì các process khác có thể dùng chung cache
+        files, total = self._scan()
+        self.total_bytes = total
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(files):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.total_bytes = total
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Xóa toàn bộ cache"""
+        with self.lock:
+            for name in os.listdir(self.cache_dir):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+            self.total_bytes = None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Lấy cache HTTP dùng chung cho toàn bộ process
+
+    Returns:
+        ResponseCache: Cache dùng chung, hoặc None nếu cache bị tắt
+    """
+    global _cache
+    if not JIRA_HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = ResponseCache()
+                except OSError as e:
+                    logger.warning("Không thể khởi tạo cache HTTP: %s", e)
+                    return None
+    return _cache
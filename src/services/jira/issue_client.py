@@ -1,5 +1,6 @@
 import streamlit as st
 from src.services.jira.base_client import BaseJiraClient
+from src.services.jira.field_profiles import resolve_request_fields
 
 
 class IssueClient(BaseJiraClient):
@@ -29,26 +30,80 @@ class IssueClient(BaseJiraClient):
             return response.json()
         return None
 
-    def search_issues(self, jql, fields=None, max_results=1000):
+    def get_issue_changelog(self, issue_key, page_size=100):
+        """Get the full changelog of an issue using the paginated changelog endpoint
+
+        Args:
+            issue_key (str): The issue key (e.g., 'CLD-123')
+            page_size (int, optional): Number of histories per page
+
+        Returns:
+            dict: Changelog in the same shape as expand=changelog ({"histories": [...], ...}),
+                None if the request failed
+        """
+        histories = []
+        start_at = 0
+        while True:
+            response = self.get(
+                f"issue/{issue_key}/changelog",
+                params={"startAt": start_at, "maxResults": page_size},
+            )
+            if not response or response.status_code != 200:
+                return None
+
+            data = response.json()
+            values = data.get("values", [])
+            histories.extend(values)
+            start_at += len(values)
+
+            if data.get("isLast", True) or not values or start_at >= data.get("total", 0):
+                break
+
+        return {
+            "startAt": 0,
+            "maxResults": len(histories),
+            "total": len(histories),
+            "histories": histories,
+        }
+
+    def search_issues(self, jql, fields=None, max_results=1000, profiles=None):
         """Search for issues using JQL
 
+        Jira caps maxResults per request, so results are fetched page by page
+        (page size adapted to the field set) until max_results issues are read.
+
         Args:
             jql (str): The JQL query string
             fields (list, optional): List of fields to include in the response
-            max_results (int, optional): Maximum number of results to return
+            max_results (int, optional): Maximum number of results to return, -1 for all
+            profiles (list, optional): Field profile names; fields and expands are merged
 
         Returns:
-            list: The matching issues if successful, empty list otherwise
+            list: The matching issues (those read before an error if a page failed)
         """
-        if fields is None:
-            fields = ["summary", "status", "assignee"]
+        return list(self.iter_search_issues(jql, fields, max_results, profiles))
 
-        params = {"jql": jql, "fields": ",".join(fields), "maxResults": max_results}
+    def iter_search_issues(self, jql, fields=None, max_results=-1, profiles=None):
+        """Search for issues using JQL, yielding issues one at a time
 
-        response = self.get("search", params=params)
-        if response and response.status_code == 200:
-            return response.json().get("issues", [])
-        return []
+        Pages are fetched sequentially and decoded incrementally, so memory use
+        does not grow with the number of matching issues.
+
+        Args:
+            jql (str): The JQL query string
+            fields (list, optional): List of fields to include in the response
+            max_results (int, optional): Maximum number of results, -1 for all
+            profiles (list, optional): Field profile names; fields and expands are merged
+
+        Returns:
+            IssueStream: Iterable yielding one issue dict at a time
+        """
+        if fields is None and not profiles:
+            fields = ["summary", "status", "assignee"]
+        fields, expand = resolve_request_fields(fields, None, profiles)
+        return self.stream_search(
+            jql, fields, expand, max_issues=max_results, profiles=profiles
+        )
 
     def get_issue_types(self, project_key):
         """Get all issue types for a project
@@ -1,26 +1,40 @@
 import streamlit as st
+from src.config.config import JIRA_PAGE_FANOUT
 from src.services.jira.issue_client import IssueClient
 from src.services.jira.worklog_client import WorklogClient
 from src.services.jira.project_client import ProjectClient
 from src.services.jira.sprint_client import SprintClient
 from src.services.jira.custom_field_client import CustomFieldClient
+from src.services.jira.transport import get_transport
+from src.services.progress import get_default_reporter
 
 
 class JiraClientFacade:
     """Facade for all specialized Jira clients to maintain compatibility with existing code"""
 
-    def __init__(self):
-        """Initialize all specialized clients"""
-        self.issue_client = IssueClient()
-        self.worklog_client = WorklogClient()
-        self.project_client = ProjectClient()
-        self.sprint_client = SprintClient()
-        self.custom_field_client = CustomFieldClient()
+    def __init__(self, transport=None, reporter=None):
+        """Initialize all specialized clients
+
+        Args:
+            transport (JiraTransport, optional): Shared HTTP transport. All specialized
+                clients reuse the same pooled session and auth.
+            reporter (ProgressReporter, optional): Receiver for notifications and progress,
+                shared by all specialized clients.
+        """
+        self.transport = transport or get_transport()
+        self.reporter = reporter or get_default_reporter()
+        self.issue_client = IssueClient(self.transport, reporter=self.reporter)
+        self.worklog_client = WorklogClient(self.transport, reporter=self.reporter)
+        self.project_client = ProjectClient(self.transport, reporter=self.reporter)
+        self.sprint_client = SprintClient(self.transport, reporter=self.reporter)
+        self.custom_field_client = CustomFieldClient(
+            self.transport, reporter=self.reporter
+        )
 
     # Base methods delegate
-    def get(self, endpoint, params=None, use_agile_api=False):
+    def get(self, endpoint, params=None, use_agile_api=False, use_cache=True):
         """Delegate to base client method"""
-        return self.issue_client.get(endpoint, params, use_agile_api)
+        return self.issue_client.get(endpoint, params, use_agile_api, use_cache)
 
     def post(self, endpoint, payload):
         """Delegate to base client method"""
@@ -39,9 +53,17 @@ class JiraClientFacade:
         """Delegate to issue client"""
         return self.issue_client.get_issue(issue_key, custom_field_ids)
 
-    def search_issues(self, jql, fields=None, max_results=1000):
+    def get_issue_changelog(self, issue_key):
+        """Delegate to issue client"""
+        return self.issue_client.get_issue_changelog(issue_key)
+
+    def search_issues(self, jql, fields=None, max_results=1000, profiles=None):
         """Delegate to issue client"""
-        return self.issue_client.search_issues(jql, fields, max_results)
+        return self.issue_client.search_issues(jql, fields, max_results, profiles)
+
+    def iter_search_issues(self, jql, fields=None, max_results=-1, profiles=None):
+        """Delegate to issue client"""
+        return self.issue_client.iter_search_issues(jql, fields, max_results, profiles)
 
     def get_issue_types(self, project_key):
         """Delegate to issue client"""
@@ -81,7 +103,15 @@ class JiraClientFacade:
         return self.sprint_client.get_board_sprints(board_id, state)
 
     def get_sprint_issues(
-        self, sprint_id, fields=None, status_names=None, max_issues=1000, project_key=None
+        self,
+        sprint_id,
+        fields=None,
+        status_names=None,
+        max_issues=1000,
+        project_key=None,
+        fanout=JIRA_PAGE_FANOUT,
+        expand=None,
+        profiles=None,
     ):
         """Delegate to sprint client
 
@@ -92,12 +122,49 @@ class JiraClientFacade:
             max_issues (int, optional): Số lượng issues tối đa cần lấy, mặc định 1000
                                         Nếu max_issues=-1, sẽ lấy tất cả issues
             project_key (str, optional): Mã dự án cần lọc
+            fanout (int, optional): Số trang được lấy đồng thời
+            expand (str, optional): Các phần mở rộng cần lấy kèm mỗi issue (ví dụ: 'changelog')
+            profiles (list, optional): Tên các field profile; trường và expand được gộp tối thiểu
 
         Returns:
             list: Danh sách issues
         """
         return self.sprint_client.get_sprint_issues(
-            sprint_id, fields, status_names, max_issues, project_key
+            sprint_id,
+            fields,
+            status_names,
+            max_issues,
+            project_key,
+            fanout,
+            expand,
+            profiles,
+        )
+
+    def iter_sprint_issues(
+        self,
+        sprint_id,
+        fields=None,
+        status_names=None,
+        max_issues=-1,
+        project_key=None,
+        expand=None,
+        profiles=None,
+        updated_within=None,
+        page_size=None,
+        fanout=1,
+    ):
+        """Delegate to sprint client (stream từng issue thay vì trả về cả danh sách)"""
+        return self.sprint_client.iter_sprint_issues(
+            sprint_id,
+            fields,
+            status_names,
+            max_issues,
+            project_key,
+            expand,
+            profiles,
+            updated_within,
+            page_size,
+            fanout,
         )
 
     def get_sprint_report(self, board_id, sprint_id):
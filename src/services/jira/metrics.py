@@ -0,0 +1,617 @@
+import contextvars
+import functools
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Số mẫu latency gần nhất được giữ cho mỗi endpoint để tính percentile
+LATENCY_SAMPLE_SIZE = 2000
+
+# Các mốc (giây) của histogram latency khi xuất theo định dạng Prometheus
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_ISSUE_KEY_RE = re.compile(r"^[A-Z][A-Z0-9_]*-\d+$")
+_API_PREFIXES = (("/rest/agile/1.0/", "agile:"), ("/rest/api/3/", ""))
+
+# Các scope đang mở trong ngữ cảnh hiện tại (thread hoặc task asyncio), scope ngoài cùng đứng đầu
+_active_scopes = contextvars.ContextVar("jirave_metrics_scopes", default=())
+
+
+def endpoint_template(endpoint):
+    """Chuẩn hóa endpoint thành template để gom số liệu (ví dụ: issue/CLD-1/worklog -> issue/{key}/worklog)
+
+    Args:
+        endpoint (str): Endpoint hoặc URL đầy đủ của Jira API
+
+    Returns:
+        str: Template của endpoint, endpoint Agile có tiền tố "agile:"
+    """
+    path = endpoint.split("?", 1)[0]
+    prefix = ""
+    for marker, label in _API_PREFIXES:
+        if marker in path:
+            path = path.split(marker, 1)[1]
+            prefix = label
+            break
+
+    segments = []
+    for segment in path.strip("/").split("/"):
+        if segment.isdigit():
+            segments.append("{id}")
+        elif _ISSUE_KEY_RE.match(segment):
+            segments.append("{key}")
+        else:
+            segments.append(segment)
+    return prefix + "/".join(segments)
+
+
+def get_response_size(response):
+    """Lấy số byte của response (dùng Content-Length nếu body chưa được đọc)
+
+    Args:
+        response: requests.Response hoặc httpx.Response, có thể None
+
+    Returns:
+        int: Số byte, 0 nếu không xác định được
+    """
+    if response is None:
+        return 0
+    content = getattr(response, "_content", None)
+    if isinstance(content, bytes):
+        return len(content)
+    try:
+        return int(response.headers.get("Content-Length", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _percentile(sorted_values, percent):
+    """Tính percentile (nearest-rank) của danh sách đã sắp xếp"""
+    if not sorted_values:
+        return 0.0
+    rank = int(round(percent / 100 * len(sorted_values)))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class EndpointStats:
+    """Số liệu của một cặp (method, endpoint template)"""
+
+    def __init__(self):
+        self.count = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.errors = {}  # Mã lỗi (status code hoặc "network") -> số lần
+        self.samples = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def add(self, seconds, bytes_received, retries, error_codes):
+        self.count += 1
+        self.retries += retries
+        self.bytes_received += bytes_received
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.samples.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+        for code in error_codes:
+            self.errors[code] = self.errors.get(code, 0) + 1
+
+    def to_dict(self):
+        samples = sorted(self.samples)
+        return {
+            "count": self.count,
+            "cache_hits": self.cache_hits,
+            "retries": self.retries,
+            "errors": dict(self.errors),
+            "bytes_received": self.bytes_received,
+            "total_seconds": round(self.total_seconds, 3),
+            "avg_seconds": (
+                round(self.total_seconds / self.count, 3) if self.count else 0.0
+            ),
+            "p50_seconds": round(_percentile(samples, 50), 3),
+            "p90_seconds": round(_percentile(samples, 90), 3),
+            "p99_seconds": round(_percentile(samples, 99), 3),
+            "max_seconds": round(self.max_seconds, 3),
+        }
+
+
+class StageStats:
+    """Số liệu của một bước trong pipeline đồng bộ (fetch, enrich, transform, write)"""
+
+    def __init__(self):
+        self.items = 0
+        self.busy_seconds = 0.0  # Thời gian thực sự xử lý
+        self.input_wait_seconds = 0.0  # Chờ bước trước (bước này nhanh hơn)
+        self.output_wait_seconds = 0.0  # Chờ bước sau do hàng đợi đầy (backpressure)
+
+    def add(self, items, busy_seconds, input_wait_seconds, output_wait_seconds):
+        self.items += items
+        self.busy_seconds += busy_seconds
+        self.input_wait_seconds += input_wait_seconds
+        self.output_wait_seconds += output_wait_seconds
+
+    def to_dict(self):
+        return {
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "input_wait_seconds": round(self.input_wait_seconds, 3),
+            "output_wait_seconds": round(self.output_wait_seconds, 3),
+            "items_per_second": (
+                round(self.items / self.busy_seconds, 1) if self.busy_seconds else 0.0
+            ),
+        }
+
+
+class WriteBatchStats:
+    """Số liệu các lô ghi bulk_write vào một collection MongoDB"""
+
+    def __init__(self):
+        self.batches = 0
+        self.operations = 0
+        self.bytes_sent = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.retries = 0
+        self.failed_batches = 0
+
+    def add(self, operations, bytes_sent, seconds, retries, failed):
+        self.batches += 1
+        self.operations += operations
+        self.bytes_sent += bytes_sent
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.retries += retries
+        self.failed_batches += 1 if failed else 0
+
+    def to_dict(self):
+        return {
+            "batches": self.batches,
+            "operations": self.operations,
+            "bytes_sent": self.bytes_sent,
+            "total_seconds": round(self.total_seconds, 3),
+            "avg_seconds": (
+                round(self.total_seconds / self.batches, 4) if self.batches else 0.0
+            ),
+            "max_seconds": round(self.max_seconds, 4),
+            "retries": self.retries,
+            "failed_batches": self.failed_batches,
+        }
+
+
+class MetricsRegistry:
+    """Bộ đếm số liệu gọi Jira API dùng chung trong process (thread-safe)
+
+    Mỗi request được ghi theo (method, endpoint template): số lần gọi, latency
+    (gồm cả thời gian chờ retry), số byte nhận về, số lần retry và mã lỗi.
+    Ngoài ra registry ghi thời gian của từng bước trong pipeline đồng bộ, kích
+    thước trang search đang được chọn cho từng tập trường và các lô ghi MongoDB.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.stages = {}
+        self.page_sizes = {}
+        self.write_batches = {}
+        self.started_at = time.time()
+
+    def _targets(self):
+        return [self.stats] + [scope.stats for scope in _active_scopes.get()]
+
+    def _stage_targets(self):
+        return [self.stages] + [scope.stages for scope in _active_scopes.get()]
+
+    def _page_size_targets(self):
+        return [self.page_sizes] + [
+            scope.page_sizes for scope in _active_scopes.get()
+        ]
+
+    def _write_batch_targets(self):
+        return [self.write_batches] + [
+            scope.write_batches for scope in _active_scopes.get()
+        ]
+
+    def record(
+        self, method, endpoint, seconds, bytes_received=0, retries=0, error_codes=()
+    ):
+        """Ghi nhận một request đã hoàn tất (thành công hoặc thất bại)
+
+        Args:
+            method (str): HTTP method
+            endpoint (str): Endpoint hoặc URL của request
+            seconds (float): Tổng thời gian, gồm cả các lần retry
+            bytes_received (int): Số byte của response cuối cùng
+            retries (int): Số lần đã retry
+            error_codes (list): Mã lỗi của từng lần thử thất bại (status code hoặc "network")
+        """
+        key = (method, endpoint_template(endpoint))
+        with self.lock:
+            for stats in self._targets():
+                stats.setdefault(key, EndpointStats()).add(
+                    seconds, bytes_received, retries, error_codes
+                )
+
+    def record_cache_hit(self, method, endpoint):
+        """Ghi nhận một response được trả về từ cache mà không gọi Jira"""
+        key = (method, endpoint_template(endpoint))
+        with self.lock:
+            for stats in self._targets():
+                stats.setdefault(key, EndpointStats()).cache_hits += 1
+
+    def record_stage(
+        self, stage, items, busy_seconds, input_wait_seconds=0.0, output_wait_seconds=0.0
+    ):
+        """Ghi nhận thời gian của một bước trong pipeline đồng bộ
+
+        Args:
+            stage (str): Tên bước (fetch, enrich, transform, write)
+            items (int): Số phần tử đã xử lý
+            busy_seconds (float): Thời gian xử lý
+            input_wait_seconds (float): Thời gian chờ dữ liệu từ bước trước
+            output_wait_seconds (float): Thời gian chờ bước sau nhận dữ liệu
+        """
+        with self.lock:
+            for stages in self._stage_targets():
+                stages.setdefault(stage, StageStats()).add(
+                    items, busy_seconds, input_wait_seconds, output_wait_seconds
+                )
+
+    def record_page_size(
+        self,
+        label,
+        page_size,
+        server_cap=None,
+        bytes_per_issue=None,
+        seconds_per_issue=None,
+    ):
+        """Ghi nhận kích thước trang search vừa được chọn cho một tập trường
+
+        Args:
+            label (str): Field profile hoặc mô tả tập trường
+            page_size (int): Kích thước trang cho request tiếp theo
+            server_cap (int, optional): maxResults tối đa Jira chấp nhận (nếu đã biết)
+            bytes_per_issue (float, optional): Số byte trung bình của một issue
+            seconds_per_issue (float, optional): Thời gian trung bình của một issue
+        """
+        value = {
+            "page_size": page_size,
+            "server_cap": server_cap,
+            "bytes_per_issue": round(bytes_per_issue) if bytes_per_issue else None,
+            "ms_per_issue": (
+                round(seconds_per_issue * 1000, 2) if seconds_per_issue else None
+            ),
+        }
+        with self.lock:
+            for page_sizes in self._page_size_targets():
+                page_sizes[label] = value
+
+    def record_write_batch(
+        self, collection, operations, bytes_sent, seconds, retries=0, failed=False
+    ):
+        """Ghi nhận một lô bulk_write vào MongoDB
+
+        Args:
+            collection (str): Tên collection
+            operations (int): Số thao tác trong lô
+            bytes_sent (int): Kích thước ước tính của lô (BSON)
+            seconds (float): Thời gian ghi, gồm cả các lần thử lại
+            retries (int): Số lần thử lại do lỗi tạm thời
+            failed (bool): Lô vẫn lỗi sau khi thử lại
+        """
+        with self.lock:
+            for write_batches in self._write_batch_targets():
+                write_batches.setdefault(collection, WriteBatchStats()).add(
+                    operations, bytes_sent, seconds, retries, failed
+                )
+
+    def write_batch_snapshot(self):
+        """Lấy số liệu các lô ghi MongoDB theo collection
+
+        Returns:
+            list: Danh sách dict {"collection", "batches", ...}
+        """
+        with self.lock:
+            return _write_batches_to_list(self.write_batches)
+
+    def page_size_snapshot(self):
+        """Lấy kích thước trang search hiện tại của từng tập trường
+
+        Returns:
+            list: Danh sách dict {"profile", "page_size", ...}
+        """
+        with self.lock:
+            return _page_sizes_to_list(self.page_sizes)
+
+    def stage_snapshot(self):
+        """Lấy số liệu các bước của pipeline đồng bộ
+
+        Returns:
+            list: Danh sách dict số liệu của từng bước
+        """
+        with self.lock:
+            return _stages_to_list(self.stages)
+
+    def snapshot(self):
+        """Lấy số liệu hiện tại
+
+        Returns:
+            list: Danh sách dict số liệu của từng endpoint, sắp xếp theo tổng thời gian giảm dần
+        """
+        with self.lock:
+            return _stats_to_list(self.stats)
+
+    def reset(self):
+        """Xóa toàn bộ số liệu đã ghi"""
+        with self.lock:
+            self.stats = {}
+            self.stages = {}
+            self.page_sizes = {}
+            self.write_batches = {}
+            self.started_at = time.time()
+
+    def to_json(self):
+        """Xuất số liệu dạng JSON"""
+        return json.dumps(
+            {
+                "started_at": self.started_at,
+                "endpoints": self.snapshot(),
+                "pipeline_stages": self.stage_snapshot(),
+                "page_sizes": self.page_size_snapshot(),
+                "write_batches": self.write_batch_snapshot(),
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+
+    def to_prometheus(self):
+        """Xuất số liệu theo định dạng text của Prometheus
+
+        Returns:
+            str: Nội dung có thể phục vụ trực tiếp cho Prometheus scrape
+        """
+        with self.lock:
+            items = sorted(self.stats.items())
+            lines = []
+
+            def metric(name, kind, help_text):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            def labels(method, template, **extra):
+                pairs = {"method": method, "endpoint": template, **extra}
+                return ",".join(f'{k}="{v}"' for k, v in pairs.items())
+
+            counters = [
+                ("jira_api_requests_total", "Số request gửi tới Jira API", "count"),
+                ("jira_api_cache_hits_total", "Số response lấy từ cache", "cache_hits"),
+                ("jira_api_retries_total", "Số lần retry", "retries"),
+                ("jira_api_response_bytes_total", "Số byte nhận về", "bytes_received"),
+            ]
+            for name, help_text, attr in counters:
+                metric(name, "counter", help_text)
+                for (method, template), s in items:
+                    lines.append(
+                        f"{name}{{{labels(method, template)}}} {getattr(s, attr)}"
+                    )
+
+            metric("jira_api_errors_total", "counter", "Số lần thử thất bại theo mã lỗi")
+            for (method, template), s in items:
+                for code, count in sorted(s.errors.items(), key=lambda x: str(x[0])):
+                    lines.append(
+                        f"jira_api_errors_total{{{labels(method, template, code=code)}}} {count}"
+                    )
+
+            metric(
+                "jira_api_request_duration_seconds",
+                "histogram",
+                "Thời gian request (gồm cả retry)",
+            )
+            for (method, template), s in items:
+                for bound, count in zip(LATENCY_BUCKETS, s.buckets):
+                    lines.append(
+                        "jira_api_request_duration_seconds_bucket"
+                        f"{{{labels(method, template, le=bound)}}} {count}"
+                    )
+                lines.append(
+                    "jira_api_request_duration_seconds_bucket"
+                    f"{{{labels(method, template, le='+Inf')}}} {s.count}"
+                )
+                lines.append(
+                    f"jira_api_request_duration_seconds_sum{{{labels(method, template)}}} "
+                    f"{s.total_seconds:.6f}"
+                )
+                lines.append(
+                    f"jira_api_request_duration_seconds_count{{{labels(method, template)}}} {s.count}"
+                )
+
+            stage_items = sorted(self.stages.items())
+            stage_counters = [
+                ("sync_pipeline_items_total", "Số phần tử đã xử lý", "items"),
+                ("sync_pipeline_busy_seconds_total", "Thời gian xử lý", "busy_seconds"),
+                (
+                    "sync_pipeline_input_wait_seconds_total",
+                    "Thời gian chờ bước trước",
+                    "input_wait_seconds",
+                ),
+                (
+                    "sync_pipeline_output_wait_seconds_total",
+                    "Thời gian chờ bước sau (backpressure)",
+                    "output_wait_seconds",
+                ),
+            ]
+            for name, help_text, attr in stage_counters:
+                metric(name, "counter", help_text)
+                for stage, s in stage_items:
+                    lines.append(f'{name}{{stage="{stage}"}} {getattr(s, attr)}')
+
+            metric(
+                "jira_search_page_size",
+                "gauge",
+                "Kích thước trang search đang được chọn theo tập trường",
+            )
+            for label, value in sorted(self.page_sizes.items()):
+                profile = label.replace('"', "'")
+                lines.append(
+                    f'jira_search_page_size{{profile="{profile}"}} {value["page_size"]}'
+                )
+
+            write_items = sorted(self.write_batches.items())
+            write_counters = [
+                ("mongo_bulk_write_batches_total", "Số lô bulk_write", "batches"),
+                ("mongo_bulk_write_operations_total", "Số thao tác ghi", "operations"),
+                ("mongo_bulk_write_bytes_total", "Số byte đã gửi (ước tính)", "bytes_sent"),
+                ("mongo_bulk_write_seconds_total", "Thời gian ghi", "total_seconds"),
+                ("mongo_bulk_write_retries_total", "Số lần thử lại", "retries"),
+                (
+                    "mongo_bulk_write_failed_batches_total",
+                    "Số lô lỗi sau khi thử lại",
+                    "failed_batches",
+                ),
+            ]
+            for name, help_text, attr in write_counters:
+                metric(name, "counter", help_text)
+                for collection, s in write_items:
+                    lines.append(f'{name}{{collection="{collection}"}} {getattr(s, attr)}')
+
+        return "\n".join(lines) + "\n"
+
+    @contextmanager
+    def scope(self):
+        """Thu thập riêng số liệu trong một khoảng thời gian (ví dụ: một lần đồng bộ sprint)
+
+        Scope chỉ ghi nhận số liệu của ngữ cảnh hiện tại (thread hoặc task asyncio)
+        nên các lần đồng bộ chạy song song không thấy request của nhau. Thread con
+        cần được gắn scope bằng bind_metrics_scope để số liệu của nó được tính vào.
+        Scope lồng nhau ghi nhận vào cả scope ngoài.
+
+        Usage:
+            with get_metrics_registry().scope() as scope:
+                ...
+            summary = scope.summary()
+        """
+        scope = MetricsScope()
+        token = _active_scopes.set(_active_scopes.get() + (scope,))
+        try:
+            yield scope
+        finally:
+            _active_scopes.reset(token)
+            scope.finished_at = time.time()
+
+
+class MetricsScope:
+    """Số liệu thu thập trong một scope của MetricsRegistry"""
+
+    def __init__(self):
+        self.stats = {}
+        self.stages = {}
+        self.page_sizes = {}
+        self.write_batches = {}
+        self.started_at = time.time()
+        self.finished_at = None
+
+    def summary(self, top=5):
+        """Tóm tắt số liệu để lưu cùng kết quả đồng bộ
+
+        Args:
+            top (int): Số endpoint chậm nhất được liệt kê
+
+        Returns:
+            dict: Tổng số request, retry, lỗi, byte, thời gian, các endpoint chậm nhất,
+                số liệu các bước của pipeline đồng bộ, kích thước trang search đã chọn
+                và các lô ghi MongoDB
+        """
+        endpoints = _stats_to_list(self.stats)
+        finished_at = self.finished_at or time.time()
+        return {
+            "duration_seconds": round(finished_at - self.started_at, 3),
+            "requests": sum(e["count"] for e in endpoints),
+            "cache_hits": sum(e["cache_hits"] for e in endpoints),
+            "retries": sum(e["retries"] for e in endpoints),
+            "errors": sum(sum(e["errors"].values()) for e in endpoints),
+            "bytes_received": sum(e["bytes_received"] for e in endpoints),
+            "slowest_endpoints": endpoints[:top],
+            "pipeline_stages": _stages_to_list(self.stages),
+            "page_sizes": _page_sizes_to_list(self.page_sizes),
+            "write_batches": _write_batches_to_list(self.write_batches),
+        }
+
+
+def _stats_to_list(stats):
+    """Chuyển dict số liệu thành danh sách, sắp xếp theo tổng thời gian giảm dần"""
+    endpoints = []
+    for (method, template), s in stats.items():
+        item = {"method": method, "endpoint": template}
+        item.update(s.to_dict())
+        # Mã lỗi dạng chuỗi để có thể lưu làm khóa trong MongoDB
+        item["errors"] = {str(code): count for code, count in item["errors"].items()}
+        endpoints.append(item)
+    endpoints.sort(key=lambda e: e["total_seconds"], reverse=True)
+    return endpoints
+
+
+def _stages_to_list(stages):
+    """Chuyển dict số liệu các bước pipeline thành danh sách"""
+    items = []
+    for stage, s in stages.items():
+        item = {"stage": stage}
+        item.update(s.to_dict())
+        items.append(item)
+    return items
+
+
+def _page_sizes_to_list(page_sizes):
+    """Chuyển dict kích thước trang thành danh sách"""
+    return [
+        {"profile": label, **value} for label, value in sorted(page_sizes.items())
+    ]
+
+
+def _write_batches_to_list(write_batches):
+    """Chuyển dict số liệu các lô ghi MongoDB thành danh sách"""
+    return [
+        {"collection": collection, **s.to_dict()}
+        for collection, s in sorted(write_batches.items())
+    ]
+
+
+_registry = MetricsRegistry()
+
+
+def bind_metrics_scope(func):
+    """Gắn các scope số liệu đang mở ở ngữ cảnh hiện tại vào hàm sẽ chạy ở thread khác
+
+    Phải gọi trong thread đang mở scope, trước khi giao hàm cho thread hoặc executor.
+
+    Args:
+        func (callable): Hàm chạy trong thread khác
+
+    Returns:
+        callable: Hàm bọc, ghi số liệu vào cùng các scope với thread hiện tại
+    """
+    scopes = _active_scopes.get()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _active_scopes.set(scopes)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _active_scopes.reset(token)
+
+    return wrapper
+
+
+def get_metrics_registry():
+    """Lấy registry số liệu Jira API dùng chung cho toàn bộ process
+
+    Returns:
+        MetricsRegistry: Registry dùng chung
+    """
+    return _registry
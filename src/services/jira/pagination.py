@@ -0,0 +1,159 @@
+import threading
+from src.config.config import (
+    JIRA_SEARCH_HEAVY_PAGE_SIZE,
+    JIRA_SEARCH_MAX_PAGE_SIZE,
+    JIRA_SEARCH_MIN_PAGE_SIZE,
+    JIRA_SEARCH_TARGET_PAGE_BYTES,
+    JIRA_SEARCH_TARGET_PAGE_SECONDS,
+)
+from src.services.jira.metrics import get_metrics_registry
+
+# Các trường/expand làm mỗi issue nặng hơn nhiều (danh sách con, văn bản dài)
+HEAVY_FIELDS = {"worklog", "comment", "description", "attachment", "issuelinks"}
+HEAVY_EXPANDS = {"changelog", "renderedFields"}
+
+# Trọng số của quan sát mới khi cập nhật trung bình byte/giây trên mỗi issue
+SMOOTHING = 0.5
+
+
+class AdaptivePageSizer:
+    """Chọn số issues mỗi trang search cho một tập trường (field profile)
+
+    Tập trường nhẹ bắt đầu với trang lớn nhất, tập trường nặng (worklog, comment,
+    changelog) bắt đầu với trang nhỏ. Sau mỗi trang, kích thước được điều chỉnh
+    theo byte và thời gian trung bình của một issue để trang không vượt quá
+    JIRA_SEARCH_TARGET_PAGE_BYTES và JIRA_SEARCH_TARGET_PAGE_SECONDS, và không
+    vượt quá maxResults mà Jira thực sự trả về (Jira giới hạn mà không báo lỗi).
+    Trang lỗi (timeout, ngắt kết nối) làm giảm một nửa kích thước.
+    """
+
+    def __init__(
+        self,
+        label,
+        heavy=False,
+        max_size=JIRA_SEARCH_MAX_PAGE_SIZE,
+        min_size=JIRA_SEARCH_MIN_PAGE_SIZE,
+        target_bytes=JIRA_SEARCH_TARGET_PAGE_BYTES,
+        target_seconds=JIRA_SEARCH_TARGET_PAGE_SECONDS,
+    ):
+        """Khởi tạo bộ chọn kích thước trang
+
+        Args:
+            label (str): Tên hiển thị trong metrics (field profile hoặc mô tả tập trường)
+            heavy (bool): Tập trường có trường nặng, bắt đầu với trang nhỏ
+            max_size (int): Kích thước trang lớn nhất được yêu cầu
+            min_size (int): Kích thước trang nhỏ nhất
+            target_bytes (int): Số byte mong muốn tối đa của một trang
+            target_seconds (float): Thời gian mong muốn tối đa của một trang
+        """
+        self.label = label
+        self.max_size = max(1, max_size)
+        self.min_size = max(1, min(min_size, self.max_size))
+        self.target_bytes = target_bytes
+        self.target_seconds = target_seconds
+        self.server_cap = None
+        self.bytes_per_issue = None
+        self.seconds_per_issue = None
+        self.pages = 0
+        self.lock = threading.Lock()
+        initial = JIRA_SEARCH_HEAVY_PAGE_SIZE if heavy else self.max_size
+        self.size = self._clamp(initial)
+
+    def _clamp(self, size):
+        upper = self.max_size
+        if self.server_cap is not None:
+            upper = min(upper, self.server_cap)
+        return max(self.min_size, min(int(size), upper))
+
+    def next_size(self):
+        """Kích thước trang cho request tiếp theo"""
+        with self.lock:
+            return self.size
+
+    def observe(self, requested, returned_max_results, issue_count, bytes_received, seconds):
+        """Cập nhật kích thước trang từ kết quả của một trang
+
+        Args:
+            requested (int): maxResults đã yêu cầu
+            returned_max_results (int): maxResults Jira trả về (None nếu không có)
+            issue_count (int): Số issues trong trang
+            bytes_received (int): Số byte của response (0 nếu không xác định)
+            seconds (float): Thời gian lấy và đọc trang
+        """
+        with self.lock:
+            self.pages += 1
+            if returned_max_results and returned_max_results < requested:
+                self.server_cap = returned_max_results
+
+            if issue_count > 0:
+                if bytes_received > 0:
+                    self.bytes_per_issue = self._smooth(
+                        self.bytes_per_issue, bytes_received / issue_count
+                    )
+                if seconds > 0:
+                    self.seconds_per_issue = self._smooth(
+                        self.seconds_per_issue, seconds / issue_count
+                    )
+
+            candidates = [self.max_size]
+            if self.bytes_per_issue:
+                candidates.append(self.target_bytes / self.bytes_per_issue)
+            if self.seconds_per_issue:
+                candidates.append(self.target_seconds / self.seconds_per_issue)
+            # Tăng dần tối đa gấp đôi mỗi trang để không nhảy lên trang quá lớn sau một mẫu nhanh
+            self.size = self._clamp(min(min(candidates), self.size * 2))
+        self._publish()
+
+    def observe_failure(self):
+        """Trang bị lỗi (timeout, ngắt kết nối): giảm một nửa kích thước trang"""
+        with self.lock:
+            self.size = self._clamp(self.size // 2)
+        self._publish()
+
+    @staticmethod
+    def _smooth(previous, value):
+        if previous is None:
+            return value
+        return previous + SMOOTHING * (value - previous)
+
+    def _publish(self):
+        get_metrics_registry().record_page_size(
+            self.label,
+            self.next_size(),
+            server_cap=self.server_cap,
+            bytes_per_issue=self.bytes_per_issue,
+            seconds_per_issue=self.seconds_per_issue,
+        )
+
+
+_sizers = {}
+_sizers_lock = threading.Lock()
+
+
+def get_page_sizer(fields=None, expand=None, profiles=None):
+    """Lấy bộ chọn kích thước trang dùng chung cho một tập trường và expand
+
+    Args:
+        fields (list, optional): Các trường của request (đã gộp field profile)
+        expand (str, optional): Expand của request, phân tách bằng dấu phẩy
+        profiles (list, optional): Tên các field profile, dùng làm nhãn trong metrics
+
+    Returns:
+        AdaptivePageSizer: Bộ chọn kích thước trang
+    """
+    field_set = frozenset(fields or [])
+    expand_set = frozenset(e for e in (expand or "").split(",") if e)
+    key = (field_set, expand_set)
+    with _sizers_lock:
+        sizer = _sizers.get(key)
+        if sizer is None:
+            if profiles:
+                label = "+".join(profiles)
+            else:
+                label = ",".join(sorted(field_set)) or "*"
+                if expand_set:
+                    label += f" [expand={','.join(sorted(expand_set))}]"
+            heavy = bool(field_set & HEAVY_FIELDS or expand_set & HEAVY_EXPANDS)
+            sizer = AdaptivePageSizer(label, heavy=heavy)
+            _sizers[key] = sizer
+        return sizer
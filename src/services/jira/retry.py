@@ -0,0 +1,335 @@
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from src.config.config import (
+    JIRA_MAX_RETRIES,
+    JIRA_RETRY_BASE_DELAY,
+    JIRA_RETRY_MAX_DELAY,
+    JIRA_RATE_LIMIT_PER_SECOND,
+    JIRA_RATE_LIMIT_BURST,
+    JIRA_MAX_IN_FLIGHT,
+)
+
+# Các mã lỗi tạm thời nên thử lại
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryPolicy:
+    """Cấu hình retry cho một nhóm endpoint"""
+
+    def __init__(
+        self,
+        max_retries=JIRA_MAX_RETRIES,
+        base_delay=JIRA_RETRY_BASE_DELAY,
+        max_delay=JIRA_RETRY_MAX_DELAY,
+        retry_statuses=RETRYABLE_STATUSES,
+        retry_on_network_errors=True,
+    ):
+        """Khởi tạo chính sách retry
+
+        Args:
+            max_retries (int): Số lần thử lại tối đa
+            base_delay (float): Thời gian chờ cơ sở cho backoff (giây)
+            max_delay (float): Thời gian chờ tối đa giữa hai lần thử (giây)
+            retry_statuses (set): Các mã HTTP được thử lại
+            retry_on_network_errors (bool): Thử lại khi lỗi kết nối/timeout hay không
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = set(retry_statuses)
+        self.retry_on_network_errors = retry_on_network_errors
+
+    def backoff(self, attempt):
+        """Tính thời gian chờ theo exponential backoff với full jitter
+
+        Args:
+            attempt (int): Lần thử thứ mấy (bắt đầu từ 0)
+
+        Returns:
+            float: Số giây cần chờ
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def delay_for(self, response, attempt):
+        """Tính thời gian chờ trước lần thử tiếp theo dựa trên response
+
+        Ưu tiên header Retry-After, sau đó X-RateLimit-Reset, cuối cùng là backoff.
+
+        Args:
+            response (requests.Response): Response lỗi
+            attempt (int): Lần thử thứ mấy (bắt đầu từ 0)
+
+        Returns:
+            float: Số giây cần chờ
+        """
+        server_delay = get_server_delay(response.headers)
+        if server_delay is not None:
+            # Thêm một chút jitter để các worker không cùng quay lại một lúc
+            return min(self.max_delay, server_delay) + random.uniform(0, 0.5)
+        return self.backoff(attempt)
+
+
+# Chính sách retry theo nhóm endpoint
+RETRY_POLICIES = {
+    # search trả về nhiều dữ liệu, lỗi thường do quá tải nên chờ lâu hơn
+    "search": RetryPolicy(base_delay=JIRA_RETRY_BASE_DELAY * 2),
+    "issue": RetryPolicy(),
+    "agile": RetryPolicy(),
+    "default": RetryPolicy(),
+    # POST/PUT không idempotent: chỉ thử lại khi server từ chối vì rate limit
+    "write": RetryPolicy(retry_statuses={429}, retry_on_network_errors=False),
+}
+
+
+def classify_endpoint(endpoint, use_agile_api=False, method="GET"):
+    """Xác định nhóm endpoint để chọn chính sách retry
+
+    Args:
+        endpoint (str): Endpoint của API (có thể kèm query string)
+        use_agile_api (bool): Endpoint thuộc Agile API hay không
+        method (str): Phương thức HTTP
+
+    Returns:
+        str: Tên nhóm endpoint (search, issue, agile, write, default)
+    """
+    if method != "GET":
+        return "write"
+    if use_agile_api:
+        return "agile"
+
+    path = endpoint.split("?", 1)[0].strip("/")
+    if path.startswith("search"):
+        return "search"
+    if path.startswith("issue/"):
+        return "issue"
+    return "default"
+
+
+def get_retry_policy(endpoint_class):
+    """Lấy chính sách retry của một nhóm endpoint
+
+    Args:
+        endpoint_class (str): Tên nhóm endpoint
+
+    Returns:
+        RetryPolicy: Chính sách retry
+    """
+    return RETRY_POLICIES.get(endpoint_class, RETRY_POLICIES["default"])
+
+
+def _parse_reset_time(value):
+    """Chuyển giá trị thời điểm reset (epoch, ISO 8601 hoặc HTTP date) thành số giây còn lại"""
+    value = value.strip()
+    now = datetime.now(timezone.utc)
+    try:
+        number = float(value)
+        # Giá trị lớn là epoch timestamp, giá trị nhỏ là số giây
+        if number > 10**9:
+            return max(0.0, number - now.timestamp())
+        return max(0.0, number)
+    except ValueError:
+        pass
+
+    for parser in (
+        lambda v: datetime.fromisoformat(v.replace("Z", "+00:00")),
+        parsedate_to_datetime,
+    ):
+        try:
+            reset_at = parser(value)
+            if reset_at.tzinfo is None:
+                reset_at = reset_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (reset_at - now).total_seconds())
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def get_server_delay(headers):
+    """Đọc thời gian chờ mà server yêu cầu từ các header rate limit
+
+    Args:
+        headers (Mapping): Header của response
+
+    Returns:
+        float: Số giây cần chờ, hoặc None nếu server không chỉ định
+    """
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        delay = _parse_reset_time(retry_after)
+        if delay is not None:
+            return delay
+
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if reset and remaining is not None and remaining.strip() in ("0", "0.0"):
+        return _parse_reset_time(reset)
+    return None
+
+
+class TokenBucket:
+    """Token bucket giới hạn tốc độ gọi API cho một host (thread-safe)"""
+
+    def __init__(self, rate=JIRA_RATE_LIMIT_PER_SECOND, capacity=JIRA_RATE_LIMIT_BURST):
+        """Khởi tạo token bucket
+
+        Args:
+            rate (float): Số token được nạp mỗi giây
+            capacity (int): Số token tối đa (cho phép burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def reserve(self):
+        """Thử lấy một token mà không chờ
+
+        Returns:
+            float: 0 nếu đã lấy được token, ngược lại là số giây nên chờ trước khi thử lại
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Lấy một token, chờ nếu bucket đang rỗng hoặc đang bị tạm dừng"""
+        wait = self.reserve()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.reserve()
+
+    def pause(self, seconds):
+        """Tạm dừng mọi request tới host trong một khoảng thời gian
+
+        Args:
+            seconds (float): Số giây tạm dừng
+        """
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers):
+        """Điều chỉnh bucket theo các header X-RateLimit-* của server
+
+        Args:
+            headers (Mapping): Header của response
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            remaining = float(remaining)
+        except ValueError:
+            return
+
+        with self.lock:
+            # Không cho phép burst vượt quá số request server còn cho phép
+            self.tokens = min(self.tokens, remaining)
+
+        if remaining <= 0:
+            delay = get_server_delay(headers)
+            if delay:
+                self.pause(delay)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_token_bucket(host):
+    """Lấy token bucket dùng chung của một host
+
+    Args:
+        host (str): Tên host (ví dụ: vieted.atlassian.net)
+
+    Returns:
+        TokenBucket: Token bucket của host
+    """
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket()
+        return _buckets[host]
+
+
+class ConcurrencyLimiter:
+    """Giới hạn số request đang gửi tới một host, dùng chung cho client sync và async
+
+    Token bucket giới hạn tốc độ, còn limiter này giới hạn số request đồng thời
+    khi nhiều thread (ví dụ: đồng bộ nhiều sprint song song) cùng chạy fan-out.
+    """
+
+    # Khoảng thời gian chờ giữa hai lần thử lấy slot trong event loop
+    ASYNC_POLL_SECONDS = 0.01
+
+    def __init__(self, max_in_flight=JIRA_MAX_IN_FLIGHT):
+        """Khởi tạo limiter
+
+        Args:
+            max_in_flight (int): Số request đồng thời tối đa, <= 0 để không giới hạn
+        """
+        self.max_in_flight = max_in_flight
+        self.semaphore = threading.BoundedSemaphore(max(1, max_in_flight))
+
+    @contextmanager
+    def slot(self):
+        """Giữ một slot trong lúc gửi request (chặn thread nếu đã đủ slot)"""
+        if self.max_in_flight <= 0:
+            yield
+            return
+        self.semaphore.acquire()
+        try:
+            yield
+        finally:
+            self.semaphore.release()
+
+    @asynccontextmanager
+    async def async_slot(self):
+        """Giữ một slot trong lúc gửi request mà không chặn event loop"""
+        if self.max_in_flight <= 0:
+            yield
+            return
+        while not self.semaphore.acquire(blocking=False):
+            await asyncio.sleep(self.ASYNC_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            self.semaphore.release()
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_concurrency_limiter(host):
+    """Lấy limiter số request đồng thời dùng chung của một host
+
+    Args:
+        host (str): Tên host (ví dụ: vieted.atlassian.net)
+
+    Returns:
+        ConcurrencyLimiter: Limiter của host
+    """
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = ConcurrencyLimiter()
+        return _limiters[host]
@@ -1,5 +1,10 @@
-import streamlit as st
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.config.config import JIRA_PAGE_FANOUT
 from src.services.jira.base_client import BaseJiraClient
+from src.services.jira.field_profiles import resolve_request_fields
+from src.services.jira.metrics import bind_metrics_scope
+from src.services.jira.pagination import get_page_sizer
 
 
 class SprintClient(BaseJiraClient):
@@ -26,11 +31,148 @@ class SprintClient(BaseJiraClient):
             return response.json().get("values", [])
         return []
 
+    def _fetch_search_page(
+        self, jql, fields, start_at, page_size, expand=None, sizer=None
+    ):
+        """Lấy một trang kết quả search
+
+        Args:
+            jql (str): JQL query
+            fields (list): Danh sách các trường cần lấy
+            start_at (int): Vị trí bắt đầu
+            page_size (int): Số issues mỗi trang
+            expand (str, optional): Các phần mở rộng cần lấy (ví dụ: 'changelog')
+            sizer (AdaptivePageSizer, optional): Nhận kích thước và thời gian của trang
+
+        Returns:
+            dict: Dữ liệu trang (issues, total, maxResults), None nếu lỗi
+        """
+        params = {
+            "jql": jql,
+            "fields": ",".join(fields),
+            "maxResults": page_size,
+            "startAt": start_at,
+        }
+        if expand:
+            params["expand"] = expand
+        started = time.perf_counter()
+        response = self.get("search", params=params)
+        if not response or response.status_code != 200:
+            if sizer is not None:
+                sizer.observe_failure()
+            return None
+        page = response.json()
+        if sizer is not None:
+            sizer.observe(
+                page_size,
+                page.get("maxResults"),
+                len(page.get("issues", [])),
+                len(response.content or b""),
+                time.perf_counter() - started,
+            )
+        return page
+
+    def _build_sprint_jql(
+        self, sprint_id, project_key=None, status_names=None, updated_within=None
+    ):
+        """Tạo JQL lấy issues của sprint
+
+        Args:
+            sprint_id (int): ID của sprint
+            project_key (str, optional): Mã dự án cần lọc
+            status_names (list, optional): Lọc theo tên trạng thái
+            updated_within (int, optional): Chỉ lấy issues được cập nhật trong số phút gần đây
+
+        Returns:
+            str: JQL query
+        """
+        jql = f"sprint = {sprint_id}"
+        if project_key:
+            jql += f" AND project = {project_key}"
+        if status_names:
+            status_clause = " OR ".join([f'status = "{s}"' for s in status_names])
+            jql += f" AND ({status_clause})"
+        if updated_within:
+            # Thời gian tương đối nên không phụ thuộc múi giờ của tài khoản Jira
+            jql += f' AND updated >= "-{int(updated_within)}m"'
+        return jql
+
+    def iter_sprint_issues(
+        self,
+        sprint_id,
+        fields=None,
+        status_names=None,
+        max_issues=-1,
+        project_key=None,
+        expand=None,
+        profiles=None,
+        updated_within=None,
+        page_size=None,
+        fanout=1,
+    ):
+        """Lấy issues của sprint dưới dạng stream, giải mã và trả về từng issue một
+
+        Khác với get_sprint_issues, issues không được giữ lại sau khi trả về, nên
+        phù hợp cho các sprint lớn khi caller xử lý xong rồi bỏ dữ liệu gốc của
+        từng issue. Mặc định các trang được đọc tuần tự; với fanout > 1 các trang
+        sau trang đầu được lấy trước song song và vẫn trả về theo đúng thứ tự.
+
+        Args:
+            sprint_id (int): ID của sprint
+            fields (list, optional): Danh sách các trường cần lấy
+            status_names (list, optional): Lọc theo tên trạng thái
+            max_issues (int, optional): Số lượng issues tối đa, -1 để lấy tất cả
+            project_key (str, optional): Mã dự án cần lọc
+            expand (str, optional): Các phần mở rộng cần lấy kèm mỗi issue (ví dụ: 'changelog')
+            profiles (list, optional): Tên các field profile; trường và expand được gộp tối thiểu
+            updated_within (int, optional): Chỉ lấy issues được cập nhật trong số phút gần đây
+            page_size (int, optional): Số issues cố định mỗi trang (Jira có thể trả về ít
+                hơn). Mặc định kích thước trang tự điều chỉnh theo tập trường
+            fanout (int, optional): Số trang được lấy trước đồng thời, 1 để đọc tuần tự
+
+        Returns:
+            IssueStream: Iterable trả về từng issue (thuộc tính total có sau issue đầu tiên)
+        """
+        if fields is None and not profiles:
+            fields = [
+                "summary",
+                "status",
+                "assignee",
+                "issuetype",
+                "priority",
+                "created",
+                "updated",
+            ]
+        fields, expand = resolve_request_fields(fields, expand, profiles)
+        jql = self._build_sprint_jql(
+            sprint_id, project_key, status_names, updated_within
+        )
+        return self.stream_search(
+            jql,
+            fields,
+            expand,
+            max_issues=max_issues,
+            page_size=page_size,
+            profiles=profiles,
+            prefetch=fanout,
+        )
+
     def get_sprint_issues(
-        self, sprint_id, fields=None, status_names=None, max_issues=1000, project_key=None
+        self,
+        sprint_id,
+        fields=None,
+        status_names=None,
+        max_issues=1000,
+        project_key=None,
+        fanout=JIRA_PAGE_FANOUT,
+        expand=None,
+        profiles=None,
     ):
         """Lấy tất cả issues trong một sprint
 
+        Trang đầu tiên được lấy trước để biết tổng số issues, sau đó các trang
+        còn lại được lấy song song rồi ghép lại theo đúng thứ tự.
+
         Args:
             sprint_id (int): ID của sprint
             fields (list, optional): Danh sách các trường cần lấy
@@ -38,11 +180,14 @@ class SprintClient(BaseJiraClient):
             max_issues (int, optional): Số lượng issues tối đa cần lấy, mặc định 1000
                                         Nếu max_issues=-1, sẽ lấy tất cả issues
             project_key (str, optional): Mã dự án cần lọc
+            fanout (int, optional): Số trang được lấy đồng thời
+            expand (str, optional): Các phần mở rộng cần lấy kèm mỗi issue (ví dụ: 'changelog')
+            profiles (list, optional): Tên các field profile; trường và expand được gộp tối thiểu
 
         Returns:
-            list: Danh sách issues
+            list: Danh sách issues, None nếu không lấy được đầy đủ các trang
         """
-        if fields is None:
+        if fields is None and not profiles:
             fields = [
                 "summary",
                 "status",
@@ -52,108 +197,123 @@ class SprintClient(BaseJiraClient):
                 "created",
                 "updated",
             ]
+        fields, expand = resolve_request_fields(fields, expand, profiles)
 
         # Xây dựng JQL query
-        jql = f"sprint = {sprint_id}"
-        if project_key:
-            jql += f" AND project = {project_key}"
-        if status_names:
-            status_clause = " OR ".join([f'status = "{s}"' for s in status_names])
-            jql += f" AND ({status_clause})"
+        jql = self._build_sprint_jql(sprint_id, project_key, status_names)
 
-        all_issues = []
-        start_at = 0
-        page_size = 100  # Kích thước trang hợp lý cho mỗi request
-        total_issues = None
+        # Kích thước trang tự điều chỉnh theo tập trường (trường nặng dùng trang nhỏ hơn)
+        sizer = get_page_sizer(fields, expand, profiles)
+        page_size = sizer.next_size()
 
         # Hiển thị thông báo ban đầu
-        st.toast(f"Đang lấy issues cho sprint {sprint_id}...")
-
-        # Lặp qua các trang kết quả
-        while True:  # Bỏ kiểm tra max_issues để luôn lấy tất cả
-            params = {
-                "jql": jql,
-                "fields": ",".join(fields),
-                "maxResults": page_size,  # Luôn lấy đủ page_size cho mỗi request
-                "startAt": start_at,
-            }
-
-            try:
-                response = self.get("search", params=params)
-
-                if not response or response.status_code != 200:
-                    st.toast(
-                        f"Không thể lấy issues cho sprint {sprint_id} ở trang {start_at//page_size + 1}. "
-                        f"Response code: {response.status_code if response else 'N/A'}",
-                        icon="⚠️",
-                    )
-                    break
-
-                response_data = response.json()
-                issues = response_data.get("issues", [])
-
-                # Cập nhật tổng số issues nếu chưa có
-                if total_issues is None:
-                    total_issues = response_data.get("total", 0)
-                    if total_issues == 0:
-                        return []  # Không có issue nào
-
-                    # Chỉ hiển thị thông tin tổng số issues một lần
-                    if max_issues != -1 and total_issues > max_issues:
-                        st.toast(
-                            f"Tìm thấy {total_issues} issues, giới hạn lấy {max_issues}",
-                            icon="ℹ️",
-                        )
-                    else:
-                        st.toast(
-                            f"Tìm thấy {total_issues} issues trong sprint", icon="ℹ️"
-                        )
+        self.reporter.toast(f"Đang lấy issues cho sprint {sprint_id}...")
 
-                if not issues:
-                    # Hết issues để lấy
-                    break
+        # Lấy trang đầu tiên để biết tổng số issues
+        first_page = self._fetch_search_page(
+            jql, fields, 0, page_size, expand, sizer
+        )
+        if first_page is None:
+            self.reporter.toast(
+                f"Không thể lấy issues cho sprint {sprint_id} ở trang 1.",
+                icon="⚠️",
+            )
+            return None
+
+        first_issues = first_page.get("issues", [])
+        total_issues = first_page.get("total", 0)
+        if total_issues == 0 or not first_issues:
+            self.reporter.toast(
+                f"Không tìm thấy issue nào trong sprint {sprint_id}", icon="⚠️"
+            )
+            return []
 
-                all_issues.extend(issues)
+        if max_issues != -1 and total_issues > max_issues:
+            self.reporter.toast(
+                f"Tìm thấy {total_issues} issues, giới hạn lấy {max_issues}",
+                icon="ℹ️",
+            )
+        else:
+            self.reporter.toast(
+                f"Tìm thấy {total_issues} issues trong sprint", icon="ℹ️"
+            )
 
-                # Thông báo tiến trình
-                if total_issues > 0:
-                    percent = int(len(all_issues) / total_issues * 100)
-                    if (
-                        percent % 25 == 0 or len(all_issues) == total_issues
-                    ):  # Chỉ thông báo ở 25%, 50%, 75%, 100%
-                        st.toast(
-                            f"Đã tải {len(all_issues)}/{total_issues} issues ({percent}%)",
+        # Jira có thể trả về ít hơn maxResults đã yêu cầu nếu server giới hạn
+        page_size = first_page.get("maxResults") or len(first_issues)
+        target = total_issues if max_issues == -1 else min(total_issues, max_issues)
+        offsets = list(range(len(first_issues), target, page_size))
+
+        pages = {0: first_issues}
+        fetched = len(first_issues)
+        next_milestone = 25
+        failed_offsets = []
+
+        if offsets:
+            with ThreadPoolExecutor(max_workers=max(1, min(fanout, len(offsets)))) as executor:
+                fetch_page = bind_metrics_scope(self._fetch_search_page)
+                futures = {
+                    executor.submit(
+                        fetch_page,
+                        jql,
+                        fields,
+                        offset,
+                        page_size,
+                        expand,
+                        sizer,
+                    ): offset
+                    for offset in offsets
+                }
+                for future in as_completed(futures):
+                    offset = futures[future]
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        print(f"Lỗi khi lấy trang startAt={offset}: {str(e)}")
+                        page = None
+
+                    if page is None:
+                        failed_offsets.append(offset)
+                        continue
+
+                    pages[offset] = page.get("issues", [])
+                    fetched += len(pages[offset])
+
+                    # Thông báo tiến trình ở 25%, 50%, 75%, 100%
+                    percent = int(min(fetched, target) / target * 100)
+                    if percent >= next_milestone:
+                        self.reporter.toast(
+                            f"Đã tải {min(fetched, target)}/{target} issues ({percent}%)",
                             icon="ℹ️",
                         )
+                        next_milestone = (percent // 25 + 1) * 25
 
-                # Kiểm tra xem đã lấy hết issues chưa
-                if start_at + len(issues) >= total_issues or len(issues) < page_size:
-                    # Đã lấy tất cả hoặc không còn issue nào khác
-                    break
-
-                # Kiểm tra nếu đã lấy đủ số lượng theo giới hạn max_issues
-                if max_issues != -1 and len(all_issues) >= max_issues:
-                    break
-
-                # Cập nhật startAt cho trang tiếp theo
-                start_at += len(issues)
+        if failed_offsets:
+            # Không trả về danh sách thiếu để bên gọi không lưu nhầm như đã đầy đủ
+            self.reporter.warning(
+                f"Không thể lấy {len(failed_offsets)} trang issues cho sprint {sprint_id}"
+            )
+            return None
 
-            except Exception as e:
-                st.toast(
-                    f"Lỗi khi lấy issues cho sprint {sprint_id}: {str(e)}", icon="🛑"
-                )
-                break
+        # Ghép các trang theo thứ tự và loại bỏ issue trùng
+        # (issue có thể bị dịch trang nếu dữ liệu thay đổi trong lúc phân trang)
+        all_issues = []
+        seen_ids = set()
+        for offset in sorted(pages):
+            for issue in pages[offset]:
+                issue_id = issue.get("id") or issue.get("key")
+                if issue_id in seen_ids:
+                    continue
+                seen_ids.add(issue_id)
+                all_issues.append(issue)
 
         # Thông báo kết quả
-        if not all_issues:
-            st.toast(f"Không tìm thấy issue nào trong sprint {sprint_id}", icon="⚠️")
-        elif max_issues != -1 and total_issues and len(all_issues) < total_issues:
-            st.toast(
-                f"Đã lấy {len(all_issues)}/{total_issues} issues (giới hạn: {max_issues})",
+        if max_issues != -1 and len(all_issues) < total_issues:
+            self.reporter.toast(
+                f"Đã lấy {min(len(all_issues), max_issues)}/{total_issues} issues (giới hạn: {max_issues})",
                 icon="⚠️",
             )
         else:
-            st.toast(
+            self.reporter.toast(
                 f"Đã lấy đầy đủ {len(all_issues)} issues từ sprint {sprint_id}",
                 icon="✅",
             )
@@ -162,7 +322,7 @@ class SprintClient(BaseJiraClient):
         if max_issues != -1:
             all_issues = all_issues[:max_issues]
 
-        st.toast(
+        self.reporter.toast(
             f"Hoàn thành! Đã lấy {len(all_issues)} issues cho sprint {sprint_id}",
             icon="✅",
         )
@@ -186,7 +346,9 @@ class SprintClient(BaseJiraClient):
         )
 
         if not sprint_response or sprint_response.status_code != 200:
-            st.warning(f"Không thể lấy thông tin chi tiết của sprint {sprint_id}")
+            self.reporter.warning(
+                f"Không thể lấy thông tin chi tiết của sprint {sprint_id}"
+            )
             return None
 
         sprint_data = sprint_response.json()
@@ -202,6 +364,8 @@ class SprintClient(BaseJiraClient):
             "updated",
         ]
         issues = self.get_sprint_issues(sprint_id, fields=fields)
+        if issues is None:
+            return None
 
         # Tạo báo cáo tự định nghĩa
         custom_report = {
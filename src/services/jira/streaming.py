@@ -0,0 +1,295 @@
+import logging
+import time
+import requests
+import urllib3
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from src.services.jira.metrics import bind_metrics_scope, get_response_size
+
+try:
+    import ijson
+except ImportError:  # Không có ijson: vẫn trả về từng issue nhưng giải mã cả trang một lần
+    ijson = None
+
+logger = logging.getLogger("jirave.jira")
+
+# Số lần đọc lại một trang khi kết nối bị ngắt giữa chừng lúc đang giải mã
+STREAM_PAGE_ATTEMPTS = 2
+
+STREAM_ERRORS = (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, ValueError)
+if ijson is not None:
+    STREAM_ERRORS += (ijson.JSONError,)
+
+
+class SearchPageStream:
+    """Giải mã dần một trang kết quả search, trả về từng issue ngay khi đọc xong
+
+    Các giá trị total, startAt, maxResults được cập nhật trong lúc đọc; Jira trả về
+    chúng trước mảng issues nên đã có sẵn khi issue đầu tiên được yield.
+    """
+
+    def __init__(self, response):
+        """Khởi tạo stream
+
+        Args:
+            response (requests.Response): Response được gửi với stream=True
+        """
+        self.response = response
+        self.total = None
+        self.start_at = None
+        self.max_results = None
+
+    def _set_meta(self, name, value):
+        if name == "total":
+            self.total = int(value)
+        elif name == "startAt":
+            self.start_at = int(value)
+        elif name == "maxResults":
+            self.max_results = int(value)
+
+    def __iter__(self):
+        try:
+            if ijson is None:
+                data = self.response.json()
+                for name in ("total", "startAt", "maxResults"):
+                    if name in data:
+                        self._set_meta(name, data[name])
+                yield from data.get("issues", [])
+                return
+
+            self.response.raw.decode_content = True  # Giải nén gzip trước khi parse
+            builder = None
+            # use_float để số là float thay vì Decimal (pymongo không lưu được Decimal)
+            for prefix, event, value in ijson.parse(self.response.raw, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == "issues.item" and event == "end_map":
+                        yield builder.value
+                        builder = None
+                elif prefix == "issues.item" and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                elif event == "number":
+                    self._set_meta(prefix, value)
+        finally:
+            self.response.close()
+
+
+class IssueStream:
+    """Dòng issues của một JQL search: đọc lần lượt từng trang và trả về từng issue
+
+    Mặc định chỉ một trang được giữ mở tại một thời điểm và không issue nào được
+    giữ lại sau khi yield, nên bộ nhớ không tăng theo số lượng issues. Khi
+    prefetch > 1, sau trang đầu tiên (đã biết total) các trang tiếp theo được lấy
+    trước song song trong một cửa sổ prefetch trang, issues vẫn được trả về đúng
+    thứ tự; bộ nhớ khi đó tăng theo kích thước cửa sổ, không theo số issues.
+
+    Usage:
+        stream = client.iter_sprint_issues(sprint_id, profiles=["sync"])
+        for issue in stream:
+            ...  # stream.total có giá trị từ issue đầu tiên
+    """
+
+    def __init__(self, open_page, page_size=100, max_issues=-1, sizer=None, prefetch=1):
+        """Khởi tạo stream
+
+        Args:
+            open_page (callable): Hàm (start_at, page_size) -> requests.Response (stream=True) hoặc None
+            page_size (int): Số issues mỗi trang khi không có sizer
+            max_issues (int): Số issues tối đa, -1 để lấy tất cả
+            sizer (AdaptivePageSizer, optional): Chọn kích thước từng trang theo các trang trước
+            prefetch (int): Số trang được lấy trước song song sau trang đầu tiên, 1 để đọc tuần tự
+        """
+        self.open_page = open_page
+        self.page_size = page_size
+        self.max_issues = max_issues
+        self.sizer = sizer
+        self.prefetch = prefetch
+        self.total = None
+        self.count = 0
+        self.failed = False
+
+    def __iter__(self):
+        seen_ids = set()
+        start_at = 0
+
+        while True:
+            read = yield from self._stream_page(start_at, seen_ids)
+            if read is None:
+                return
+            position, page_size = read
+            if position == 0 or self.total is None or start_at + position >= self.total:
+                return
+            start_at += position
+
+            if self.prefetch > 1:
+                start_at = yield from self._prefetch_pages(start_at, page_size, seen_ids)
+                if start_at is None or start_at >= self.total:
+                    return
+
+    def _accept(self, issue, seen_ids):
+        """Bỏ issue đã trả về ở lần đọc trước hoặc bị dịch trang"""
+        issue_id = issue.get("id") or issue.get("key")
+        if issue_id in seen_ids:
+            return False
+        seen_ids.add(issue_id)
+        self.count += 1
+        return True
+
+    def _reached_max(self):
+        return self.max_issues != -1 and self.count >= self.max_issues
+
+    def _stream_page(self, start_at, seen_ids):
+        """Đọc dần một trang và trả về từng issue ngay khi giải mã xong
+
+        Returns:
+            tuple: (số issues đã đọc trong trang, kích thước trang Jira đã dùng),
+                None nếu stream phải dừng (lỗi hoặc đủ max_issues)
+        """
+        for attempt in range(STREAM_PAGE_ATTEMPTS):
+            page_size = self.sizer.next_size() if self.sizer else self.page_size
+            # Chỉ đo thời gian tới khi có response: thời gian đọc body còn phụ thuộc
+            # tốc độ xử lý của bên đọc stream
+            requested_at = time.monotonic()
+            response = self.open_page(start_at, page_size)
+            if response is None:
+                if self.sizer:
+                    self.sizer.observe_failure()
+                self.failed = True
+                return None
+            response_seconds = time.monotonic() - requested_at
+
+            page = SearchPageStream(response)
+            position = 0  # Số issues đã đọc trong trang
+            try:
+                for issue in page:
+                    position += 1
+                    if page.total is not None:
+                        self.total = page.total
+                    if not self._accept(issue, seen_ids):
+                        continue
+                    yield issue
+                    if self._reached_max():
+                        return None
+                if self.sizer:
+                    self.sizer.observe(
+                        page_size,
+                        page.max_results,
+                        position,
+                        get_response_size(response),
+                        response_seconds,
+                    )
+            except STREAM_ERRORS as e:
+                if self.sizer:
+                    self.sizer.observe_failure()
+                logger.warning(
+                    "Lỗi khi đọc trang startAt=%s (lần %s/%s): %s",
+                    start_at,
+                    attempt + 1,
+                    STREAM_PAGE_ATTEMPTS,
+                    e,
+                )
+                continue
+
+            if page.total is not None:
+                self.total = page.total
+            # Jira có thể trả về ít hơn maxResults đã yêu cầu nếu server giới hạn
+            return position, page.max_results or position
+
+        self.failed = True
+        return None
+
+    def _read_page(self, start_at, page_size):
+        """Đọc trọn một trang (chạy trong thread lấy trước)
+
+        Returns:
+            tuple: (issues, total, maxResults, số byte, thời gian tới khi có response),
+                None nếu không đọc được sau các lần thử
+        """
+        for attempt in range(STREAM_PAGE_ATTEMPTS):
+            requested_at = time.monotonic()
+            response = self.open_page(start_at, page_size)
+            if response is None:
+                return None
+            response_seconds = time.monotonic() - requested_at
+
+            page = SearchPageStream(response)
+            try:
+                issues = list(page)
+            except STREAM_ERRORS as e:
+                logger.warning(
+                    "Lỗi khi đọc trang startAt=%s (lần %s/%s): %s",
+                    start_at,
+                    attempt + 1,
+                    STREAM_PAGE_ATTEMPTS,
+                    e,
+                )
+                continue
+            return (
+                issues,
+                page.total,
+                page.max_results,
+                get_response_size(response),
+                response_seconds,
+            )
+        return None
+
+    def _prefetch_pages(self, start_at, page_size, seen_ids):
+        """Lấy trước song song các trang còn lại theo total đã biết, trả về issues đúng thứ tự
+
+        Giống get_sprint_issues, vị trí các trang được tính trước nên issue thêm vào
+        hoặc bỏ khỏi kết quả trong lúc đọc có thể làm dịch trang; issue trùng được
+        bỏ qua, phần còn thiếu ở cuối được đọc tiếp tuần tự.
+
+        Returns:
+            int: Vị trí đọc tiếp theo, None nếu stream phải dừng (lỗi hoặc đủ max_issues)
+        """
+        target = self.total
+        if self.max_issues != -1:
+            # Các issue trùng không được tính nên có thể cần đọc thêm phía sau
+            target = min(target, start_at + self.max_issues - self.count)
+        offsets = deque(range(start_at, target, page_size))
+        read_page = bind_metrics_scope(self._read_page)
+        pending = deque()
+
+        with ThreadPoolExecutor(
+            max_workers=self.prefetch, thread_name_prefix="jira-page"
+        ) as executor:
+            try:
+                while offsets or pending:
+                    while offsets and len(pending) < self.prefetch:
+                        offset = offsets.popleft()
+                        pending.append(
+                            (offset, executor.submit(read_page, offset, page_size))
+                        )
+
+                    offset, future = pending.popleft()
+                    result = future.result()
+                    if result is None:
+                        if self.sizer:
+                            self.sizer.observe_failure()
+                        self.failed = True
+                        return None
+
+                    issues, total, max_results, size, response_seconds = result
+                    if total is not None:
+                        self.total = total
+                    if self.sizer:
+                        self.sizer.observe(
+                            page_size, max_results, len(issues), size, response_seconds
+                        )
+                    for issue in issues:
+                        if not self._accept(issue, seen_ids):
+                            continue
+                        yield issue
+                        if self._reached_max():
+                            return None
+                    start_at = offset + len(issues)
+                    if not issues:
+                        # Kết quả search đã ngắn lại trong lúc đọc
+                        return start_at
+            finally:
+                # Bỏ các trang chưa bắt đầu khi bên đọc dừng sớm hoặc có lỗi
+                for _, future in pending:
+                    future.cancel()
+        return start_at
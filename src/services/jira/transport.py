@@ -0,0 +1,118 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from src.config.config import (
+    API_TOKEN,
+    EMAIL,
+    JIRA_POOL_CONNECTIONS,
+    JIRA_POOL_MAXSIZE,
+    JIRA_KEEP_ALIVE,
+    JIRA_CONNECT_TIMEOUT,
+    JIRA_READ_TIMEOUT,
+)
+
+
+class JiraTransport:
+    """Lớp vận chuyển HTTP dùng chung (keep-alive + connection pool) cho các Jira client
+
+    Một requests.Session duy nhất được chia sẻ giữa tất cả các client, nhờ đó
+    kết nối TCP/TLS tới Atlassian được tái sử dụng thay vì bắt tay lại mỗi request.
+    Connection pool của urllib3 an toàn khi dùng từ nhiều thread.
+    """
+
+    def __init__(
+        self,
+        auth=None,
+        pool_connections=JIRA_POOL_CONNECTIONS,
+        pool_maxsize=JIRA_POOL_MAXSIZE,
+        keep_alive=JIRA_KEEP_ALIVE,
+        connect_timeout=JIRA_CONNECT_TIMEOUT,
+        read_timeout=JIRA_READ_TIMEOUT,
+    ):
+        """Khởi tạo session với connection pool
+
+        Args:
+            auth (requests.auth.AuthBase, optional): Thông tin xác thực mặc định
+            pool_connections (int): Số host được giữ pool
+            pool_maxsize (int): Số kết nối tối đa được giữ cho mỗi host
+            keep_alive (bool): Giữ kết nối sau mỗi request hay không
+            connect_timeout (float): Timeout khi mở kết nối (giây)
+            read_timeout (float): Timeout khi đọc response (giây)
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.auth = auth
+        self.session.headers.update(
+            {
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            }
+        )
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,  # Chờ khi pool đầy thay vì mở thêm kết nối ngoài pool
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        """Gửi request qua session dùng chung
+
+        Args:
+            method (str): Phương thức HTTP (GET, POST, PUT, ...)
+            url (str): URL đầy đủ
+            **kwargs: Các tham số khác của requests (params, json, headers, auth, ...)
+
+        Returns:
+            requests.Response: Response từ server
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """Gửi GET request qua session dùng chung"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Gửi POST request qua session dùng chung"""
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        """Gửi PUT request qua session dùng chung"""
+        return self.request("PUT", url, **kwargs)
+
+    def close(self):
+        """Đóng tất cả kết nối trong pool"""
+        self.session.close()
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """Lấy transport dùng chung cho toàn bộ process (khởi tạo lười, thread-safe)
+
+    Returns:
+        JiraTransport: Transport dùng chung
+    """
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = JiraTransport(auth=HTTPBasicAuth(EMAIL, API_TOKEN))
+    return _transport
+
+
+def reset_transport():
+    """Đóng và bỏ transport hiện tại (ví dụ khi thay đổi thông tin xác thực)"""
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+        _transport = None
@@ -6,6 +6,7 @@ to maintain compatibility with existing code.
 
 from src.services.jira.jira_client_facade import JiraClientFacade
 from src.services.jira.sprint_client import SprintClient
+from src.services.jira.transport import get_transport
 import os
 import streamlit as st
 import requests
@@ -36,12 +37,16 @@ class JiraClientLegacy:
             "Accept": "application/json",
             "Content-Type": "application/json",
         }
+        # Dùng chung connection pool với JiraClientFacade
+        self.transport = get_transport()
 
         # Kiểm tra thông tin xác thực
         self._validate_credentials()
 
         # Khởi tạo sprint_client (sprint_client sử dụng Agile API)
-        self.sprint_client = SprintClient(self.url, self.auth, self.headers)
+        self.sprint_client = SprintClient(
+            self.url, self.auth, self.headers, self.transport
+        )
 
     def _validate_credentials(self):
         """Kiểm tra thông tin xác thực Jira API"""
@@ -90,7 +95,7 @@ class JiraClientLegacy:
             else:
                 url = f"{self.url}/rest/api/3/{endpoint}"
 
-            response = requests.get(
+            response = self.transport.get(
                 url, auth=self.auth, headers=self.headers, params=params
             )
 
@@ -253,17 +258,19 @@ class JiraClientLegacy:
 class SprintClient:
     """Client kết nối đến Jira Sprint API (Agile API)"""
 
-    def __init__(self, url, auth, headers):
+    def __init__(self, url, auth, headers, transport=None):
         """Khởi tạo kết nối đến Jira Sprint API
 
         Args:
             url (str): URL của Jira
             auth (requests.auth.HTTPBasicAuth): Thông tin xác thực
             headers (dict): Headers cho request
+            transport (JiraTransport, optional): Transport dùng chung. Mặc định dùng pool của process
         """
         self.url = url
         self.auth = auth
         self.headers = headers
+        self.transport = transport or get_transport()
 
     def get(self, endpoint, params=None, use_agile_api=True):
         """Gọi Jira Sprint API với phương thức GET
@@ -282,7 +289,7 @@ class SprintClient:
             else:
                 url = f"{self.url}/rest/api/3/{endpoint}"
 
-            response = requests.get(
+            response = self.transport.get(
                 url, auth=self.auth, headers=self.headers, params=params
             )
 
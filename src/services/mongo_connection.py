@@ -0,0 +1,218 @@
+import ssl
+import threading
+import time
+import pymongo
+from src.config.config import (
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_HEALTH_TTL_SECONDS,
+    MONGO_MAX_POOL_SIZE,
+)
+from src.services.issue_collection import SprintIssueCollection
+
+# Database chứa dữ liệu đồng bộ
+DATABASE_NAME = "data"
+
+
+def _connection_strategies(mongo_uri):
+    """Các cách kết nối được thử theo thứ tự mặc định
+
+    Returns:
+        list: Danh sách (tên, URI, tùy chọn của pymongo.MongoClient)
+    """
+    base_options = {
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+    }
+
+    # SSL context với các tùy chọn lỏng hơn
+    ssl_context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+
+    return [
+        # Phương pháp #3: URI không dùng SSL
+        ("#3", mongo_uri.replace("ssl=true", "ssl=false"), base_options),
+        (
+            "#1",
+            mongo_uri,
+            {
+                **base_options,
+                "tlsAllowInvalidCertificates": True,
+                "tlsAllowInvalidHostnames": True,
+                "ssl_context": ssl_context,
+            },
+        ),
+        # Phương pháp #2: SSL cert_reqs=CERT_NONE thay vì ssl_context
+        (
+            "#2",
+            mongo_uri,
+            {**base_options, "ssl": True, "ssl_cert_reqs": ssl.CERT_NONE},
+        ),
+    ]
+
+
+class MongoConnection:
+    """Kết nối MongoDB dùng chung trong process cho một URI
+
+    pymongo.MongoClient tự quản lý connection pool và kết nối lại, nên mọi
+    MongoDBClient (mọi trang, mọi phiên Streamlit, mọi thread) dùng chung một
+    client. Kết quả kiểm tra kết nối (ping) được giữ trong MONGO_HEALTH_TTL_SECONDS
+    giây thay vì ping trước mỗi lần đọc/ghi; lần kết nối thất bại cũng được giữ
+    trong khoảng đó để các trang không phải chờ timeout lại. Cách kết nối thành
+    công gần nhất được thử đầu tiên khi cần kết nối lại.
+    """
+
+    def __init__(self, mongo_uri, health_ttl=MONGO_HEALTH_TTL_SECONDS):
+        """Khởi tạo kết nối (chưa kết nối ngay)
+
+        Args:
+            mongo_uri (str): URI kết nối MongoDB
+            health_ttl (float): Số giây giữ kết quả kiểm tra kết nối
+        """
+        self.mongo_uri = mongo_uri
+        self.health_ttl = health_ttl
+        self.client = None
+        self.db = None
+        self.strategy = None
+        self.healthy = False
+        self.checked_at = None
+        self.last_error = None
+        self.lock = threading.Lock()
+        self._issue_collection = None
+        self._indexed = set()
+
+    def _is_fresh(self):
+        return self.checked_at is not None and (
+            time.monotonic() - self.checked_at < self.health_ttl
+        )
+
+    def connect(self, reporter, debug_uri=None):
+        """Kết nối nếu chưa có client
+
+        Args:
+            reporter (ProgressReporter): Nơi nhận thông báo lỗi kết nối
+            debug_uri (str, optional): URI đã che mật khẩu để ghi log
+
+        Returns:
+            tuple: (đã kết nối được hay chưa, kết nối mới được tạo trong lần gọi này)
+        """
+        with self.lock:
+            if self.client is not None:
+                return True, False
+            # Vừa kết nối thất bại thì không thử lại tất cả các cách cho tới hết TTL
+            if self._is_fresh():
+                return False, False
+
+            print(f"Đang kết nối đến MongoDB với URI: {debug_uri or '*****'}")
+            strategies = _connection_strategies(self.mongo_uri)
+            # Cách kết nối thành công gần nhất được thử trước
+            strategies.sort(key=lambda strategy: strategy[0] != self.strategy)
+            for name, uri, options in strategies:
+                client = None
+                try:
+                    print(f"Đang kết nối với phương pháp {name}...")
+                    client = pymongo.MongoClient(uri, **options)
+                    client.admin.command("ping")  # Test connection
+                except Exception as e:
+                    print(f"❌ Lỗi kết nối MongoDB với phương pháp {name}: {str(e)}")
+                    self.last_error = e
+                    if client is not None:
+                        client.close()
+                    continue
+
+                print(f"✅ Kết nối MongoDB thành công với phương pháp {name}!")
+                self.client = client
+                self.db = client[DATABASE_NAME]
+                self.strategy = name
+                self.healthy = True
+                self.checked_at = time.monotonic()
+                return True, True
+
+            self.healthy = False
+            self.checked_at = time.monotonic()
+            reporter.error(
+                f"Không thể kết nối đến MongoDB. Dữ liệu sẽ chỉ được lưu trên local. Lỗi: {str(self.last_error)}"
+            )
+            print(
+                f"❌ Không thể kết nối đến MongoDB sau khi thử tất cả các phương pháp: {str(self.last_error)}"
+            )
+            return False, False
+
+    def is_healthy(self, reporter):
+        """Kiểm tra kết nối, dùng kết quả đã lưu nếu còn trong TTL
+
+        Client không phản hồi bị đóng và bỏ đi để connect() tạo lại kết nối.
+
+        Args:
+            reporter (ProgressReporter): Nơi nhận thông báo lỗi kết nối
+
+        Returns:
+            bool: True nếu MongoDB phản hồi
+        """
+        client = self.client
+        if client is None:
+            return False
+        if self._is_fresh():
+            return self.healthy
+
+        try:
+            client.admin.command("ping")
+            healthy = True
+        except Exception as e:
+            healthy = False
+            self.last_error = e
+            reporter.error(f"Lỗi kết nối đến MongoDB: {str(e)}")
+            print(f"Lỗi kết nối đến MongoDB: {str(e)}")
+        with self.lock:
+            self.healthy = healthy
+            self.checked_at = time.monotonic()
+            if not healthy and self.client is client:
+                # Bỏ client hỏng để lần connect() sau (khi hết TTL) kết nối lại,
+                # thử cách kết nối thành công gần nhất trước
+                self.client = None
+                self.db = None
+                self._issue_collection = None
+                client.close()
+        return healthy
+
+    def get_issue_collection(self):
+        """Collection issues dùng chung (index chỉ được tạo một lần trong process)"""
+        with self.lock:
+            if self._issue_collection is None:
+                self._issue_collection = SprintIssueCollection(self.db)
+            return self._issue_collection
+
+    def ensure_indexes(self, name, create):
+        """Tạo index của một nhóm collection, chỉ một lần trong process
+
+        Args:
+            name (str): Tên nhóm index
+            create (callable): Hàm nhận database và tạo index
+        """
+        with self.lock:
+            if name not in self._indexed:
+                create(self.db)
+                self._indexed.add(name)
+
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def get_mongo_connection(mongo_uri):
+    """Lấy kết nối MongoDB dùng chung trong process cho một URI
+
+    Args:
+        mongo_uri (str): URI kết nối MongoDB
+
+    Returns:
+        MongoConnection: Kết nối dùng chung
+    """
+    with _connections_lock:
+        connection = _connections.get(mongo_uri)
+        if connection is None:
+            connection = MongoConnection(mongo_uri)
+            _connections[mongo_uri] = connection
+        return connection
@@ -0,0 +1,220 @@
+import logging
+import queue
+import streamlit as st
+
+
+def is_running_in_streamlit():
+    """Kiểm tra xem code có đang chạy trong một phiên Streamlit hay không
+
+    Returns:
+        bool: True nếu đang chạy trong script Streamlit (có script run context)
+    """
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        return get_script_run_ctx() is not None
+    except Exception:
+        return False
+
+
+def propagate_script_context(thread):
+    """Cho phép thread con gọi Streamlit trong cùng phiên với thread hiện tại
+
+    Phải gọi trước thread.start(). Không làm gì nếu không chạy trong Streamlit.
+
+    Args:
+        thread (threading.Thread): Thread chưa chạy
+    """
+    try:
+        from streamlit.runtime.scriptrunner import (
+            add_script_run_ctx,
+            get_script_run_ctx,
+        )
+
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            add_script_run_ctx(thread, ctx)
+    except Exception:
+        pass
+
+
+class ProgressReporter:
+    """Giao diện nhận thông báo và tiến trình từ tầng service
+
+    Các service (Jira client, đồng bộ, MongoDB) chỉ gọi reporter thay vì gọi
+    trực tiếp Streamlit. Lớp gốc bỏ qua tất cả, dùng khi không cần thông báo.
+    """
+
+    def toast(self, message, icon=None):
+        """Thông báo ngắn, không cần lưu lại (ví dụ: tiến trình tải trang)"""
+
+    def info(self, message):
+        """Thông báo thông tin"""
+
+    def success(self, message):
+        """Thông báo thành công"""
+
+    def warning(self, message):
+        """Cảnh báo"""
+
+    def error(self, message):
+        """Thông báo lỗi"""
+
+    def progress(self, current, total, text=""):
+        """Cập nhật tiến trình
+
+        Args:
+            current (int): Số phần tử đã xử lý
+            total (int): Tổng số phần tử
+            text (str, optional): Mô tả tiến trình
+        """
+
+    def clear_progress(self):
+        """Kết thúc hiển thị tiến trình"""
+
+    def show_data(self, label, data):
+        """Hiển thị dữ liệu gỡ lỗi
+
+        Args:
+            label (str): Tiêu đề
+            data: Dữ liệu (dict/list)
+        """
+
+
+class LogProgressReporter(ProgressReporter):
+    """Ghi thông báo và tiến trình ra logging, dùng cho đồng bộ chạy nền (cron/systemd)"""
+
+    # Chỉ ghi log tiến trình mỗi khi tăng thêm ít nhất chừng này phần trăm
+    PROGRESS_STEP = 10
+
+    def __init__(self, logger=None):
+        """Khởi tạo reporter
+
+        Args:
+            logger (logging.Logger, optional): Logger dùng để ghi, mặc định "jirave.sync"
+        """
+        self.logger = logger or logging.getLogger("jirave.sync")
+        self._last_percent = None
+
+    def toast(self, message, icon=None):
+        self.logger.debug(message)
+
+    def info(self, message):
+        self.logger.info(message)
+
+    def success(self, message):
+        self.logger.info(message)
+
+    def warning(self, message):
+        self.logger.warning(message)
+
+    def error(self, message):
+        self.logger.error(message)
+
+    def progress(self, current, total, text=""):
+        percent = int(current / total * 100) if total else 100
+        if (
+            self._last_percent is not None
+            and percent < 100
+            and percent - self._last_percent < self.PROGRESS_STEP
+        ):
+            return
+        self._last_percent = percent
+        self.logger.info(f"[{current}/{total}] {text}".rstrip())
+
+    def clear_progress(self):
+        self._last_percent = None
+
+    def show_data(self, label, data):
+        self.logger.debug(f"{label}: {data}")
+
+
+class StreamlitProgressReporter(ProgressReporter):
+    """Hiển thị thông báo và tiến trình trên giao diện Streamlit
+
+    Chỉ được gọi từ thread chạy script Streamlit.
+    """
+
+    def __init__(self):
+        self._progress_bar = None
+
+    def toast(self, message, icon=None):
+        st.toast(message, icon=icon)
+
+    def info(self, message):
+        st.info(message)
+
+    def success(self, message):
+        st.success(message)
+
+    def warning(self, message):
+        st.warning(message)
+
+    def error(self, message):
+        st.error(message)
+
+    def progress(self, current, total, text=""):
+        if self._progress_bar is None:
+            self._progress_bar = st.progress(0)
+        value = min(current / total, 1.0) if total else 1.0
+        self._progress_bar.progress(value, text=text or None)
+
+    def clear_progress(self):
+        if self._progress_bar is not None:
+            self._progress_bar.empty()
+            self._progress_bar = None
+
+    def show_data(self, label, data):
+        st.subheader(label)
+        st.json(data)
+
+
+class QueuedProgressReporter(ProgressReporter):
+    """Gom thông báo từ các worker thread để thread chính chuyển tiếp sang reporter thật
+
+    StreamlitProgressReporter chỉ dùng được trong thread chạy script, nên các
+    worker ghi vào hàng đợi và thread chính gọi drain() trong lúc chờ. Tiến trình
+    riêng của từng worker bị bỏ qua, thread chính tự báo tiến trình tổng.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def toast(self, message, icon=None):
+        self.queue.put(("toast", (message, icon)))
+
+    def info(self, message):
+        self.queue.put(("info", (message,)))
+
+    def success(self, message):
+        self.queue.put(("success", (message,)))
+
+    def warning(self, message):
+        self.queue.put(("warning", (message,)))
+
+    def error(self, message):
+        self.queue.put(("error", (message,)))
+
+    def drain(self, reporter):
+        """Chuyển các thông báo đang chờ sang reporter (gọi từ thread chính)
+
+        Args:
+            reporter (ProgressReporter): Reporter nhận thông báo
+        """
+        while True:
+            try:
+                name, args = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            getattr(reporter, name)(*args)
+
+
+def get_default_reporter():
+    """Chọn reporter phù hợp với môi trường đang chạy
+
+    Returns:
+        ProgressReporter: StreamlitProgressReporter trong phiên Streamlit, ngược lại LogProgressReporter
+    """
+    if is_running_in_streamlit():
+        return StreamlitProgressReporter()
+    return LogProgressReporter()
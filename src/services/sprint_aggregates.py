@@ -0,0 +1,484 @@
+from datetime import datetime
+from pymongo.errors import DuplicateKeyError
+
+# Phiên bản cấu trúc document tổng hợp; document khác phiên bản được tính lại từ issues
+AGGREGATE_VERSION = 1
+
+# Collection chứa document tổng hợp của từng sprint (_id sprint_{id}, như collection data)
+AGGREGATE_COLLECTION = "sprint_aggregates"
+
+# Các trường của issue dùng để tính số liệu tổng hợp
+AGGREGATE_FIELDS = [
+    "key",
+    "status",
+    "issue_type",
+    "assignee",
+    "dev_group",
+    "customer",
+    "feature",
+    "time_estimate",
+    "time_spent",
+    "sprint_time_spent",
+    "popup",
+    "show_in_dashboard",
+    "show_in_dashboard_final",
+    "completed",
+    "dev_done_date",
+]
+
+# Nhóm issues theo điều kiện hiển thị trong báo cáo (mỗi issue thuộc đúng một nhóm)
+SEGMENT_FINAL = "final"  # Show In Dashboard Final
+SEGMENT_TODO = "todo"  # To Do có Show In Dashboard, chưa có Show In Dashboard Final
+SEGMENT_LOGGED = "logged"  # Có Show In Dashboard và đã log time, không phải To Do
+SEGMENT_OTHER = "other"
+SEGMENTS = (SEGMENT_FINAL, SEGMENT_TODO, SEGMENT_LOGGED, SEGMENT_OTHER)
+
+# Các trường khóa của một ô tổng hợp
+CELL_FIELDS = ("segment", "dev_group", "assignee")
+
+# Các tổng số của một ô, và các bảng đếm theo giá trị của một trường
+TOTAL_FIELDS = (
+    "issues",
+    "popup",
+    "dashboard_final",
+    "time_estimate",
+    "time_spent",
+    "sprint_time_spent",
+)
+MAP_FIELDS = (
+    "status",
+    "issue_type",
+    "customer",
+    "feature",
+    "time_category",
+    "completed",
+    "dev_done_date",
+)
+
+# Số chữ số thập phân giữ lại của số giờ (tránh sai số khi cộng trừ nhiều lần)
+HOURS_PRECISION = 4
+
+
+def _truthy(value):
+    """Giá trị đúng theo cùng quy tắc với điều kiện lọc của Sprint Report"""
+    return value not in (False, None, 0, "")
+
+
+def _yes(value):
+    return value is True or (isinstance(value, str) and value.upper() == "YES")
+
+
+def _hours(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def _value(value):
+    """Giá trị dùng làm khóa bảng đếm (giá trị không hash được chuyển thành chuỗi)"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def issue_segment(issue):
+    """Nhóm hiển thị của issue trong báo cáo (SEGMENT_*)"""
+    if _truthy(issue.get("show_in_dashboard_final")):
+        return SEGMENT_FINAL
+    if _truthy(issue.get("show_in_dashboard")):
+        if issue.get("status") == "To Do":
+            return SEGMENT_TODO
+        if _hours(issue.get("time_spent")) > 0:
+            return SEGMENT_LOGGED
+    return SEGMENT_OTHER
+
+
+def time_category(issue):
+    """Loại thời gian đã log của issue: non_dev, popup hoặc development"""
+    if not _yes(issue.get("show_in_dashboard")):
+        return "non_dev"
+    if _yes(issue.get("popup")):
+        return "popup"
+    return "development"
+
+
+def issue_contribution(issue):
+    """Phần đóng góp của một issue vào số liệu tổng hợp
+
+    Hai issue có cùng phần đóng góp thì thay đổi giữa chúng không ảnh hưởng số
+    liệu tổng hợp, nên chỉ các issues có phần đóng góp khác được cộng/trừ lại.
+
+    Args:
+        issue (dict): Issue đã xử lý (như được lưu trong collection issues)
+
+    Returns:
+        dict: Các giá trị đã chuẩn hóa dùng để tính tổng hợp
+    """
+    time_estimate = _hours(issue.get("time_estimate"))
+    time_spent = _hours(issue.get("time_spent"))
+    sprint_time_spent = _hours(issue.get("sprint_time_spent"))
+    if time_estimate > time_spent:
+        schedule = "ahead"
+    elif time_estimate < time_spent:
+        schedule = "behind"
+    else:
+        schedule = "on"
+    return {
+        "segment": issue_segment(issue),
+        "dev_group": _value(issue.get("dev_group")),
+        "assignee": _value(issue.get("assignee")),
+        "status": _value(issue.get("status")),
+        "issue_type": _value(issue.get("issue_type")),
+        "customer": _value(issue.get("customer")),
+        "feature": _value(issue.get("feature")),
+        "time_category": time_category(issue) if sprint_time_spent > 0 else None,
+        "completed": _value(issue.get("completed")),
+        "dev_done_date": _value(issue.get("dev_done_date")),
+        "schedule": schedule,
+        "popup": issue.get("popup") is True,
+        "dashboard_final": issue.get("show_in_dashboard_final") is True,
+        "time_estimate": time_estimate,
+        "time_spent": time_spent,
+        "sprint_time_spent": sprint_time_spent,
+    }
+
+
+def _bump(counter, field, amount):
+    value = counter.get(field, 0) + amount
+    counter[field] = round(value, HOURS_PRECISION) if isinstance(value, float) else value
+
+
+def _merge_counter(target, counter, sign=1):
+    for field, amount in counter.items():
+        _bump(target, field, sign * amount)
+
+
+def _merge_map(target, entries, sign=1):
+    for value, counter in entries.items():
+        entry = target.setdefault(value, {})
+        _merge_counter(entry, counter, sign)
+        if entry.get("issues", 0) == 0:
+            del target[value]
+            continue
+        for field in [field for field, amount in entry.items() if amount == 0]:
+            del entry[field]
+
+
+def _empty_cell():
+    return {
+        **{field: 0 for field in TOTAL_FIELDS},
+        **{field: {} for field in MAP_FIELDS},
+    }
+
+
+class SprintAggregates:
+    """Số liệu tổng hợp của một sprint, chia theo ô (nhóm hiển thị, dev_group, assignee)
+
+    Mỗi ô giữ tổng số issues/giờ và các bảng đếm theo status, loại issue, customer,
+    feature, loại thời gian đã log và thời điểm hoàn thành (completed, dev_done_date).
+    Mọi số liệu đều cộng được, nên tổng hợp theo bộ lọc của báo cáo là cộng các ô
+    tương ứng (select), và cập nhật một issue là trừ phần đóng góp cũ rồi cộng phần mới.
+    """
+
+    def __init__(self, cells=None):
+        """Khởi tạo số liệu tổng hợp
+
+        Args:
+            cells (dict, optional): Mapping (segment, dev_group, assignee) -> ô
+        """
+        self.cells = cells or {}
+
+    @classmethod
+    def from_issues(cls, issues):
+        """Tính số liệu tổng hợp từ danh sách issues"""
+        aggregates = cls()
+        for issue in issues:
+            aggregates.add(issue_contribution(issue))
+        return aggregates
+
+    @property
+    def total_issues(self):
+        """Tổng số issues của sprint"""
+        return sum(cell["issues"] for cell in self.cells.values())
+
+    def add(self, contribution, sign=1):
+        """Cộng (sign=1) hoặc trừ (sign=-1) phần đóng góp của một issue
+
+        Args:
+            contribution (dict): Kết quả của issue_contribution()
+            sign (int): 1 để cộng, -1 để trừ
+        """
+        cell_key = tuple(contribution[field] for field in CELL_FIELDS)
+        cell = self.cells.setdefault(cell_key, _empty_cell())
+
+        hours = {
+            "time_estimate": contribution["time_estimate"],
+            "time_spent": contribution["time_spent"],
+            "sprint_time_spent": contribution["sprint_time_spent"],
+        }
+        _merge_counter(
+            cell,
+            {
+                "issues": 1,
+                "popup": int(contribution["popup"]),
+                "dashboard_final": int(contribution["dashboard_final"]),
+                **hours,
+            },
+            sign,
+        )
+        entries = {
+            "status": {"issues": 1, contribution["schedule"]: 1, **hours},
+            "issue_type": {"issues": 1},
+            "customer": {"issues": 1},
+            "feature": {"issues": 1},
+            "completed": {"issues": 1, "time_estimate": contribution["time_estimate"]},
+            "dev_done_date": {
+                "issues": 1,
+                "time_estimate": contribution["time_estimate"],
+            },
+        }
+        if contribution["time_category"] is not None:
+            entries["time_category"] = {
+                "issues": 1,
+                "sprint_time_spent": contribution["sprint_time_spent"],
+            }
+        for field, counter in entries.items():
+            _merge_map(cell[field], {contribution[field]: counter}, sign)
+
+        if cell["issues"] == 0:
+            del self.cells[cell_key]
+
+    def select(self, segments=None, dev_groups=None, assignee=None):
+        """Cộng các ô thỏa bộ lọc của báo cáo
+
+        Args:
+            segments (list, optional): Các nhóm hiển thị (SEGMENT_*), mặc định tất cả
+            dev_groups (list, optional): Các dev_group, mặc định tất cả
+            assignee (str, optional): Chỉ lấy assignee này, mặc định tất cả
+
+        Returns:
+            dict: Tổng số, các bảng đếm (MAP_FIELDS), cùng "assignees" (tổng số,
+                status, time_category của từng assignee) và "dev_groups"
+        """
+        result = _empty_cell()
+        result["assignees"] = {}
+        result["dev_groups"] = {}
+        for (segment, dev_group, cell_assignee), cell in self.cells.items():
+            if segments is not None and segment not in segments:
+                continue
+            if dev_groups is not None and dev_group not in dev_groups:
+                continue
+            if assignee is not None and cell_assignee != assignee:
+                continue
+
+            totals = {field: cell[field] for field in TOTAL_FIELDS}
+            _merge_counter(result, totals)
+            for field in MAP_FIELDS:
+                _merge_map(result[field], cell[field])
+
+            per_assignee = result["assignees"].setdefault(
+                cell_assignee, {"status": {}, "time_category": {}}
+            )
+            _merge_counter(per_assignee, totals)
+            _merge_map(per_assignee["status"], cell["status"])
+            _merge_map(per_assignee["time_category"], cell["time_category"])
+            _merge_counter(result["dev_groups"].setdefault(dev_group, {}), totals)
+        return result
+
+    def to_document(self):
+        """Chuyển sang document MongoDB (bảng đếm lưu dạng danh sách vì giá trị
+        như tên assignee có thể chứa dấu chấm, không dùng được làm tên trường)"""
+        cells = []
+        for cell_key, cell in self.cells.items():
+            document = dict(zip(CELL_FIELDS, cell_key))
+            document.update({field: cell[field] for field in TOTAL_FIELDS})
+            for field in MAP_FIELDS:
+                document[field] = [
+                    {"value": value, **counter} for value, counter in cell[field].items()
+                ]
+            cells.append(document)
+        return {
+            "version": AGGREGATE_VERSION,
+            "total_issues": self.total_issues,
+            "cells": cells,
+        }
+
+    @classmethod
+    def from_document(cls, document):
+        """Đọc từ document MongoDB
+
+        Returns:
+            SprintAggregates: Số liệu tổng hợp, None nếu document khác phiên bản
+        """
+        if not document or document.get("version") != AGGREGATE_VERSION:
+            return None
+        cells = {}
+        for stored in document.get("cells", []):
+            cell = {field: stored.get(field, 0) for field in TOTAL_FIELDS}
+            for field in MAP_FIELDS:
+                cell[field] = {
+                    entry["value"]: {
+                        name: amount for name, amount in entry.items() if name != "value"
+                    }
+                    for entry in stored.get(field, [])
+                }
+            cells[tuple(stored.get(field) for field in CELL_FIELDS)] = cell
+        return cls(cells)
+
+
+class SprintAggregateUpdater:
+    """Cập nhật số liệu tổng hợp trong lúc SprintIssueWriter ghi issues của sprint
+
+    Khi có số liệu tổng hợp của lần lưu trước (cùng phiên bản, khớp số issues đã
+    lưu), chỉ các issues có phần đóng góp thay đổi, issues mới và issues đã rời
+    sprint được trừ/cộng lại. Nếu không, số liệu được tính lại từ toàn bộ issues.
+    """
+
+    def __init__(self, previous=None):
+        """Khởi tạo bộ cập nhật
+
+        Args:
+            previous (SprintAggregates, optional): Số liệu của lần lưu trước
+        """
+        self.previous = previous
+        self.stored = {}
+        self.current = {}
+        self.removed = set()
+
+    def start(self, stored_count):
+        """Bắt đầu với số issues đã lưu mà bộ ghi đọc được
+
+        Args:
+            stored_count (int): Số issues đã lưu, None nếu bộ ghi không đọc issues đã
+                lưu (khi đó số liệu được tính lại toàn bộ)
+        """
+        if self.previous is not None and self.previous.total_issues != stored_count:
+            self.previous = None
+
+    @property
+    def incremental(self):
+        """Cập nhật từ số liệu lần trước thay vì tính lại toàn bộ"""
+        return self.previous is not None
+
+    def observe(self, key, stored, issue):
+        """Ghi nhận một issue được thêm vào bộ ghi
+
+        Args:
+            key (str): Key của issue
+            stored (dict): Issue đã lưu cùng key, None nếu là issue mới
+            issue (dict): Issue sẽ được lưu
+        """
+        if stored is not None and key not in self.stored:
+            self.stored[key] = issue_contribution(stored)
+        self.current[key] = issue_contribution(issue)
+
+    def forget(self, key, stored):
+        """Ghi nhận một issue đã rời sprint
+
+        Args:
+            key (str): Key của issue
+            stored (dict): Issue đã lưu
+        """
+        self.stored[key] = issue_contribution(stored)
+        self.removed.add(key)
+
+    def result(self):
+        """Số liệu tổng hợp sau khi bộ ghi đã nhận đủ issues
+
+        Returns:
+            tuple: (SprintAggregates, số issues đã được cộng/trừ lại)
+        """
+        if self.previous is None:
+            aggregates = SprintAggregates()
+            for contribution in self.current.values():
+                aggregates.add(contribution)
+            return aggregates, len(self.current)
+
+        aggregates = self.previous
+        touched = 0
+        for key, contribution in self.current.items():
+            old = self.stored.get(key)
+            if old == contribution:
+                continue
+            if old is not None:
+                aggregates.add(old, -1)
+            aggregates.add(contribution)
+            touched += 1
+        for key in self.removed:
+            aggregates.add(self.stored[key], -1)
+            touched += 1
+        return aggregates, touched
+
+
+class SprintAggregateStore:
+    """Document tổng hợp của từng sprint, lưu cạnh collection issues
+
+    Document được đánh dấu pending khi bắt đầu ghi issues của sprint và bỏ đánh
+    dấu khi lưu xong, nên lần đồng bộ bị gián đoạn không để lại số liệu không khớp:
+    lần sau số liệu được tính lại từ toàn bộ issues.
+    """
+
+    def __init__(self, db):
+        """Khởi tạo store
+
+        Args:
+            db (pymongo.database.Database): Database MongoDB (MongoDBClient.db)
+        """
+        self.collection = db[AGGREGATE_COLLECTION]
+
+    @staticmethod
+    def _document_id(sprint_id):
+        return f"sprint_{sprint_id}"
+
+    def load(self, sprint_id):
+        """Đọc số liệu tổng hợp đã lưu của sprint
+
+        Returns:
+            tuple: (SprintAggregates hoặc None nếu chưa có/khác phiên bản, đang pending)
+        """
+        document = self.collection.find_one({"_id": self._document_id(sprint_id)})
+        pending = bool(document and document.get("pending"))
+        return SprintAggregates.from_document(document), pending
+
+    def begin(self, sprint_id):
+        """Đánh dấu pending và tạo bộ cập nhật cho lần ghi issues của sprint
+
+        Returns:
+            SprintAggregateUpdater: Bộ cập nhật, truyền vào SprintIssueWriter
+        """
+        previous, pending = self.load(sprint_id)
+        self.collection.update_one(
+            {"_id": self._document_id(sprint_id)},
+            {"$set": {"pending": True}},
+            upsert=True,
+        )
+        return SprintAggregateUpdater(None if pending else previous)
+
+    def save(self, sprint_id, aggregates, if_not_pending=False):
+        """Lưu số liệu tổng hợp của sprint và bỏ đánh dấu pending
+
+        Args:
+            sprint_id (int | str): ID của sprint
+            aggregates (SprintAggregates): Số liệu tổng hợp
+            if_not_pending (bool): Không ghi đè khi sprint đang được ghi issues
+
+        Returns:
+            bool: True nếu đã lưu
+        """
+        document = {
+            **aggregates.to_document(),
+            "sprint_id": sprint_id,
+            "pending": False,
+            "updated_at": datetime.now(),
+        }
+        selector = {"_id": self._document_id(sprint_id)}
+        if if_not_pending:
+            selector["pending"] = {"$ne": True}
+        try:
+            self.collection.replace_one(selector, document, upsert=True)
+        except DuplicateKeyError:
+            # Document đang pending (không khớp selector nên upsert bị trùng _id)
+            return False
+        return True
+
+    def delete(self, sprint_id):
+        """Xóa số liệu tổng hợp của sprint"""
+        self.collection.delete_one({"_id": self._document_id(sprint_id)})
@@ -0,0 +1,212 @@
+from datetime import datetime, timezone
+from src.config.config import FINAL_STATUS_LIST
+
+# Các trạng thái được coi là "Dev Done" khi tính ngày hoàn thành phát triển
+DEV_DONE_STATUSES = ("Dev Done", "Deployed", "Done")
+TEST_DONE_STATUSES = ("Test Done",)
+
+
+def parse_jira_datetime(value):
+    """Chuyển chuỗi thời gian của Jira thành datetime có múi giờ
+
+    Args:
+        value (str): Chuỗi thời gian (ví dụ: 2024-05-01T10:00:00.000+0700)
+
+    Returns:
+        datetime: Thời gian đã chuyển đổi, None nếu không hợp lệ
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return None
+
+
+class StatusChange:
+    """Một lần chuyển trạng thái trong changelog"""
+
+    __slots__ = ("date", "created", "from_status", "to_status", "in_sprint")
+
+    def __init__(self, date, created, from_status, to_status, in_sprint):
+        self.date = date
+        self.created = created  # Chuỗi thời gian gốc của Jira
+        self.from_status = from_status
+        self.to_status = to_status
+        self.in_sprint = in_sprint
+
+
+class ChangelogAnalysis:
+    """Kết quả phân tích changelog của một issue
+
+    Attributes:
+        status_changes (list): Các StatusChange theo thứ tự thời gian tăng dần
+        last_status_in_sprint (str): Trạng thái cuối cùng trong khoảng thời gian sprint
+        first_transitions (dict): Trạng thái -> StatusChange đầu tiên chuyển sang trạng thái đó
+        last_transitions (dict): Trạng thái -> StatusChange gần nhất chuyển sang trạng thái đó
+        time_in_status (dict): Trạng thái -> tổng số giây issue ở trạng thái đó
+        reopen_count (int): Số lần chuyển từ trạng thái hoàn thành về trạng thái chưa hoàn thành
+    """
+
+    def __init__(self, status_changes, created=None, now=None, final_statuses=None):
+        """Tính các giá trị dẫn xuất từ danh sách chuyển trạng thái
+
+        Args:
+            status_changes (list): Các StatusChange theo thứ tự thời gian tăng dần
+            created (datetime, optional): Thời gian tạo issue, để tính thời gian ở trạng thái ban đầu
+            now (datetime, optional): Mốc tính thời gian ở trạng thái hiện tại, mặc định là hiện tại
+            final_statuses (iterable, optional): Các trạng thái hoàn thành, mặc định FINAL_STATUS_LIST
+        """
+        final_statuses = set(final_statuses or FINAL_STATUS_LIST)
+        now = now or datetime.now(timezone.utc)
+
+        self.status_changes = status_changes
+        self.last_status_in_sprint = None
+        self.first_transitions = {}
+        self.last_transitions = {}
+        self.time_in_status = {}
+        self.reopen_count = 0
+
+        previous_date = created
+        for change in status_changes:
+            if change.in_sprint:
+                self.last_status_in_sprint = change.to_status
+            self.first_transitions.setdefault(change.to_status, change)
+            self.last_transitions[change.to_status] = change
+
+            if change.from_status and previous_date and change.date >= previous_date:
+                self._add_time(
+                    change.from_status, (change.date - previous_date).total_seconds()
+                )
+            previous_date = change.date
+
+            if (
+                change.from_status in final_statuses
+                and change.to_status not in final_statuses
+            ):
+                self.reopen_count += 1
+
+        if status_changes and previous_date and now >= previous_date:
+            self._add_time(
+                status_changes[-1].to_status, (now - previous_date).total_seconds()
+            )
+
+    def _add_time(self, status, seconds):
+        self.time_in_status[status] = self.time_in_status.get(status, 0.0) + seconds
+
+    def last_transition_in_sprint(self, statuses):
+        """Lấy lần chuyển gần nhất trong sprint sang một trong các trạng thái
+
+        Args:
+            statuses (iterable): Các trạng thái cần tìm
+
+        Returns:
+            StatusChange: Lần chuyển trạng thái, None nếu không có
+        """
+        for change in reversed(self.status_changes):
+            if change.in_sprint and change.to_status in statuses:
+                return change
+        return None
+
+    def last_transition(self, statuses):
+        """Lấy lần chuyển gần nhất (không giới hạn thời gian sprint) sang một trong các trạng thái
+
+        Args:
+            statuses (iterable): Các trạng thái cần tìm, theo thứ tự ưu tiên
+
+        Returns:
+            StatusChange: Lần chuyển của trạng thái đầu tiên có trong changelog, None nếu không có
+        """
+        for status in statuses:
+            if status in self.last_transitions:
+                return self.last_transitions[status]
+        return None
+
+    def time_in_status_summary(self):
+        """Tổng thời gian ở từng trạng thái dạng danh sách để lưu MongoDB
+
+        Returns:
+            list: Danh sách {"status", "hours"} theo thời gian giảm dần
+        """
+        return [
+            {"status": status, "hours": round(seconds / 3600, 2)}
+            for status, seconds in sorted(
+                self.time_in_status.items(), key=lambda item: item[1], reverse=True
+            )
+        ]
+
+
+def analyze_changelog(
+    changelog_data, sprint_start=None, sprint_end=None, created=None, now=None
+):
+    """Phân tích changelog của issue trong một lần duyệt
+
+    Mỗi thời gian trong lịch sử chỉ được chuyển đổi một lần. Thay đổi chỉ được
+    tính là "trong sprint" khi có đủ thời gian bắt đầu và kết thúc sprint.
+
+    Args:
+        changelog_data (dict): Changelog của issue (có trường histories), có thể None
+        sprint_start (datetime, optional): Thời gian bắt đầu sprint
+        sprint_end (datetime, optional): Thời gian kết thúc sprint
+        created (str|datetime, optional): Thời gian tạo issue
+        now (datetime, optional): Mốc tính thời gian ở trạng thái hiện tại
+
+    Returns:
+        ChangelogAnalysis: Kết quả phân tích
+    """
+    has_window = sprint_start is not None and sprint_end is not None
+    status_changes = []
+
+    for history in (changelog_data or {}).get("histories", []) or []:
+        status_items = [
+            item for item in history.get("items", []) if item.get("field") == "status"
+        ]
+        if not status_items:
+            continue
+
+        created_raw = history.get("created", "")
+        history_date = parse_jira_datetime(created_raw)
+        if history_date is None:
+            continue
+        in_sprint = has_window and sprint_start <= history_date <= sprint_end
+
+        for item in status_items:
+            if not item.get("toString"):
+                continue
+            status_changes.append(
+                StatusChange(
+                    history_date,
+                    created_raw,
+                    item.get("fromString"),
+                    item.get("toString"),
+                    in_sprint,
+                )
+            )
+
+    # Jira có thể trả histories theo thứ tự tăng hoặc giảm dần; sort ổn định giữ thứ tự trong cùng history
+    status_changes.sort(key=lambda change: change.date)
+
+    if isinstance(created, str):
+        created = parse_jira_datetime(created)
+    return ChangelogAnalysis(status_changes, created=created, now=now)
+
+
+def get_sprint_window(sprint_info):
+    """Lấy khoảng thời gian của sprint
+
+    Args:
+        sprint_info (dict): Thông tin sprint từ Jira, có thể None
+
+    Returns:
+        tuple: (sprint_start, sprint_end), mỗi giá trị có thể None
+    """
+    if not sprint_info:
+        return None, None
+    return (
+        parse_jira_datetime(sprint_info.get("startDate")),
+        parse_jira_datetime(sprint_info.get("endDate")),
+    )
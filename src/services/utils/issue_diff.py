@@ -0,0 +1,48 @@
+class IssueDiff:
+    """Khác biệt giữa danh sách issues đã lưu và danh sách issues mới của một sprint
+
+    Attributes:
+        added (list): Issues mới chưa có trong dữ liệu đã lưu
+        removed (list): Key của các issues đã rời sprint
+        modified (dict): Issue key -> (tên các trường đã đổi, các trường cần $unset)
+    """
+
+    def __init__(self, added, removed, modified):
+        self.added = added
+        self.removed = removed
+        self.modified = modified
+
+    def summary(self):
+        """Tóm tắt thay đổi để lưu vào document sprint
+
+        Returns:
+            dict: {"added", "removed", "modified"} - danh sách key, riêng modified là
+                mapping issue key -> các trường đã thay đổi
+        """
+        return {
+            "added": [issue.get("key") for issue in self.added],
+            "removed": list(self.removed),
+            "modified": {
+                key: sorted(set(changed) | set(unset))
+                for key, (changed, unset) in self.modified.items()
+            },
+        }
+
+
+def diff_issue_fields(old, new):
+    """So sánh từng trường của một issue đã lưu với bản mới
+
+    Args:
+        old (dict): Issue đã lưu
+        new (dict): Issue mới
+
+    Returns:
+        tuple: (các trường cần $set kèm giá trị mới, danh sách trường cần $unset)
+    """
+    changed = {
+        field: value
+        for field, value in new.items()
+        if field not in old or old[field] != value
+    }
+    unset = [field for field in old if field not in new]
+    return changed, unset
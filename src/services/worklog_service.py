@@ -1,5 +1,6 @@
 import streamlit as st
 from src.services.jira_client import JiraClient
+from src.services.jira.async_client import fetch_issues_worklogs
 from src.config.config import DEFAULT_PROJECT
 from datetime import datetime, date
 from src.utils.date_utils import get_current_time
@@ -70,8 +71,9 @@ class WorklogReport:
 
         try:
             # Get issues with worklogs
+            # Worklog chi tiết được lấy riêng nên search chỉ cần các trường của profile
             issues = self.jira.search_issues(
-                jql=jql, fields=["worklog", "summary", "assignee"], max_results=1000
+                jql=jql, max_results=1000, profiles=["worklog_report"]
             )
 
             if not issues:
@@ -101,15 +103,30 @@ class WorklogReport:
             "by_issue": {},  # Issue details with worklogs
             "daily_summary": {},  # Hours by date and user
             "total_hours": 0,  # Total hours across all users
+            "failed_issues": [],  # Issues whose worklogs could not be fetched
         }
 
+        # Fetch detailed worklogs of all issues concurrently
+        worklogs_by_issue = fetch_issues_worklogs([issue["key"] for issue in issues])
+
+        # Số giờ của các issues không lấy được worklog bị thiếu trong báo cáo
+        failed_keys = [
+            issue["key"] for issue in issues if worklogs_by_issue.get(issue["key"]) is None
+        ]
+        if failed_keys:
+            worklog_data["failed_issues"] = failed_keys
+            st.warning(
+                f"Không lấy được worklog của {len(failed_keys)} issues, tổng giờ có thể "
+                f"thiếu: {', '.join(failed_keys)}"
+            )
+
         # Process each issue
         for issue in issues:
             issue_id = issue["id"]
             issue_key = issue["key"]
 
             # Get detailed worklogs for this issue
-            worklogs = self.jira.get_issue_worklogs(issue_key)
+            worklogs = worklogs_by_issue.get(issue_key) or []
 
             if not worklogs:
                 continue
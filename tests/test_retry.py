@@ -0,0 +1,178 @@
+import time
+from itertools import count
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.services.jira import retry
+from src.services.jira.base_client import BaseJiraClient
+from src.services.jira.retry import (
+    RetryPolicy,
+    TokenBucket,
+    classify_endpoint,
+    get_server_delay,
+)
+
+# Mỗi test dùng một host riêng để token bucket và limiter dùng chung không ảnh hưởng nhau
+_hosts = count()
+
+
+def make_response(status_code, headers=None, body=b"{}"):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body
+    response._content_consumed = True
+    response.url = "https://jira.test/rest/api/3/search"
+    return response
+
+
+class FakeSession:
+    def __init__(self):
+        self.auth = ("user", "token")
+        self.headers = {"Accept": "application/json"}
+
+
+class FakeTransport:
+    """Transport trả lần lượt các kết quả cho trước (response hoặc exception)"""
+
+    def __init__(self, results):
+        self.session = FakeSession()
+        self.results = list(results)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class FakeReporter:
+    def __init__(self):
+        self.errors = []
+
+    def error(self, message):
+        self.errors.append(message)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Không chờ thật, ghi lại các khoảng thời gian chờ"""
+    calls = []
+    monkeypatch.setattr(time, "sleep", calls.append)
+    return calls
+
+
+def send(results, endpoint_class="search"):
+    transport = FakeTransport(results)
+    reporter = FakeReporter()
+    client = BaseJiraClient(transport=transport, cache=object(), reporter=reporter)
+    url = f"https://retry-{next(_hosts)}.test/rest/api/3/search"
+    error_codes = []
+    response, retries = client._send_with_retries("GET", url, endpoint_class, error_codes)
+    return response, retries, error_codes, transport, reporter
+
+
+def test_backoff_is_capped_by_max_delay():
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+    for attempt in range(10):
+        assert 0 <= policy.backoff(attempt) <= min(5, 2**attempt)
+
+
+def test_delay_prefers_retry_after_header():
+    policy = RetryPolicy(base_delay=100, max_delay=60)
+    delay = policy.delay_for(make_response(429, {"Retry-After": "3"}), attempt=0)
+    assert 3 <= delay <= 3.5
+
+
+def test_server_delay_from_exhausted_rate_limit():
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "7"}
+    assert get_server_delay(headers) == 7
+    # Còn request trong hạn mức: không cần chờ
+    assert get_server_delay({**headers, "X-RateLimit-Remaining": "5"}) is None
+    assert get_server_delay({}) is None
+
+
+def test_classify_endpoint():
+    assert classify_endpoint("search?jql=x") == "search"
+    assert classify_endpoint("issue/ABC-1/changelog") == "issue"
+    assert classify_endpoint("sprint/1", use_agile_api=True) == "agile"
+    assert classify_endpoint("issue", method="POST") == "write"
+    assert classify_endpoint("field") == "default"
+
+
+def test_token_bucket_limits_burst(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(retry.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+    now[0] += 0.5
+    assert bucket.reserve() == 0
+
+
+def test_token_bucket_pauses_when_server_quota_is_exhausted(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(retry.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=10, capacity=10)
+
+    bucket.update_from_headers({"X-RateLimit-Remaining": "0", "Retry-After": "4"})
+    assert bucket.reserve() == pytest.approx(4)
+    now[0] += 4
+    assert bucket.reserve() == 0
+
+
+def test_retries_transient_status_then_succeeds(sleeps):
+    response, retries, error_codes, transport, reporter = send(
+        [make_response(503), make_response(502), make_response(200)]
+    )
+    assert response.status_code == 200
+    assert retries == 2
+    assert error_codes == [503, 502]
+    assert transport.calls == 3
+    assert len(sleeps) == 2
+    assert not reporter.errors
+
+
+def test_gives_up_after_max_retries(sleeps):
+    max_retries = retry.get_retry_policy("search").max_retries
+    response, retries, error_codes, transport, reporter = send(
+        [make_response(503) for _ in range(max_retries + 1)]
+    )
+    assert response is None
+    assert retries == max_retries
+    assert transport.calls == max_retries + 1
+    assert reporter.errors
+
+
+def test_client_error_is_not_retried(sleeps):
+    response, retries, error_codes, transport, reporter = send([make_response(404)])
+    assert response is None
+    assert retries == 0
+    assert error_codes == [404]
+    assert not sleeps
+
+
+def test_network_error_is_retried_for_reads(sleeps):
+    response, retries, _, _, _ = send(
+        [requests.exceptions.ConnectionError("reset"), make_response(200)]
+    )
+    assert response.status_code == 200
+    assert retries == 1
+
+
+def test_writes_are_not_retried_on_network_error(sleeps):
+    response, retries, error_codes, transport, reporter = send(
+        [requests.exceptions.ConnectionError("reset"), make_response(200)],
+        endpoint_class="write",
+    )
+    assert response is None
+    assert error_codes == ["network"]
+    assert transport.calls == 1
+    assert reporter.errors
@@ -0,0 +1,127 @@
+from src.services.sprint_aggregates import (
+    SEGMENT_FINAL,
+    SEGMENT_LOGGED,
+    SEGMENT_OTHER,
+    SEGMENT_TODO,
+    SprintAggregates,
+    SprintAggregateUpdater,
+    issue_contribution,
+    issue_segment,
+)
+
+
+def make_issue(key, **fields):
+    issue = {
+        "key": key,
+        "status": "In Progress",
+        "issue_type": "Task",
+        "assignee": "An",
+        "dev_group": "Backend",
+        "time_estimate": 4.0,
+        "time_spent": 2.0,
+        "sprint_time_spent": 1.5,
+        "show_in_dashboard": "YES",
+        "show_in_dashboard_final": None,
+        "popup": False,
+    }
+    issue.update(fields)
+    return issue
+
+
+ISSUES = [
+    make_issue("CLD-1"),
+    make_issue("CLD-2", assignee="Bình", status="To Do", time_spent=0),
+    make_issue("CLD-3", show_in_dashboard_final=True, popup=True),
+    make_issue("CLD-4", dev_group="Frontend", show_in_dashboard=None, time_spent=0.3),
+]
+
+
+def normalized(aggregates):
+    """Các ô so sánh được, không phụ thuộc thứ tự cộng"""
+    return {
+        key: {
+            field: value if not isinstance(value, float) else round(value, 4)
+            for field, value in cell.items()
+        }
+        for key, cell in aggregates.cells.items()
+    }
+
+
+def run_updater(previous, stored, issues, removed=()):
+    """Mô phỏng SprintIssueWriter: issues đã lưu, issues thêm lần này và issues rời sprint"""
+    updater = SprintAggregateUpdater(previous)
+    updater.start(len(stored))
+    for issue in issues:
+        updater.observe(issue["key"], stored.get(issue["key"]), issue)
+    for key in removed:
+        updater.forget(key, stored[key])
+    return updater.result()
+
+
+def test_issue_segment():
+    assert issue_segment(ISSUES[0]) == SEGMENT_LOGGED
+    assert issue_segment(ISSUES[1]) == SEGMENT_TODO
+    assert issue_segment(ISSUES[2]) == SEGMENT_FINAL
+    assert issue_segment(ISSUES[3]) == SEGMENT_OTHER
+
+
+def test_select_sums_matching_cells():
+    aggregates = SprintAggregates.from_issues(ISSUES)
+    assert aggregates.total_issues == 4
+
+    everything = aggregates.select()
+    assert everything["issues"] == 4
+    assert everything["popup"] == 1
+    assert everything["dashboard_final"] == 1
+    assert everything["time_estimate"] == 16
+    assert everything["status"]["To Do"]["issues"] == 1
+
+    backend = aggregates.select(dev_groups=["Backend"])
+    assert backend["issues"] == 3
+    assert set(backend["assignees"]) == {"An", "Bình"}
+
+    an_logged = aggregates.select(segments=[SEGMENT_LOGGED], assignee="An")
+    assert an_logged["issues"] == 1
+    assert an_logged["time_spent"] == 2.0
+
+
+def test_adding_and_removing_restores_empty_state():
+    aggregates = SprintAggregates.from_issues(ISSUES)
+    for issue in ISSUES:
+        aggregates.add(issue_contribution(issue), -1)
+    assert aggregates.cells == {}
+    assert aggregates.total_issues == 0
+
+
+def test_document_round_trip():
+    aggregates = SprintAggregates.from_issues(ISSUES)
+    restored = SprintAggregates.from_document(aggregates.to_document())
+    assert normalized(restored) == normalized(aggregates)
+    assert SprintAggregates.from_document({"version": -1}) is None
+
+
+def test_incremental_update_matches_full_recompute():
+    stored = {issue["key"]: issue for issue in ISSUES}
+    previous = SprintAggregates.from_issues(ISSUES)
+
+    updated = [
+        ISSUES[0],  # Không đổi
+        make_issue("CLD-2", assignee="Bình", status="Done", time_spent=3.0),
+        make_issue("CLD-3", show_in_dashboard_final=True, popup=True, time_spent=5.0),
+        make_issue("CLD-5", assignee="Chi"),  # Issue mới
+    ]
+    aggregates, touched = run_updater(previous, stored, updated, removed=["CLD-4"])
+
+    assert normalized(aggregates) == normalized(SprintAggregates.from_issues(updated))
+    # Chỉ các issues thay đổi, mới và đã rời sprint được cộng/trừ lại
+    assert touched == 4
+
+
+def test_updater_recomputes_when_previous_does_not_match_stored_count():
+    stored = {issue["key"]: issue for issue in ISSUES}
+    previous = SprintAggregates.from_issues(ISSUES[:2])
+
+    aggregates, touched = run_updater(previous, stored, ISSUES)
+
+    assert normalized(aggregates) == normalized(SprintAggregates.from_issues(ISSUES))
+    assert touched == len(ISSUES)
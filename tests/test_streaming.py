@@ -0,0 +1,126 @@
+import io
+import json
+import threading
+
+from src.services.jira.streaming import IssueStream, SearchPageStream
+
+
+class FakeResponse:
+    """Response stream=True tối giản: body JSON đọc qua raw hoặc json()"""
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload).encode("utf-8")
+        self.raw = io.BytesIO(self.body)
+        self.headers = {"Content-Length": str(len(self.body))}
+        self.closed = False
+
+    def json(self):
+        return json.loads(self.body)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSearch:
+    """Kết quả search phân trang theo startAt/maxResults như Jira"""
+
+    def __init__(self, issues, max_results=None, fail_at=()):
+        self.issues = issues
+        self.max_results = max_results
+        self.fail_at = set(fail_at)
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, start_at, page_size):
+        with self.lock:
+            self.requests.append(start_at)
+        if start_at in self.fail_at:
+            return None
+        size = min(page_size, self.max_results or page_size)
+        return FakeResponse(
+            {
+                "startAt": start_at,
+                "maxResults": size,
+                "total": len(self.issues),
+                "issues": self.issues[start_at : start_at + size],
+            }
+        )
+
+
+def make_issues(n):
+    return [{"id": str(i), "key": f"CLD-{i}"} for i in range(n)]
+
+
+def keys(issues):
+    return [issue["key"] for issue in issues]
+
+
+def test_page_stream_reads_meta_and_issues():
+    response = FakeResponse(
+        {"startAt": 0, "maxResults": 2, "total": 5, "issues": make_issues(2)}
+    )
+    page = SearchPageStream(response)
+    assert keys(page) == ["CLD-0", "CLD-1"]
+    assert (page.start_at, page.max_results, page.total) == (0, 2, 5)
+    assert response.closed
+
+
+def test_reads_all_pages_in_order():
+    issues = make_issues(23)
+    stream = IssueStream(FakeSearch(issues), page_size=10)
+    assert keys(stream) == keys(issues)
+    assert stream.total == 23
+    assert stream.count == 23
+    assert not stream.failed
+
+
+def test_follows_server_page_limit():
+    issues = make_issues(12)
+    search = FakeSearch(issues, max_results=5)
+    stream = IssueStream(search, page_size=10)
+    assert keys(stream) == keys(issues)
+    assert search.requests == [0, 5, 10]
+
+
+def test_prefetch_keeps_issue_order():
+    issues = make_issues(47)
+    search = FakeSearch(issues)
+    stream = IssueStream(search, page_size=5, prefetch=4)
+    assert keys(stream) == keys(issues)
+    assert sorted(search.requests) == list(range(0, 47, 5))
+
+
+def test_duplicates_from_shifted_pages_are_skipped():
+    issues = make_issues(10)
+    # Trang thứ hai bắt đầu lại từ issue đã đọc, như khi kết quả bị dịch trang
+    shifted = issues[:5] + issues[4:]
+
+    def open_page(start_at, page_size):
+        return FakeResponse(
+            {
+                "startAt": start_at,
+                "maxResults": page_size,
+                "total": len(shifted),
+                "issues": shifted[start_at : start_at + page_size],
+            }
+        )
+
+    for prefetch in (1, 3):
+        stream = IssueStream(open_page, page_size=5, prefetch=prefetch)
+        assert keys(stream) == keys(issues)
+        assert stream.count == 10
+
+
+def test_max_issues_stops_early():
+    search = FakeSearch(make_issues(30))
+    stream = IssueStream(search, page_size=10, max_issues=12, prefetch=3)
+    assert keys(stream) == keys(make_issues(12))
+    assert stream.count == 12
+
+
+def test_failed_page_marks_stream_failed():
+    for prefetch in (1, 3):
+        search = FakeSearch(make_issues(30), fail_at={20})
+        stream = IssueStream(search, page_size=10, prefetch=prefetch)
+        assert keys(stream) == keys(make_issues(20))
+        assert stream.failed